@@ -0,0 +1,5 @@
+"""Benchmarks for LISC.
+
+Benchmarks are run with asv, from the root of the repository, for example with `asv run`.
+Data is synthetic, and requests are answered by a static requester, so no network is used.
+"""
@@ -0,0 +1,87 @@
+"""Benchmarks for collecting and parsing data from EUtils pages."""
+
+from bs4 import BeautifulSoup
+
+from lisc.data import Articles, Term
+from lisc.collect.terms import make_term, join
+from lisc.collect.counts import collect_counts, get_count, make_counts_urls
+from lisc.collect.words import get_articles, get_article_info
+
+from .utils import StaticRequester, make_esearch_page, make_efetch_page
+
+###################################################################################################
+###################################################################################################
+
+class TimeCountParsing():
+    """Benchmark parsing counts from EUtils search pages."""
+
+    def setup(self):
+
+        self.req = StaticRequester(make_esearch_page(12345))
+
+    def time_get_count(self):
+
+        for _ in range(100):
+            get_count(self.req, 'url')
+
+
+class TimeCollectCounts():
+    """Benchmark collecting co-occurrence data, for different numbers of terms."""
+
+    params = [5, 10, 20]
+    param_names = ['n_terms']
+
+    def setup(self, n_terms):
+
+        self.terms = [['term{}'.format(ind)] for ind in range(n_terms)]
+        self.req = StaticRequester(make_esearch_page(12345))
+
+    def time_collect_counts(self, n_terms):
+
+        collect_counts(self.terms, logging=self.req)
+
+
+class TimeCountsURLs():
+    """Benchmark building the URLs for each cell of co-occurrence collection."""
+
+    def setup(self):
+
+        self.urls, _ = make_counts_urls()
+        self.args = [make_term(Term('term', ['term{}'.format(ind), 'synonym'], ['incl'], ['excl']))
+                     for ind in range(30)]
+
+    def time_get_url(self):
+
+        for arg_a in self.args:
+            for arg_b in self.args:
+                self.urls.get_url('search', settings={'term' : join(arg_a, arg_b, 'AND')})
+
+    def time_get_template(self):
+
+        template = self.urls.get_template('search', 'term', '{}AND{}')
+        for arg_a in self.args:
+            for arg_b in self.args:
+                template.format(arg_a, arg_b)
+
+
+class TimeArticleParsing():
+    """Benchmark parsing articles from EUtils fetch pages, for different numbers of articles."""
+
+    params = [10, 100, 500]
+    param_names = ['n_articles']
+
+    def setup(self, n_articles):
+
+        self.content = make_efetch_page(n_articles)
+        self.req = StaticRequester(self.content)
+        self.articles = BeautifulSoup(self.content, 'xml').findAll('PubmedArticle')
+
+    def time_get_articles(self, n_articles):
+
+        get_articles(self.req, 'url', Articles('brain'))
+
+    def time_get_article_info(self, n_articles):
+
+        arts = Articles('brain')
+        for article in self.articles:
+            get_article_info(arts, article)
@@ -0,0 +1,37 @@
+"""Benchmarks for processing and aggregating article data."""
+
+from copy import deepcopy
+
+from lisc.data import ArticlesAll
+from lisc.data.process import process_articles
+
+from .utils import make_articles
+
+###################################################################################################
+###################################################################################################
+
+class TimeArticlesAll():
+    """Benchmark processing and aggregating articles, for different numbers of articles."""
+
+    params = [100, 1000, 5000]
+    param_names = ['n_articles']
+    timeout = 300
+
+    def setup(self, n_articles):
+
+        self.arts = make_articles(n_articles)
+        self.processed = deepcopy(self.arts)
+        self.processed.process()
+
+    def time_process_articles(self, n_articles):
+
+        process_articles(self.arts, process_copy=True)
+
+    def time_articles_all(self, n_articles):
+
+        ArticlesAll(self.processed)
+
+    def time_articles_all_summary(self, n_articles):
+
+        arts_all = ArticlesAll(self.processed)
+        arts_all.create_summary()
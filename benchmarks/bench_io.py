@@ -0,0 +1,63 @@
+"""Benchmarks for saving and loading data."""
+
+from tempfile import TemporaryDirectory
+
+from lisc import Words
+from lisc.data import Articles
+from lisc.io import save_object, load_object
+
+from .utils import make_articles
+
+###################################################################################################
+###################################################################################################
+
+class TimeArticlesIO():
+    """Benchmark saving and loading articles to and from JSON, for different numbers of articles."""
+
+    params = [100, 1000, 5000]
+    param_names = ['n_articles']
+
+    def setup(self, n_articles):
+
+        self.tempdir = TemporaryDirectory()
+        self.arts = make_articles(n_articles)
+        self.arts.save(self.tempdir.name)
+
+    def teardown(self, n_articles):
+
+        self.tempdir.cleanup()
+
+    def time_save(self, n_articles):
+
+        self.arts.save(self.tempdir.name)
+
+    def time_load(self, n_articles):
+
+        Articles(self.arts.term).load(self.tempdir.name)
+
+
+class TimeObjectIO():
+    """Benchmark saving and loading Words objects, for different numbers of articles and formats."""
+
+    params = ([100, 1000, 5000], ['lisc', 'pickle'])
+    param_names = ['n_articles', 'file_format']
+
+    def setup(self, n_articles, file_format):
+
+        self.tempdir = TemporaryDirectory()
+        self.words = Words()
+        self.words.add_results(make_articles(n_articles))
+        self.file_name = 'words' + ('.lisc' if file_format == 'lisc' else '.p')
+        save_object(self.words, 'words', self.tempdir.name, file_format=file_format)
+
+    def teardown(self, n_articles, file_format):
+
+        self.tempdir.cleanup()
+
+    def time_save_object(self, n_articles, file_format):
+
+        save_object(self.words, 'words', self.tempdir.name, file_format=file_format)
+
+    def time_load_object(self, n_articles, file_format):
+
+        load_object(self.file_name, self.tempdir.name)
@@ -0,0 +1,42 @@
+"""Benchmarks for computing scores from co-occurrence data."""
+
+import numpy as np
+
+from lisc.analysis.counts import (compute_normalization, compute_association_index,
+                                  compute_similarity)
+
+###################################################################################################
+###################################################################################################
+
+# Number of terms in the second set of terms, for non-square co-occurrence data
+N_TERMS_B = 100
+
+class TimeScores():
+    """Benchmark computing scores, for different numbers of terms."""
+
+    params = [1000, 5000, 20000]
+    param_names = ['n_terms']
+
+    def setup(self, n_terms):
+
+        rng = np.random.default_rng(0)
+
+        self.counts_a = rng.integers(100, 10000, n_terms)
+        self.counts_b = rng.integers(100, 10000, N_TERMS_B)
+        self.data = rng.integers(0, 100, [n_terms, N_TERMS_B])
+
+    def time_normalization(self, n_terms):
+
+        compute_normalization(self.data, self.counts_a, dim='A')
+
+    def time_association_index(self, n_terms):
+
+        compute_association_index(self.data, self.counts_a, self.counts_b)
+
+    def time_similarity(self, n_terms):
+
+        compute_similarity(self.data, dim='B')
+
+    def peakmem_association_index(self, n_terms):
+
+        compute_association_index(self.data, self.counts_a, self.counts_b)
@@ -0,0 +1,29 @@
+"""Benchmarks for text processing."""
+
+from lisc.data.utils import tokenize, convert_string, convert_strings
+
+from .utils import load_corpus
+
+###################################################################################################
+###################################################################################################
+
+class TimeTokenize():
+    """Benchmark tokenizing and converting a corpus of abstracts."""
+
+    def setup(self):
+
+        self.texts = load_corpus()
+
+    def time_tokenize(self):
+
+        for text in self.texts:
+            tokenize(text)
+
+    def time_convert_string(self):
+
+        for text in self.texts:
+            convert_string(text)
+
+    def time_convert_strings(self):
+
+        convert_strings(self.texts)
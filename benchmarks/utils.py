@@ -0,0 +1,194 @@
+"""Utilities for creating and loading data for benchmarks."""
+
+import os
+import json
+import random
+
+from lisc.data import Term, Articles
+from lisc.requester import Requester
+
+###################################################################################################
+###################################################################################################
+
+# Environment variable that can point to a saved corpus of abstracts to benchmark with
+CORPUS_ENV = 'LISC_BENCH_CORPUS'
+
+# Vocabulary used to generate synthetic text
+VOCAB = ['the', 'brain', 'frontal', 'lobe', 'neurons', 'of', 'in', 'activity', 'memory',
+         'attention', 'cortex', 'was', 'and', 'cognitive', 'task-related', 'EEG', 'fMRI',
+         'signal', 'model', 'analysis', 'participants', 'were', 'results', 'showed', 'a']
+PUNCTUATION = ['', '', '', '', ',', '.', ';', ':', '(', ')', '!', '?']
+
+
+def make_text(n_words, seed=None):
+    """Make a synthetic abstract, with words and punctuation.
+
+    Parameters
+    ----------
+    n_words : int
+        Number of words in the text.
+    seed : int, optional
+        Seed for the random generator.
+
+    Returns
+    -------
+    str
+        Synthetic text.
+    """
+
+    rng = random.Random(seed)
+
+    return ' '.join(rng.choice(VOCAB) + rng.choice(PUNCTUATION) for _ in range(n_words))
+
+
+def load_corpus(n_texts=1000, n_words=200):
+    """Load a corpus of abstracts to benchmark with.
+
+    Parameters
+    ----------
+    n_texts : int, optional, default: 1000
+        Number of texts to generate, if creating a synthetic corpus.
+    n_words : int, optional, default: 200
+        Number of words per text, if creating a synthetic corpus.
+
+    Returns
+    -------
+    list of str
+        Corpus of abstracts.
+
+    Notes
+    -----
+    If the `LISC_BENCH_CORPUS` environment variable is set, it should be the path to a
+    saved Articles file, as saved by `Articles.save`, and the abstracts are loaded from it.
+    Otherwise, a deterministic synthetic corpus is generated.
+    """
+
+    path = os.environ.get(CORPUS_ENV)
+
+    if path:
+        with open(path) as f_obj:
+            lines = [json.loads(line) for line in f_obj][1:]
+        return [line['words'] for line in lines if isinstance(line['words'], str)]
+
+    return [make_text(n_words, seed) for seed in range(n_texts)]
+
+
+def make_esearch_page(count):
+    """Make a synthetic EUtils search page, as returned when collecting counts.
+
+    Parameters
+    ----------
+    count : int
+        The count of articles to report in the page.
+
+    Returns
+    -------
+    bytes
+        Page content.
+    """
+
+    page = ('<?xml version="1.0" encoding="UTF-8" ?>\n'
+            '<eSearchResult><Count>{}</Count><RetMax>0</RetMax><RetStart>0</RetStart>'
+            '<IdList></IdList><QueryTranslation>"brain"[TIAB]</QueryTranslation>'
+            '</eSearchResult>').format(count)
+
+    return page.encode('utf-8')
+
+
+def make_efetch_page(n_articles, n_words=200):
+    """Make a synthetic EUtils fetch page, with a set of articles.
+
+    Parameters
+    ----------
+    n_articles : int
+        Number of articles in the page.
+    n_words : int, optional, default: 200
+        Number of words per abstract.
+
+    Returns
+    -------
+    bytes
+        Page content.
+    """
+
+    article = ('<PubmedArticle><MedlineCitation><Article>'
+               '<Journal><PubDate><Year>2020</Year></PubDate><Title>Journal {ind}</Title>'
+               '<ISOAbbreviation>J {ind}</ISOAbbreviation></Journal>'
+               '<ArticleTitle>Title of article {ind}.</ArticleTitle>'
+               '<Abstract><AbstractText>{text}</AbstractText></Abstract>'
+               '<AuthorList><Author><LastName>Last{ind}</LastName><ForeName>First</ForeName>'
+               '<Initials>F</Initials><AffiliationInfo><Affiliation>University</Affiliation>'
+               '</AffiliationInfo></Author></AuthorList></Article>'
+               '<KeywordList><Keyword>brain</Keyword><Keyword>memory</Keyword></KeywordList>'
+               '</MedlineCitation><PubmedData><ArticleIdList>'
+               '<ArticleId IdType="pubmed">{ind}</ArticleId>'
+               '<ArticleId IdType="doi">10.0000/{ind}</ArticleId>'
+               '</ArticleIdList></PubmedData></PubmedArticle>')
+
+    page = '<?xml version="1.0" ?>\n<PubmedArticleSet>' + \
+        ''.join(article.format(ind=ind, text=make_text(n_words, ind).replace('&', ''))
+                for ind in range(n_articles)) + '</PubmedArticleSet>'
+
+    return page.encode('utf-8')
+
+
+def make_articles(n_articles, n_words=200):
+    """Make a synthetic Articles object.
+
+    Parameters
+    ----------
+    n_articles : int
+        Number of articles.
+    n_words : int, optional, default: 200
+        Number of words per abstract.
+
+    Returns
+    -------
+    Articles
+        Object with synthetic article data.
+    """
+
+    rng = random.Random(n_articles)
+
+    arts = Articles(Term('brain', ['brain'], [], []))
+    for ind in range(n_articles):
+        arts.add_data('ids', str(ind))
+        arts.add_data('titles', make_text(10, -ind))
+        arts.add_data('journals', ('Journal {}'.format(ind % 50), 'J {}'.format(ind % 50)))
+        arts.add_data('authors', [('Last{}'.format(rng.randrange(500)), 'First', 'F', 'Uni')
+                                  for _ in range(rng.randrange(1, 6))])
+        arts.add_data('words', make_text(n_words, ind))
+        arts.add_data('keywords', rng.sample(VOCAB, 3))
+        arts.add_data('years', 1990 + ind % 30)
+        arts.add_data('dois', '10.0000/{}'.format(ind))
+
+    return arts
+
+
+class StaticRequester(Requester):
+    """Requester that returns a fixed page for every URL, without making any requests.
+
+    Notes
+    -----
+    This is used to benchmark collection and parsing code, separately from network time.
+    """
+
+    def __init__(self, content):
+
+        Requester.__init__(self)
+        self.content = content
+
+    def request_url(self, url, post=False):
+
+        self.n_requests += 1
+
+        return Page(self.content)
+
+
+class Page():
+    """A minimal response object, with page content."""
+
+    def __init__(self, content):
+
+        self.status_code = 200
+        self.content = content
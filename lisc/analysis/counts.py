@@ -2,10 +2,15 @@
 
 import numpy as np
 
+from lisc.utils.base import get_chunks
+
 ###################################################################################################
 ###################################################################################################
 
-def compute_normalization(data, counts, dim='A'):
+# Number of rows of data to process at once, which bounds the size of temporary arrays
+CHUNK_SIZE = 1000
+
+def compute_normalization(data, counts, dim='A', out=None):
     """Compute a normalization of the co-occurrence data.
 
     Parameters
@@ -17,6 +22,9 @@ def compute_normalization(data, counts, dim='A'):
     dim : {'A', 'B'}, optional
         Which set of terms to normalize by.
         'A' is equivalent to normalizing by rows values, 'B' to column values.
+    out : 2d array, optional
+        Array to write the result into, such as a memory mapped array.
+        Must have the same shape as `data`. If not provided, a new array is created.
 
     Returns
     -------
@@ -26,31 +34,26 @@ def compute_normalization(data, counts, dim='A'):
     Notes
     -----
     This computes a normalized data matrix as a percent of articles expressing co-occurrence.
-    """
-
-    if dim == 'A':
-
-        if not len(counts) == data.shape[0]:
-            raise ValueError('Data shapes are inconsistent.')
 
-        counts_2d = np.tile(counts, [data.shape[1], 1]).T
-
-    elif dim == 'B':
-
-        if not len(counts) == data.shape[1]:
-            raise ValueError('Data shapes are inconsistent.')
+    The data are processed in chunks of rows, such that `data` and `out` can be memory mapped
+    arrays that are larger than the available memory.
+    """
 
-        counts_2d = np.tile(counts, [data.shape[0], 1])
+    counts = np.asarray(counts)
 
-    else:
+    if dim not in ['A', 'B']:
         raise ValueError('Specified dimension not understood.')
+    if not len(counts) == data.shape[0 if dim == 'A' else 1]:
+        raise ValueError('Data shapes are inconsistent.')
 
-    out = data / counts_2d
+    out = _check_out(out, data.shape)
+    for chunk in get_chunks(data.shape[0], CHUNK_SIZE):
+        out[chunk] = data[chunk] / (counts[chunk, None] if dim == 'A' else counts)
 
     return out
 
 
-def compute_association_index(data, counts_a, counts_b):
+def compute_association_index(data, counts_a, counts_b, out=None):
     """Compute the association index from the co-occurrence data.
 
     Parameters
@@ -59,6 +62,9 @@ def compute_association_index(data, counts_a, counts_b):
         Counts of co-occurrence of terms.
     counts_a, counts_b : 1d array
         Counts for each individual search term.
+    out : 2d array, optional
+        Array to write the result into, such as a memory mapped array.
+        Must have the same shape as `data`. If not provided, a new array is created.
 
     Returns
     -------
@@ -71,21 +77,26 @@ def compute_association_index(data, counts_a, counts_b):
 
     The denominator, :math:`|c_{ij} U d_{ij}|`, is equivalent to
     :math:`|c_{ij}| + |d_{ij}| - |c_{ij} N d_{ij}|`.
+
+    The data are processed in chunks of rows, such that `data` and `out` can be memory mapped
+    arrays that are larger than the available memory.
     """
 
-    n_a = len(counts_a)
-    n_b = len(counts_b)
+    counts_a = np.asarray(counts_a)
+    counts_b = np.asarray(counts_b)
 
-    if not n_a == data.shape[0] and n_b == data.shape[1]:
+    if not (len(counts_a) == data.shape[0] and len(counts_b) == data.shape[1]):
         raise ValueError('Data shapes are inconsistent.')
 
-    denominator = np.tile(counts_a, [n_b, 1]).T + np.tile(counts_b, [n_a, 1]) - data
-    index = data / denominator
+    index = _check_out(out, data.shape)
+    for chunk in get_chunks(data.shape[0], CHUNK_SIZE):
+        cdata = data[chunk]
+        index[chunk] = cdata / (counts_a[chunk, None] + counts_b - cdata)
 
     return index
 
 
-def compute_similarity(data, dim='A'):
+def compute_similarity(data, dim='A', out=None):
     """Calculate the similarity across the co-occurrence data.
 
     Parameters
@@ -95,6 +106,10 @@ def compute_similarity(data, dim='A'):
     dim : {'A', 'B'}, optional
         Which set of terms to compute similarity across.
         'A' is equivalent to across rows, 'B' to across columns.
+    out : 2d array, optional
+        Array to write the result into, such as a memory mapped array.
+        Must be square, with a size matching the number of terms in `dim`.
+        If not provided, a new array is created.
 
     Returns
     -------
@@ -109,26 +124,43 @@ def compute_similarity(data, dim='A'):
     result if computed on raw counts, or normalized data.
 
     The implementation is adapted from here: https://stackoverflow.com/a/20687984
+
+    The similarity is computed in chunks of rows, such that `data` and `out` can be memory
+    mapped arrays that are larger than the available memory.
     """
 
     # If computing across columns, transpose data
     data = data.T if dim == 'B' else data
 
-    # Calculate similarity
-    similarity = np.dot(data, data.T)
+    # Calculate the squared magnitude of each row, which is the diagonal of the similarity
+    square_mag = np.zeros(data.shape[0], dtype=np.result_type(data.dtype, int))
+    for chunk in get_chunks(data.shape[0], CHUNK_SIZE):
+        cdata = data[chunk]
+        square_mag[chunk] = np.einsum('ij,ij->i', cdata, cdata)
 
     # Calculate inverse squared magnitude & replace infs to zero
-    inv_square_mag = 1 / np.diag(similarity)
+    with np.errstate(divide='ignore'):
+        inv_square_mag = 1 / square_mag
     inv_square_mag[np.isinf(inv_square_mag)] = 0
 
     # Calculate inverse of the magnitude
     inv_mag = np.sqrt(inv_square_mag)
 
-    # Calculate cosine similarity as element-wise multiplication by inverse magnitude
-    cosine = similarity * inv_mag
-    cosine = cosine.T * inv_mag
-
-    # If data was transposed for computation, transpose back
-    data = data.T if dim == 'B' else data
+    # Calculate cosine similarity as similarity scaled by the inverse magnitude of each term
+    cosine = _check_out(out, (data.shape[0], data.shape[0]))
+    for chunk in get_chunks(data.shape[0], CHUNK_SIZE):
+        cosine[chunk] = np.dot(data[chunk], data.T) * inv_mag[chunk, None] * inv_mag
 
     return cosine
+
+
+def _check_out(out, shape):
+    """Check an output array for a computed result, creating it if not provided."""
+
+    if out is None:
+        out = np.empty(shape)
+
+    if out.shape != shape:
+        raise ValueError('Output array shape is inconsistent with the data.')
+
+    return out
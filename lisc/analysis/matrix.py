@@ -0,0 +1,181 @@
+"""Analysis functions for document-term matrices of words data."""
+
+from collections import Counter
+
+import numpy as np
+
+from lisc.data.utils import convert_string
+from lisc.modutils.dependencies import safe_import
+
+sparse = safe_import('.sparse', 'scipy')
+
+###################################################################################################
+###################################################################################################
+
+def get_tokens(data, field='words'):
+    """Get the tokens for each article, across all collected article data.
+
+    Parameters
+    ----------
+    data : Words or list of Articles
+        Collected article data.
+    field : {'words', 'titles', 'keywords'}, optional
+        Article data field to get tokens from.
+
+    Returns
+    -------
+    tokens : list of list of str
+        Tokens for each article.
+    doc_terms : 1d array of int
+        The index of the search term that each article was collected for.
+
+    Notes
+    -----
+    If article data has been processed, the processed tokens are used as is.
+    Otherwise, text is converted to lower case tokens, with stopwords removed.
+    """
+
+    tokens, doc_terms = [], []
+    for ind, arts in enumerate(data):
+        for text in getattr(arts, field):
+            if not text:
+                text = []
+            elif isinstance(text, str):
+                text = convert_string(text)
+            tokens.append(text)
+            doc_terms.append(ind)
+
+    return tokens, np.array(doc_terms, dtype=int)
+
+
+def build_vocabulary(tokens, min_df=1):
+    """Build a vocabulary from tokenized documents.
+
+    Parameters
+    ----------
+    tokens : list of list of str
+        Tokens for each document.
+    min_df : int, optional, default: 1
+        The minimum number of documents a word must occur in to be included.
+
+    Returns
+    -------
+    vocab : dict
+        Mapping from each word to its column index, with words in sorted order.
+
+    Examples
+    --------
+    Build a vocabulary, keeping words that occur in at least two documents:
+
+    >>> build_vocabulary([['brain', 'memory'], ['brain', 'cell']], min_df=2)
+    {'brain': 0}
+    """
+
+    doc_freqs = Counter(word for doc in tokens for word in set(doc))
+    words = sorted(word for word, freq in doc_freqs.items() if freq >= min_df)
+
+    return {word : ind for ind, word in enumerate(words)}
+
+
+def make_document_term_matrix(tokens, vocab):
+    """Make a sparse document-term matrix of word counts.
+
+    Parameters
+    ----------
+    tokens : list of list of str
+        Tokens for each document.
+    vocab : dict
+        Mapping from each word to its column index, as returned by `build_vocabulary`.
+        Words not in the vocabulary are ignored.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        Counts of each word, with shape [n_docs, n_words].
+    """
+
+    indptr, indices = [0], []
+    for doc in tokens:
+        indices.extend(vocab[word] for word in doc if word in vocab)
+        indptr.append(len(indices))
+
+    dtm = sparse.csr_matrix((np.ones(len(indices), dtype=int), indices, indptr),
+                            shape=(len(tokens), len(vocab)))
+    dtm.sum_duplicates()
+
+    return dtm
+
+
+def compute_tfidf(dtm, normalize=True):
+    """Compute term frequency - inverse document frequency weights of a document-term matrix.
+
+    Parameters
+    ----------
+    dtm : scipy.sparse matrix
+        Counts of each word, with shape [n_docs, n_words].
+    normalize : bool, optional, default: True
+        Whether to normalize each document to unit length.
+
+    Returns
+    -------
+    tfidf : scipy.sparse.csr_matrix
+        Weighted document-term matrix, with shape [n_docs, n_words].
+
+    Notes
+    -----
+    This uses smoothed inverse document frequency, as :math:`idf = ln((1 + n) / (1 + df)) + 1`,
+    where `n` is the number of documents and `df` is the number of documents with each word.
+    """
+
+    dtm = sparse.csr_matrix(dtm, dtype=float)
+
+    doc_freqs = np.bincount(dtm.indices, minlength=dtm.shape[1])
+    idf = np.log((1 + dtm.shape[0]) / (1 + doc_freqs)) + 1
+
+    tfidf = dtm.multiply(idf).tocsr()
+    if normalize:
+        tfidf = _normalize_rows(tfidf)
+
+    return tfidf
+
+
+def compute_term_similarity(dtm, doc_terms, n_terms=None):
+    """Compute the similarity between search terms, based on the words in their articles.
+
+    Parameters
+    ----------
+    dtm : scipy.sparse matrix
+        Document-term matrix, with shape [n_docs, n_words].
+    doc_terms : 1d array of int
+        The index of the search term that each document was collected for.
+    n_terms : int, optional
+        The number of search terms. If not provided, is inferred from `doc_terms`.
+
+    Returns
+    -------
+    similarity : 2d array
+        Cosine similarity between each pair of search terms, with shape [n_terms, n_terms].
+
+    Notes
+    -----
+    Each search term is represented by the sum of the rows of its documents.
+    """
+
+    n_terms = n_terms if n_terms is not None else int(doc_terms.max()) + 1
+
+    grouping = sparse.csr_matrix((np.ones(len(doc_terms)), (doc_terms, np.arange(len(doc_terms)))),
+                                 shape=(n_terms, dtm.shape[0]))
+    term_vectors = _normalize_rows(sparse.csr_matrix(grouping @ dtm, dtype=float))
+
+    similarity = (term_vectors @ term_vectors.T).toarray()
+
+    return similarity
+
+
+def _normalize_rows(mat):
+    """Normalize the rows of a sparse matrix to unit length, leaving empty rows as zeros."""
+
+    norms = np.sqrt(np.asarray(mat.multiply(mat).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ mat)
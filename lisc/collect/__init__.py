@@ -3,5 +3,9 @@
 from .info import collect_info
 from .words import collect_words
 from .counts import collect_counts
+from .local import collect_counts_local
 from .citations import collect_citations
 from .time import collect_across_time
+from .hooks import CollectionStopped
+from .asynchronous import (collect_info_async, collect_counts_async,
+                           collect_words_async, collect_citations_async)
@@ -0,0 +1,521 @@
+"""Collect data from EUtils and OpenCitations asynchronously, with many requests in flight."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import numpy as np
+from bs4 import BeautifulSoup
+
+from lisc.data.term import Term
+from lisc.data.articles import Articles
+from lisc.data.meta_data import MetaData
+from lisc.io.db import batch_manifest
+from lisc.requester.asynchronous import AsyncRequester
+from lisc.collect.terms import make_term
+from lisc.collect.info import parse_db_info
+from lisc.collect.counts import make_counts_urls, parse_count
+from lisc.collect.words import parse_articles, FETCH_BATCH_SIZE
+from lisc.collect.citations import parse_citation_data, parse_citations_metadata
+from lisc.urls.eutils import EUtils, get_wait_time, check_post
+from lisc.urls.open_citations import OpenCitations
+
+###################################################################################################
+###################################################################################################
+
+async def collect_info_async(db='pubmed', api_key=None, logging=None, directory=None,
+                             verbose=False):
+    """Collect database information & metadata from EUtils, asynchronously.
+
+    Parameters
+    ----------
+    db : str, optional, default: 'pubmed'
+        Which database to access from EUtils.
+    api_key : str, optional
+        An API key for a NCBI account.
+    logging : {None, 'print', 'store', 'file'} or AsyncRequester, optional
+        What kind of logging, if any, to do for requested URLs.
+    directory : str or SCDB, optional
+        Folder or database object specifying the save location.
+    verbose : bool, optional, default: False
+        Whether to print out updates.
+
+    Returns
+    -------
+    meta_data : MetaData
+        Meta data about the data collection.
+
+    Notes
+    -----
+    This function requires the optional dependency `aiohttp`.
+
+    Examples
+    --------
+    Collect metadata from EUtils, from the pubmed database:
+
+    >>> import asyncio
+    >>> meta_data = asyncio.run(collect_info_async(db='pubmed')) # doctest:+SKIP
+    """
+
+    urls = EUtils(db=db, retmode='xml', api_key=api_key)
+    urls.build_url('info', settings=['db'])
+
+    meta_data = MetaData()
+
+    if verbose:
+        print('Gathering info on {} database.'.format(db))
+
+    async with _open_requester(logging, get_wait_time(urls.authenticated), directory) as req:
+        page = await req.request_url(urls.get_url('info'))
+        with req.metrics.time_parse():
+            meta_data.add_db_info(parse_db_info(page))
+
+    # If a requester was passed in, assume it is to contiune (don't close & add to MetaData)
+    if not isinstance(logging, AsyncRequester):
+        meta_data.add_requester(req)
+
+    return meta_data
+
+
+async def collect_counts_async(terms_a, inclusions_a=None, exclusions_a=None, labels_a=None,
+                               terms_b=None, inclusions_b=None, exclusions_b=None, labels_b=None,
+                               db='pubmed', field='TIAB', api_key=None, collect_coocs=True,
+                               n_jobs=10, logging=None, directory=None, collect_info=True,
+                               verbose=False, **eutils_kwargs):
+    """Collect count and term co-occurrence data from EUtils, asynchronously.
+
+    Parameters
+    ----------
+    terms_a : list of list of str
+        Search terms.
+    inclusions_a : list of list of str, optional
+        Inclusion words for search terms.
+    exclusions_a : list of list of str, optional
+        Exclusion words for search terms.
+    labels_a : list of str, optional
+        Labels for the search terms.
+    terms_b : list of list of str, optional
+        Secondary list of search terms.
+    inclusions_b : list of list of str, optional
+        Inclusion words for the second list of search terms.
+    exclusions_b : list of list of str, optional
+        Exclusion words for the second list of search terms.
+    labels_b : list of str
+        Labels for the second list of search terms.
+    db : str, optional, default: 'pubmed'
+        Which database to access from EUtils.
+    field : str, optional, default: 'TIAB'
+        Field to search for term within.
+    api_key : str, optional
+        An API key for a NCBI account.
+    collect_coocs : bool, optional, default: True
+        Whether to collect co-occurence data.
+    n_jobs : int, optional, default: 10
+        The maximum number of requests to have in flight at once.
+    logging : {None, 'print', 'store', 'file'} or AsyncRequester, optional
+        What kind of logging, if any, to do for requested URLs.
+    directory : str or SCDB, optional
+        Folder or database object specifying the save location.
+    collect_info : bool, optional, default: True
+        Whether to collect database information, to be added to meta data.
+    verbose : bool, optional, default: False
+        Whether to print out updates.
+    **eutils_kwargs
+        Additional settings for the EUtils API.
+
+    Returns
+    -------
+    co_occurences : 2d array
+        The numbers of articles found for each combination of terms.
+        Only returned if `collect_coocs` is True.
+    counts : 1d array or list of 1d array
+        Number of articles for each term independently.
+    meta_data : dict
+        Meta data from the data collection.
+
+    Notes
+    -----
+    This function requires the optional dependency `aiohttp`.
+
+    Outputs are the same as for `collect_counts`. All requests are launched concurrently,
+    subject to the throttling of the requester, with at most `n_jobs` requests in flight.
+
+    Examples
+    --------
+    Collect counts and co-occurrences for a single set of two search terms:
+
+    >>> import asyncio
+    >>> terms = [['frontal lobe'], ['temporal lobe']]
+    >>> coocs, counts, meta_data = asyncio.run(collect_counts_async(terms)) # doctest:+SKIP
+    """
+
+    meta_data = MetaData()
+
+    urls, settings = make_counts_urls(db, field, api_key, **eutils_kwargs)
+    meta_data.add_settings(settings)
+
+    # Make the search term arguments for each term, and initialize data stores
+    args_a = _make_term_args(terms_a, inclusions_a, exclusions_a, labels_a)
+    counts_a = np.ones([len(args_a)], dtype=int) * -1
+
+    # Define each count to collect, as the array and index to store it, and the URL
+    template = urls.get_template('search', 'term')
+    template_ab = urls.get_template('search', 'term', '{}AND{}')
+    jobs = [(counts_a, a_ind, template.format(arg_a)) for a_ind, arg_a in enumerate(args_a)]
+
+    if collect_coocs:
+
+        square = not terms_b
+        args_b = args_a if square else \
+            _make_term_args(terms_b, inclusions_b, exclusions_b, labels_b)
+        counts_b = np.ones([len(args_b)], dtype=int) * -1
+
+        co_occurences = np.ones([len(args_a), len(args_b)], dtype=int) * -1
+        if square:
+            np.fill_diagonal(co_occurences, 0)
+        else:
+            jobs.extend([(counts_b, b_ind, template.format(arg_b)) \
+                for b_ind, arg_b in enumerate(args_b)])
+
+        # Collect each combination of terms, only once per pair if single term list
+        for a_ind, arg_a in enumerate(args_a):
+            for b_ind, arg_b in enumerate(args_b):
+                if not square or b_ind > a_ind:
+                    jobs.append((co_occurences, (a_ind, b_ind), template_ab.format(arg_a, arg_b)))
+
+    semaphore = asyncio.Semaphore(n_jobs)
+    async with _open_requester(logging, get_wait_time(urls.authenticated), directory) as req:
+
+        if collect_info:
+            page = await req.request_url(urls.get_url('info'))
+            with req.metrics.time_parse():
+                meta_data.add_db_info(parse_db_info(page))
+
+        if verbose:
+            print('Running {} counts, with up to {} in flight.'.format(len(jobs), n_jobs))
+
+        counts = await asyncio.gather(*[_get_count(req, url, semaphore) for _, _, url in jobs])
+
+    for (array, ind, _), count in zip(jobs, counts):
+        array[ind] = count
+
+    if collect_coocs and square:
+        co_occurences = np.maximum(co_occurences, co_occurences.T)
+
+    if collect_coocs:
+        counts = counts_a if square else [counts_a, counts_b]
+    else:
+        counts = counts_a
+
+    # If a requester was passed in, assume it is to contiune (don't close)
+    meta_data.add_requester(req, close=not isinstance(logging, AsyncRequester))
+
+    if not collect_coocs:
+        return counts, meta_data
+    else:
+        return co_occurences, counts, meta_data
+
+
+async def collect_words_async(terms, inclusions=None, exclusions=None, labels=None,
+                              db='pubmed', retmax=100, field='TIAB', usehistory=False,
+                              api_key=None, save_and_clear=False, n_jobs=10, logging=None,
+                              directory=None, collect_info=True, verbose=False,
+                              **eutils_kwargs):
+    """Collect text data and metadata from EUtils using specified search term(s), asynchronously.
+
+    Parameters
+    ----------
+    terms : list of list of str
+        Search terms.
+    inclusions : list of list of str, optional
+        Inclusion words for search terms.
+    exclusions : list of list of str, optional
+        Exclusion words for search terms.
+    labels : list of str, optional
+        Labels for the search terms.
+    db : str, optional, default: 'pubmed'
+        Which database to access from EUtils.
+    retmax : int, optional, default: 100
+        Maximum number of articles to return.
+    field : str, optional, default: 'TIAB'
+        Field to search for term within.
+    usehistory : bool, optional, default: False
+        Whether to use EUtils history, storing results on their server.
+    api_key : str, optional
+        An API key for a NCBI account.
+    save_and_clear : bool, optional, default: False
+        Whether to save words data to disk per term as it goes, instead of holding in memory.
+    n_jobs : int, optional, default: 10
+        The maximum number of requests to have in flight at once.
+    logging : {None, 'print', 'store', 'file'} or AsyncRequester, optional
+        What kind of logging, if any, to do for requested URLs.
+    directory : str or SCDB, optional
+        Folder or database object specifying the save location.
+    collect_info : bool, optional, default: True
+        Whether to collect database information, to be added to meta data.
+    verbose : bool, optional, default: False
+        Whether to print out updates.
+    **eutils_kwargs
+        Additional settings for the EUtils API.
+
+    Returns
+    -------
+    results : list of Articles
+        Results from collecting data for each term.
+    meta_data : MetaData
+        Meta data from the data collection.
+
+    Notes
+    -----
+    This function requires the optional dependency `aiohttp`.
+
+    Outputs are the same as for `collect_words`. Terms, and the batches of articles for each
+    term, are collected concurrently, with at most `n_jobs` requests in flight.
+
+    Examples
+    --------
+    Collect words data for two terms, limiting the results to 5 articles per term:
+
+    >>> import asyncio
+    >>> terms = [['frontal lobe'], ['temporal lobe']]
+    >>> results, meta_data = asyncio.run(collect_words_async(terms, retmax=5)) # doctest:+SKIP
+    """
+
+    if db != 'pubmed':
+        msg = 'Only the `pubmed` database is currently supported for words collection.'
+        raise NotImplementedError(msg)
+
+    meta_data = MetaData()
+
+    settings = {'db' : db, 'retmax' : retmax, 'field' : field,
+                'usehistory' : 'y' if usehistory else 'n'}
+    settings.update(eutils_kwargs)
+    meta_data.add_settings(settings)
+
+    urls = EUtils(**settings, retmode='xml', api_key=api_key)
+
+    search_settings = ['db', 'usehistory', 'retmax', 'retmode', 'field']
+    if 'date' in ''.join(eutils_kwargs.keys()) and 'datetype' not in eutils_kwargs.keys():
+        search_settings.append('datetype')
+
+    urls.build_url('info', settings=['db'])
+    urls.build_url('search', settings=search_settings + list(eutils_kwargs.keys()))
+    urls.build_url('fetch', settings=['db', 'retmode'])
+
+    labels = labels if labels else [term[0] for term in terms]
+    inclusions = inclusions if inclusions else [[]] * len(terms)
+    exclusions = exclusions if exclusions else [[]] * len(terms)
+
+    if verbose:
+        print('Collecting data for {} terms, with up to {} requests in flight.'.format(\
+            len(terms), n_jobs))
+
+    semaphore = asyncio.Semaphore(n_jobs)
+    async with _open_requester(logging, get_wait_time(urls.authenticated), directory) as req:
+
+        if collect_info:
+            page = await req.request_url(urls.get_url('info'))
+            with req.metrics.time_parse():
+                meta_data.add_db_info(parse_db_info(page))
+
+        # If saving to a database, the manifest is updated once, after all terms are saved
+        with batch_manifest(directory if save_and_clear else None):
+            results = await asyncio.gather(\
+                *[_get_term_articles(req, urls, Term(*term), int(retmax), usehistory,
+                                     save_and_clear, directory, semaphore) \
+                    for term in zip(labels, terms, inclusions, exclusions)])
+
+    # If a requester was passed in, assume it is to contiune (don't close)
+    meta_data.add_requester(req, close=not isinstance(logging, AsyncRequester))
+
+    return list(results), meta_data
+
+
+async def collect_citations_async(dois, util='citations', collect_dois=False, batch_size=1,
+                                  n_jobs=10, wait_time=0.1, logging=None, directory=None,
+                                  verbose=False):
+    """Collect citation data from OpenCitations, asynchronously.
+
+    Parameters
+    ----------
+    dois : list of str
+        DOIs to collect citation data for.
+    util : {'citations', 'references'}
+        Which utility to collect citation data with.
+    collect_dois : bool, optional, default: False
+        Whether to also collect the list of DOIs of cited or referenced papers.
+    batch_size : int, optional, default: 1
+        The number of DOIs to request per URL.
+        If greater than 1, DOIs are collected in batches, with the 'metadata' utility.
+    n_jobs : int, optional, default: 10
+        The maximum number of requests to have in flight at once.
+    wait_time : float, optional, default: 0.1
+        Minimum time to wait between launching requests, in seconds.
+        Only used if an AsyncRequester object is not passed in as `logging`.
+    logging : {None, 'print', 'store', 'file'} or AsyncRequester, optional
+        What kind of logging, if any, to do for requested URLs.
+    directory : str or SCDB, optional
+        Folder or database object specifying the save location.
+    verbose : bool, optional, default: False
+        Whether to print out updates.
+
+    Returns
+    -------
+    n_citations : dict
+        The number of citations or references for each article.
+    cite_dois : dict
+        The DOIs of the citing or references articles.
+        Only returned if `collect_dois` is True.
+    meta_data : MetaData
+        Meta data about the data collection.
+
+    Notes
+    -----
+    This function requires the optional dependency `aiohttp`.
+
+    Examples
+    --------
+    Collect citation data for a specified article:
+
+    >>> import asyncio
+    >>> dois = ['10.1038/nmeth.1635']
+    >>> citations, meta_data = asyncio.run(collect_citations_async(dois)) # doctest:+SKIP
+    """
+
+    meta_data = MetaData()
+    meta_data.add_settings({'util' : util, 'batch_size' : batch_size, 'n_jobs' : n_jobs})
+
+    urls = OpenCitations()
+    urls.build_url(util)
+    urls.build_url('metadata')
+
+    if verbose:
+        print('Collecting citation data.')
+
+    batches = [dois[ind:ind + batch_size] for ind in range(0, len(dois), batch_size)]
+
+    semaphore = asyncio.Semaphore(n_jobs)
+    async with _open_requester(logging, wait_time, directory) as req:
+        all_outputs = await asyncio.gather(\
+            *[_get_citations_batch(req, urls, batch, util, collect_dois, semaphore) \
+                for batch in batches])
+
+    n_citations, cite_dois = {}, {}
+    for outputs in all_outputs:
+        for doi, output in outputs.items():
+            n_citations[doi], cite_dois[doi] = output if collect_dois else (output, None)
+
+    meta_data.add_requester(req, close=not isinstance(logging, AsyncRequester))
+
+    if not collect_dois:
+        return n_citations, meta_data
+    else:
+        return n_citations, cite_dois, meta_data
+
+
+@asynccontextmanager
+async def _open_requester(logging, wait_time, directory):
+    """Get an asynchronous requester, either as passed in as `logging`, or initialized.
+
+    Notes
+    -----
+    The session of an initialized requester is closed on exit, including if an error occurs.
+    The session of a requester that is passed in is left open, to be reused.
+    """
+
+    if isinstance(logging, AsyncRequester):
+        yield logging
+    else:
+        async with AsyncRequester(wait_time=wait_time, logging=logging,
+                                  directory=directory) as req:
+            yield req
+
+
+def _make_term_args(terms, inclusions=None, exclusions=None, labels=None):
+    """Make the search term argument for each of a list of terms."""
+
+    labels = labels if labels else [term[0] for term in terms]
+    inclusions = inclusions if inclusions else [[]] * len(terms)
+    exclusions = exclusions if exclusions else [[]] * len(terms)
+
+    return [make_term(Term(*term)) for term in zip(labels, terms, inclusions, exclusions)]
+
+
+async def _request_url(req, url, semaphore, post=False):
+    """Request a URL, waiting for a place in flight, as limited by the semaphore."""
+
+    async with semaphore:
+        return await req.request_url(url, post=post)
+
+
+async def _get_count(req, url, semaphore):
+    """Get the count of how many articles are listed at the requested URL."""
+
+    count = req.get_memo(url)
+    if count is not None:
+        return count
+
+    page = await _request_url(req, url, semaphore, check_post(url))
+    with req.metrics.time_parse():
+        count = parse_count(page)
+
+    if page.status_code == 200:
+        req.add_memo(url, count)
+
+    return count
+
+
+async def _get_term_articles(req, urls, term, retmax, usehistory, save_and_clear,
+                             directory, semaphore):
+    """Collect the articles for a search term, requesting batches of articles concurrently."""
+
+    arts = Articles(term)
+
+    url = urls.get_url('search', settings={'term' : make_term(term)})
+    page = await _request_url(req, url, semaphore, check_post(url))
+    with req.metrics.time_parse():
+        page_soup = BeautifulSoup(page.content, 'lxml')
+        count = int(page_soup.find('count').text)
+
+    # Define the URLs for each batch of articles, with batches of IDs sent as POST requests
+    post = not usehistory
+    if usehistory:
+        web_env = page_soup.find('webenv').text
+        query_key = page_soup.find('querykey').text
+        art_urls = [urls.get_url('fetch', settings={\
+            'WebEnv' : web_env, 'query_key' : query_key, 'retstart' : str(retstart),
+            'retmax' : str(min(retmax - retstart, 100))}) \
+                for retstart in range(0, min(count, retmax), 100)]
+    else:
+        ids = [el.text for el in page_soup.find_all('id')]
+        art_urls = [urls.get_url('fetch', settings={\
+            'id' : ','.join(ids[ind:ind + FETCH_BATCH_SIZE])}) \
+                for ind in range(0, len(ids), FETCH_BATCH_SIZE)]
+
+    pages = await asyncio.gather(*[_request_url(req, art_url, semaphore, post) \
+        for art_url in art_urls])
+    for page in pages:
+        with req.metrics.time_parse():
+            arts = parse_articles(page, arts)
+
+    arts._check_results()
+
+    if save_and_clear:
+        arts.save_and_clear(directory=directory)
+
+    return arts
+
+
+async def _get_citations_batch(req, urls, batch, util, collect_dois, semaphore):
+    """Collect citation data for a batch of DOIs, with a single request."""
+
+    if len(batch) > 1:
+        page = await _request_url(req, urls.get_url('metadata', ['__'.join(batch)]), semaphore)
+        with req.metrics.time_parse():
+            outputs = parse_citations_metadata(page, batch, util, collect_dois)
+    else:
+        citation_url = urls.get_url(util, batch)
+        page = await _request_url(req, citation_url, semaphore)
+        with req.metrics.time_parse():
+            outputs = {batch[0] : parse_citation_data(page, citation_url, collect_dois)}
+
+    return outputs
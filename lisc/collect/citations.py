@@ -1,16 +1,21 @@
 """Collect citation data from OpenCitations."""
 
 import json
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
 
 from lisc.requester import Requester
 from lisc.data.meta_data import MetaData
+from lisc.collect.hooks import check_hooks
 from lisc.urls.open_citations import OpenCitations
 
 ###################################################################################################
 ###################################################################################################
 
-def collect_citations(dois, util='citations', collect_dois=False,
-                      logging=None, directory=None, verbose=False):
+def collect_citations(dois, util='citations', collect_dois=False, logging=None, directory=None,
+                      verbose=False, batch_size=1, n_jobs=1, wait_time=0.1, hooks=None):
     """Collect citation data from OpenCitations.
 
     Parameters
@@ -24,12 +29,27 @@ def collect_citations(dois, util='citations', collect_dois=False,
         * 'references': collects the number of references cited by the specified DOI.
     collect_dois : bool, optional, default: False
         Whether to also collect the list of DOIs of cited or referenced papers.
-    logging : {None, 'print', 'store', 'file'}, optional
+    logging : {None, 'print', 'store', 'file'} or Requester, optional
         What kind of logging, if any, to do for requested URLs.
     directory : str or SCDB, optional
         Folder or database object specifying the save location.
     verbose : bool, optional, default: False
         Whether to print out updates.
+    batch_size : int, optional, default: 1
+        The number of DOIs to request per URL.
+        If greater than 1, DOIs are collected in batches, with the 'metadata' utility.
+    n_jobs : int, optional, default: 1
+        The number of requests to run concurrently.
+    wait_time : float, optional, default: 0.1
+        Minimum time to wait between launching requests, in seconds.
+        Only used if a Requester object is not passed in as `logging`.
+    hooks : dict, optional
+        Functions to call with updates during the collection, with hook names as keys:
+
+        * 'on_request': called after each request, as `on_request(url, response)`.
+        * 'on_batch': called as each batch of DOIs is collected, in order, as
+          `on_batch(ind, outputs)`, where `outputs` has the outputs for each DOI in the batch.
+        * 'on_error': called if a request for a batch of DOIs fails, as `on_error(url, error)`.
 
     Returns
     -------
@@ -41,45 +61,127 @@ def collect_citations(dois, util='citations', collect_dois=False,
     meta_data : MetaData
         Meta data about the data collection.
 
+    Notes
+    -----
+    Concurrent requests share a single requester, such that the rate limit of
+    launching at most one request per `wait_time` applies across all requests.
+
+    If a request fails, the collection continues, with the outputs for the DOIs
+    in the failed request set as None.
+
     Examples
     --------
     Collect citation data for a specified article:
 
     >>> citations, meta_data = collect_citations(['10.1038/nmeth.1635'])
-    """
 
-    # Get OpenCitations URLs object
-    urls = OpenCitations()
-    urls.build_url(util)
+    Collect citation data for a list of articles, in batches, with concurrent requests:
+
+    >>> dois = ['10.1038/nmeth.1635', '10.1186/1756-8722-6-59']
+    >>> citations, meta_data = collect_citations(dois, batch_size=50, n_jobs=4) # doctest:+SKIP
+
+    Collect citation data, printing out the number of DOIs collected in each batch:
+
+    >>> hooks = {'on_batch' : lambda ind, outputs: print(ind, len(outputs))}
+    >>> citations, meta_data = collect_citations(dois, hooks=hooks) # doctest:+SKIP
+    """
 
     # Initialize meta data object
     meta_data = MetaData()
+    meta_data.add_settings({'util' : util, 'batch_size' : batch_size, 'n_jobs' : n_jobs})
 
     # Check for a Requester object to be passed in as logging, otherwise initialize
     req = logging if isinstance(logging, Requester) else \
-        Requester(wait_time=0.1, logging=logging, directory=directory)
+        Requester(wait_time=wait_time, logging=logging, directory=directory)
+
+    # Check hooks
+    hooks = check_hooks(hooks)
 
     if verbose:
         print('Collecting citation data.')
 
+    with req.request_hook(hooks['on_request']):
+        n_citations, cite_dois, _ = get_citations(req, dois, util, collect_dois, batch_size,
+                                                  n_jobs, verbose, hooks['on_batch'],
+                                                  hooks['on_error'])
+
+    meta_data.add_requester(req)
+
+    if not collect_dois:
+        return n_citations, meta_data
+    else:
+        return n_citations, cite_dois, meta_data
+
+
+def get_citations(req, dois, util='citations', collect_dois=False, batch_size=1, n_jobs=1,
+                  verbose=False, on_batch=None, on_error=None):
+    """Collect citation data for a list of DOIs, using a given requester.
+
+    Parameters
+    ----------
+    req : Requester
+        Requester to launch requests from.
+    dois : list of str
+        DOIs to collect citation data for.
+    util : {'citations', 'references'}
+        Which utility to collect citation data with.
+    collect_dois : bool, optional, default: False
+        Whether to also collect the list of DOIs of cited or referenced papers.
+    batch_size : int, optional, default: 1
+        The number of DOIs to request per URL.
+    n_jobs : int, optional, default: 1
+        The number of requests to run concurrently.
+    verbose : bool, optional, default: False
+        Whether to print out updates.
+    on_batch : callable, optional
+        Function to call as each batch is collected, as `on_batch(ind, outputs)`.
+    on_error : callable, optional
+        Function to call if a request fails, as `on_error(url, error)`.
+
+    Returns
+    -------
+    n_citations : dict
+        The number of citations or references for each article.
+    cite_dois : dict
+        The DOIs of the citing or references articles.
+        Values are None if `collect_dois` is False.
+    failed : list of str
+        DOIs for which the request failed, which have values of None in the outputs.
+    """
+
+    # Get OpenCitations URLs object
+    urls = OpenCitations()
+    urls.build_url(util)
+    urls.build_url('metadata')
+
+    # Define the batches of DOIs to collect, with one request per batch
+    batches = [dois[ind:ind + batch_size] for ind in range(0, len(dois), batch_size)]
+
     # Initialize dictionaries to store collected data
     n_citations = {}
     cite_dois = {}
+    failed = []
 
-    for doi in dois:
+    with ThreadPoolExecutor(n_jobs) as executor:
+        all_outputs = executor.map(_collect_batch, batches, repeat(req), repeat(urls),
+                                   repeat(util), repeat(collect_dois), repeat(on_error))
+        for ind, (outputs, batch_failed) in enumerate(all_outputs):
 
-        # Make the URL request for each DOI, and collect results
-        outputs = get_citation_data(req, urls.get_url(util, [doi]), collect_dois)
+            failed.extend(batch_failed)
 
-        # Unpack outputs depending on wether DOIs were collected
-        n_citations[doi], cite_dois[doi] = outputs if collect_dois else (outputs, None)
+            for doi, output in outputs.items():
 
-    meta_data.add_requester(req)
+                # Unpack outputs depending on wether DOIs were collected
+                n_citations[doi], cite_dois[doi] = output if collect_dois else (output, None)
 
-    if not collect_dois:
-        return n_citations, meta_data
-    else:
-        return n_citations, cite_dois, meta_data
+            if on_batch:
+                on_batch(ind, outputs)
+
+            if verbose:
+                print('  Collected batch {} of {} ({} DOIs).'.format(\
+                    ind + 1, len(batches), len(n_citations)))
+
+    return n_citations, cite_dois, failed
 
 
 def get_citation_data(req, citation_url, collect_dois=False):
@@ -104,6 +206,34 @@ def get_citation_data(req, citation_url, collect_dois=False):
     """
 
     page = req.request_url(citation_url)
+    page.raise_for_status()
+    with req.metrics.time_parse():
+        outputs = parse_citation_data(page, citation_url, collect_dois)
+
+    return outputs
+
+
+def parse_citation_data(page, citation_url, collect_dois=False):
+    """Parse citations from a requested OpenCitations page.
+
+    Parameters
+    ----------
+    page : requests.models.Response
+        Requested citations page.
+    citation_url : str
+        URL the citation data was collected from.
+    collect_dois : bool, optional, default: False
+        Whether to also collect the list of DOIs of cited or referenced papers.
+
+    Returns
+    -------
+    n_citations : int
+        The number of citations or references of the article.
+    citing_dois : list of str
+        The DOIs of the citing or references articles.
+        Only returned if `collect_dois` is True.
+    """
+
     jpage = json.loads(page.content.decode('utf-8'))
     n_citations = len(jpage)
 
@@ -125,3 +255,105 @@ def get_citation_data(req, citation_url, collect_dois=False):
         return n_citations
     else:
         return n_citations, citing_dois
+
+
+def get_citations_metadata(req, metadata_url, dois, util='citations', collect_dois=False):
+    """Extract citations for a batch of DOIs using an OpenCitations metadata URL request.
+
+    Parameters
+    ----------
+    req : Requester
+        Requester to launch requests from.
+    metadata_url : str
+        URL to collect metadata from, for a batch of DOIs.
+    dois : list of str
+        The DOIs included in the request.
+    util : {'citations', 'references'}
+        Which kind of citation data to extract.
+    collect_dois : bool, optional, default: False
+        Whether to also collect the list of DOIs of cited or referenced papers.
+
+    Returns
+    -------
+    outputs : dict
+        Outputs for each DOI, as returned by `get_citation_data`.
+    """
+
+    page = req.request_url(metadata_url)
+    page.raise_for_status()
+    with req.metrics.time_parse():
+        outputs = parse_citations_metadata(page, dois, util, collect_dois)
+
+    return outputs
+
+
+def parse_citations_metadata(page, dois, util='citations', collect_dois=False):
+    """Parse citations for a batch of DOIs from a requested OpenCitations metadata page.
+
+    Parameters
+    ----------
+    page : requests.models.Response
+        Requested metadata page.
+    dois : list of str
+        The DOIs included in the request.
+    util : {'citations', 'references'}
+        Which kind of citation data to extract.
+    collect_dois : bool, optional, default: False
+        Whether to also collect the list of DOIs of cited or referenced papers.
+
+    Returns
+    -------
+    outputs : dict
+        Outputs for each DOI, as returned by `get_citation_data`.
+    """
+
+    jpage = json.loads(page.content.decode('utf-8'))
+
+    # Index returned entries by DOI, ignoring case, as DOIs are case insensitive
+    entries = {entry['doi'].lower() : entry for entry in jpage}
+    cite_tag = 'citation' if util == 'citations' else 'reference'
+
+    outputs = {}
+    for doi in dois:
+
+        entry = entries.get(doi.lower(), {})
+        citing_dois = [cdoi.strip() for cdoi in entry.get(cite_tag, '').split(';') \
+            if cdoi.strip()]
+
+        # Encode missing entries, and entries with no citations, as None, as for single requests
+        n_citations = len(citing_dois) if citing_dois else None
+        citing_dois = citing_dois if citing_dois else None
+
+        outputs[doi] = (n_citations, citing_dois) if collect_dois else n_citations
+
+    return outputs
+
+
+def _collect_batch(batch, req, urls, util, collect_dois, on_error=None):
+    """Collect citation data for a batch of DOIs, with a single request.
+
+    Returns
+    -------
+    outputs : dict
+        Outputs for each DOI, as returned by `get_citation_data`.
+    failed : list of str
+        The DOIs of the batch, if the request failed, otherwise an empty list.
+    """
+
+    url = urls.get_url('metadata', ['__'.join(batch)]) if len(batch) > 1 else \
+        urls.get_url(util, batch)
+
+    try:
+        if len(batch) > 1:
+            outputs = get_citations_metadata(req, url, batch, util, collect_dois)
+        else:
+            outputs = {batch[0] : get_citation_data(req, url, collect_dois)}
+
+    except (requests.RequestException, ValueError) as error:
+
+        if on_error:
+            on_error(url, error)
+
+        return {doi : (None, None) if collect_dois else None for doi in batch}, list(batch)
+
+    return outputs, []
@@ -4,12 +4,14 @@ import numpy as np
 from bs4 import BeautifulSoup
 
 from lisc.requester import Requester
+from lisc.modutils.errors import CollectionStopped
 from lisc.data.term import Term
 from lisc.data.meta_data import MetaData
 from lisc.collect.info import get_db_info
-from lisc.collect.terms import make_term, join
+from lisc.collect.hooks import check_hooks, run_request
+from lisc.collect.terms import make_term
 from lisc.collect.process import get_info
-from lisc.urls.eutils import EUtils, get_wait_time
+from lisc.urls.eutils import EUtils, get_wait_time, check_post
 
 ###################################################################################################
 ###################################################################################################
@@ -17,7 +19,7 @@ from lisc.urls.eutils import EUtils, get_wait_time
 def collect_counts(terms_a, inclusions_a=None, exclusions_a=None, labels_a=None,
                    terms_b=None, inclusions_b=None, exclusions_b=None, labels_b=None,
                    db='pubmed', field='TIAB', api_key=None, collect_coocs=True,
-                   logging=None, directory=None, collect_info=True, verbose=False,
+                   logging=None, directory=None, collect_info=True, verbose=False, hooks=None,
                    **eutils_kwargs):
     """Collect count and term co-occurrence data from EUtils.
 
@@ -57,6 +59,16 @@ def collect_counts(terms_a, inclusions_a=None, exclusions_a=None, labels_a=None,
         Whether to collect database information, to be added to meta data.
     verbose : bool, optional, default: False
         Whether to print out updates.
+    hooks : dict, optional
+        Functions to call with updates during the collection, with hook names as keys:
+
+        * 'on_request': called after each request, as `on_request(url, response)`.
+        * 'on_term_start': called as collection starts for each term in the first list,
+          as `on_term_start(ind, label)`.
+        * 'on_cell': called with each collected value, as `on_cell(a_ind, b_ind, count)`,
+          where `b_ind` is None for the count of a term in the first list.
+        * 'on_error': called if a request fails, as `on_error(url, error)`. If provided,
+          the collection continues, with the failed value left as -1.
     **eutils_kwargs
         Additional settings for the EUtils API.
 
@@ -77,12 +89,21 @@ def collect_counts(terms_a, inclusions_a=None, exclusions_a=None, labels_a=None,
     The HTML page returned by the EUtils search includes a 'count' field.
     This field contains the number of articles with both terms. This is extracted.
 
+    Raising `CollectionStopped` from any hook stops the collection early, returning the
+    partially collected data, with any values not yet collected left as -1.
+
     Examples
     --------
     Collect counts and co-occurrences for a single set of two search terms:
 
     >>> coocs, counts, meta_data = collect_counts([['frontal lobe'], ['temporal lobe']])
 
+    Collect counts, printing out each value as it is collected:
+
+    >>> hooks = {'on_cell' : lambda a_ind, b_ind, count: print(a_ind, b_ind, count)}
+    >>> coocs, counts, meta_data = collect_counts([['frontal lobe'], ['temporal lobe']],
+    ...                                           hooks=hooks) # doctest: +SKIP
+
     Collect counts and co-occurrences for two sets of search terms:
 
     >>> coocs, counts, meta_data = collect_counts(terms_a=[['frontal lobe'], ['temporal lobe']],
@@ -92,28 +113,18 @@ def collect_counts(terms_a, inclusions_a=None, exclusions_a=None, labels_a=None,
     # Initialize meta data object
     meta_data = MetaData()
 
-    # Collect settings for URLs, and add them to the metadata object
-    settings = {'db' : db, 'field' : field}
-    settings.update(eutils_kwargs)
+    # Get the URLs object for collecting counts, and add the settings to the metadata object
+    urls, settings = make_counts_urls(db, field, api_key, **eutils_kwargs)
     meta_data.add_settings(settings)
 
-    # Get e-utils URLS object. Set retmax as 0, since not using UIDs for counts
-    urls = EUtils(**settings, retmax='0', retmode='xml', api_key=api_key)
-
-    # Define the settings for the search utility, adding a default for datetype if not provided
-    search_settings = ['db', 'retmax', 'retmode', 'field']
-    if 'date' in ''.join(eutils_kwargs.keys()) and 'datetype' not in eutils_kwargs.keys():
-        search_settings.append('datetype')
-
-    # Build the URLs for the utilities that will be used
-    urls.build_url('info', settings=['db'])
-    urls.build_url('search', settings=search_settings + list(eutils_kwargs.keys()))
-
     # Check for a Requester object to be passed in as logging, otherwise initialize
     req = logging if isinstance(logging, Requester) else \
         Requester(wait_time=get_wait_time(urls.authenticated),
                   logging=logging, directory=directory)
 
+    # Check hooks
+    hooks = check_hooks(hooks)
+
     # Sort out terms for list a
     n_terms_a = len(terms_a)
     counts_a = np.ones([n_terms_a], dtype=int) * -1
@@ -143,53 +154,67 @@ def collect_counts(terms_a, inclusions_a=None, exclusions_a=None, labels_a=None,
         if square:
             np.fill_diagonal(co_occurences, 0)
 
-    # Get current information about database being used
-    if collect_info:
-        meta_data.add_db_info(get_db_info(req, urls.get_url('info')))
+    # Make the search term arguments for each term, and the URL templates to fill them in
+    #   The templates are filled in with term arguments, to make the URL for each count
+    terms_a = [Term(*term) for term in zip(labels_a, terms_a, inclusions_a, exclusions_a)]
+    args_a = [make_term(term) for term in terms_a]
+    template = urls.get_template('search', 'term')
+    if collect_coocs:
+        args_b = args_a if square else [make_term(Term(*term)) for term in \
+            zip(labels_b, terms_b, inclusions_b, exclusions_b)]
+        template_ab = urls.get_template('search', 'term', '{}AND{}')
+
+    # Set any request hook on the requester, which is reset after collection
+    with req.request_hook(hooks['on_request']):
 
-    # Loop through each term (list-A)
-    for a_ind, (label_a, search_a, incl_a, excl_a) in \
-        enumerate(zip(labels_a, terms_a, inclusions_a, exclusions_a)):
+        # Get current information about database being used
+        if collect_info:
+            meta_data.add_db_info(get_db_info(req, urls.get_url('info')))
 
-        # Make term arguments
-        term_a = Term(label_a, search_a, incl_a, excl_a)
-        term_a_arg = make_term(term_a)
+        # Loop through each term (list-A), stopping early if a hook stops the collection
+        try:
+            for a_ind, (term_a, term_a_arg) in enumerate(zip(terms_a, args_a)):
 
-        if verbose:
-            print('Running counts for: ', term_a.label)
+                if verbose:
+                    print('Running counts for: ', term_a.label)
+                if hooks['on_term_start']:
+                    hooks['on_term_start'](a_ind, term_a.label)
 
-        # Get number of results for current term search
-        url = urls.get_url('search', settings={'term' : term_a_arg})
-        counts_a[a_ind] = get_count(req, url)
+                # Get number of results for current term search
+                url = template.format(term_a_arg)
+                counts_a[a_ind] = run_request(get_count, req, url, hooks['on_error'], -1)
+                if hooks['on_cell']:
+                    hooks['on_cell'](a_ind, None, counts_a[a_ind])
 
-        if collect_coocs:
+                if collect_coocs:
 
-            # For each term in list a, loop through each term in list b
-            for b_ind, (label_b, search_b, incl_b, excl_b) in \
-                enumerate(zip(labels_b, terms_b, inclusions_b, exclusions_b)):
+                    # For each term in list a, loop through each term in list b
+                    for b_ind, term_b_arg in enumerate(args_b):
 
-                # Skip collections of equivalent term combinations - if single term list
-                #  This will skip the diagonal row, and any combinations already collected
-                if square and co_occurences[a_ind, b_ind] != -1:
-                    continue
+                        # Skip collections of equivalent term combinations - if single term list
+                        #  This will skip the diagonal row, and any combinations already collected
+                        if square and co_occurences[a_ind, b_ind] != -1:
+                            continue
 
-                # Make term arguments
-                term_b = Term(label_b, search_b, incl_b, excl_b)
-                term_b_arg = make_term(term_b)
-                full_term_arg = join(term_a_arg, term_b_arg, 'AND')
+                        # Get number of results for current term search, once per term
+                        if not square and a_ind == 0:
+                            url = template.format(term_b_arg)
+                            counts_b[b_ind] = run_request(get_count, req, url,
+                                                          hooks['on_error'], -1)
 
-                # Get number of results for current term search
-                if not square:
-                    url = urls.get_url('search', settings={'term' : term_b_arg})
-                    counts_b[b_ind] = get_count(req, url)
+                        # Get number of results for combination of terms
+                        url = template_ab.format(term_a_arg, term_b_arg)
+                        count = run_request(get_count, req, url, hooks['on_error'], -1)
 
-                # Get number of results for combination of terms
-                url = urls.get_url('search', settings={'term' : full_term_arg})
-                count = get_count(req, url)
+                        co_occurences[a_ind, b_ind] = count
+                        if square:
+                            co_occurences[b_ind, a_ind] = count
+                        if hooks['on_cell']:
+                            hooks['on_cell'](a_ind, b_ind, count)
 
-                co_occurences[a_ind, b_ind] = count
-                if square:
-                    co_occurences[b_ind, a_ind] = count
+        except CollectionStopped:
+            if verbose:
+                print('Collection stopped.')
 
     if collect_coocs:
         counts = counts_a if square else [counts_a, counts_b]
@@ -205,6 +230,54 @@ def collect_counts(terms_a, inclusions_a=None, exclusions_a=None, labels_a=None,
         return co_occurences, counts, meta_data
 
 
+def make_counts_urls(db='pubmed', field='TIAB', api_key=None, **eutils_kwargs):
+    """Make the EUtils URLs object used for collecting counts.
+
+    Parameters
+    ----------
+    db : str, optional, default: 'pubmed'
+        Which database to access from EUtils.
+    field : str, optional, default: 'TIAB'
+        Field to search for term within.
+    api_key : str, optional
+        An API key for a NCBI account.
+    **eutils_kwargs
+        Additional settings for the EUtils API.
+
+    Returns
+    -------
+    urls : EUtils
+        URLs object, with the 'info' and 'search' utilities built.
+    settings : dict
+        The settings for the URLs, to be added to meta data.
+
+    Examples
+    --------
+    Make the URLs for collecting counts from pubmed, and get a search URL:
+
+    >>> urls, settings = make_counts_urls(db='pubmed')
+    >>> url = urls.get_url('search', settings={'term' : 'brain'})
+    """
+
+    # Collect settings for URLs
+    settings = {'db' : db, 'field' : field}
+    settings.update(eutils_kwargs)
+
+    # Get e-utils URLS object. Set retmax as 0, since not using UIDs for counts
+    urls = EUtils(**settings, retmax='0', retmode='xml', api_key=api_key)
+
+    # Define the settings for the search utility, adding a default for datetype if not provided
+    search_settings = ['db', 'retmax', 'retmode', 'field']
+    if 'date' in ''.join(eutils_kwargs.keys()) and 'datetype' not in eutils_kwargs.keys():
+        search_settings.append('datetype')
+
+    # Build the URLs for the utilities that will be used
+    urls.build_url('info', settings=['db'])
+    urls.build_url('search', settings=search_settings + list(eutils_kwargs.keys()))
+
+    return urls, settings
+
+
 def get_count(req, url):
     """Get the count of how many articles listed at the requested URL.
 
@@ -215,13 +288,49 @@ def get_count(req, url):
     url : str
         URL to request count data from.
 
+    Returns
+    -------
+    count : int
+        Count of the number of articles found.
+
+    Notes
+    -----
+    If the requester is memoizing, the count is taken from the memo if the URL has already
+    been requested, and otherwise, is stored in the memo if successfully requested.
+
+    URLs that are too long for a GET request, such as for terms with many synonyms,
+    are requested with a POST request.
+    """
+
+    count = req.get_memo(url)
+    if count is not None:
+        return count
+
+    page = req.request_url(url, post=check_post(url))
+
+    with req.metrics.time_parse():
+        count = parse_count(page)
+
+    if page.status_code == 200:
+        req.add_memo(url, count)
+
+    return count
+
+
+def parse_count(page):
+    """Parse the count of how many articles are listed on a search page.
+
+    Parameters
+    ----------
+    page : requests.models.Response
+        Requested search page.
+
     Returns
     -------
     count : int
         Count of the number of articles found.
     """
 
-    page = req.request_url(url)
     page_soup = BeautifulSoup(page.content, 'lxml')
 
     counts = get_info(page_soup, 'count', 'all')
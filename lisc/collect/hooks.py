@@ -0,0 +1,86 @@
+"""Functionality for hooks, which are called with updates during data collection."""
+
+from lisc.modutils.errors import CollectionStopped
+
+###################################################################################################
+###################################################################################################
+
+# Define the hooks that can be used, and the arguments each is called with
+HOOKS = {
+    'on_request' : ['url', 'response'],
+    'on_term_start' : ['ind', 'label'],
+    'on_cell' : ['a_ind', 'b_ind', 'count'],
+    'on_batch_parsed' : ['ind', 'arts'],
+    'on_batch' : ['ind', 'outputs'],
+    'on_error' : ['url', 'error'],
+}
+
+def check_hooks(hooks=None):
+    """Check a definition of collection hooks.
+
+    Parameters
+    ----------
+    hooks : dict, optional
+        Functions to call during data collection, with hook names as keys.
+
+    Returns
+    -------
+    hooks : dict
+        Function for each hook, with None for any hooks that are not used.
+
+    Raises
+    ------
+    ValueError
+        If an invalid hook name is given.
+
+    Examples
+    --------
+    Check a hook definition, to print each label as collection starts for each term:
+
+    >>> hooks = check_hooks({'on_term_start' : lambda ind, label: print(label)})
+    """
+
+    hooks = hooks if hooks else {}
+
+    for label in hooks:
+        if label not in HOOKS:
+            raise ValueError('Invalid hook name: {}.'.format(label))
+
+    return {label : hooks.get(label, None) for label in HOOKS}
+
+
+def run_request(func, req, url, on_error=None, default=None, **kwargs):
+    """Run a request & parse function, passing any errors to an error hook, if provided.
+
+    Parameters
+    ----------
+    func : callable
+        Function to request and parse a URL, called as `func(req, url, **kwargs)`.
+    req : Requester
+        Requester object to launch requests from.
+    url : str
+        URL to request.
+    on_error : callable, optional
+        Hook to call with the URL and the error, if an error occurs.
+        If not provided, errors are raised.
+    default : object, optional
+        Value to return if an error occurs, and is passed to the error hook.
+    **kwargs
+        Additional arguments to pass to `func`.
+
+    Returns
+    -------
+    object
+        The output of `func`, or `default` if an error occurred.
+    """
+
+    if not on_error:
+        return func(req, url, **kwargs)
+
+    try:
+        return func(req, url, **kwargs)
+    except CollectionStopped:
+        raise
+    except Exception as error:
+        on_error(url, error)
+        return default
@@ -83,13 +83,35 @@ def get_db_info(req, info_url):
     >>> db_info = get_db_info(Requester(), url)
     """
 
+    # Get the info page and parse it
+    info_page = req.request_url(info_url)
+
+    with req.metrics.time_parse():
+        db_info = parse_db_info(info_page)
+
+    return db_info
+
+
+def parse_db_info(info_page):
+    """Parse information about a database from a requested EInfo page.
+
+    Parameters
+    ----------
+    info_page : requests.models.Response
+        Requested EInfo page.
+
+    Returns
+    -------
+    db_info : dict
+        Information about the database from which the data was accessed.
+    """
+
     # Squash warning that arises despite specifying XML parsing
     from bs4.builder import XMLParsedAsHTMLWarning
     import warnings
     warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
 
-    # Get the info page and parse with BeautifulSoup
-    info_page = req.request_url(info_url)
+    # Parse the info page with BeautifulSoup
     info_page_soup = BeautifulSoup(info_page.content, 'lxml')
 
     # Set list of fields to get information on from EInfo
@@ -0,0 +1,305 @@
+"""Collect counts data locally, from already collected article data."""
+
+import numpy as np
+
+from lisc.data.term import Term
+from lisc.data.utils import tokenize
+from lisc.data.meta_data import MetaData
+from lisc.collect.terms import check_joiner, DEFAULT_TERM_JOINERS
+from lisc.modutils.dependencies import safe_import
+
+sparse = safe_import('.sparse', 'scipy')
+
+###################################################################################################
+###################################################################################################
+
+def collect_counts_local(data, terms_a, inclusions_a=None, exclusions_a=None, labels_a=None,
+                         terms_b=None, inclusions_b=None, exclusions_b=None, labels_b=None,
+                         fields=('titles', 'words'), collect_coocs=True,
+                         joiners_a=DEFAULT_TERM_JOINERS, joiners_b=None, verbose=False):
+    """Compute count and term co-occurrence data from already collected article data.
+
+    Parameters
+    ----------
+    data : Words or list of Articles
+        Collected article data to search within.
+    terms_a : list of list of str
+        Search terms.
+    inclusions_a : list of list of str, optional
+        Inclusion words for search terms.
+    exclusions_a : list of list of str, optional
+        Exclusion words for search terms.
+    labels_a : list of str, optional
+        Labels for the search terms.
+    terms_b : list of list of str, optional
+        Secondary list of search terms.
+    inclusions_b : list of list of str, optional
+        Inclusion words for the second list of search terms.
+    exclusions_b : list of list of str, optional
+        Exclusion words for the second list of search terms.
+    labels_b : list of str
+        Labels for the second list of search terms.
+    fields : tuple of str, optional, default: ('titles', 'words')
+        Article data fields to search for terms within.
+        The default searches titles and abstracts, equivalent to the 'TIAB' field.
+    collect_coocs : bool, optional, default: True
+        Whether to compute co-occurence data.
+        If False, only computes the counts for first term list.
+    joiners_a : dict, optional
+        The joiner to use for each of the term types.
+        Should have keys ['search', 'inclusions', 'exclusions'].
+    joiners_b : dict, optional
+        The joiner to use for each of the term types, for the second list of search terms.
+        If not provided, the joiners for the first list of search terms are used.
+    verbose : bool, optional, default: False
+        Whether to print out updates.
+
+    Returns
+    -------
+    co_occurences : 2d array
+        The numbers of articles found for each combination of terms.
+        Only returned if `collect_coocs` is True.
+    counts : 1d array or list of 1d array
+        Number of articles for each term independently.
+    meta_data : MetaData
+        Meta data from the data collection.
+
+    Notes
+    -----
+    This function gives outputs in the same format as `collect_counts`, and follows the same
+    search term semantics, with terms defined as `(search)AND(inclusions)NOT(exclusions)`.
+
+    Each search string is matched as an exact phrase, ignoring case and punctuation.
+    Articles collected under multiple terms are only counted once, based on their IDs.
+
+    Matching is done against the text as stored in `data`. If the articles have already been
+    processed, stopwords have been removed, and so phrases that include stopwords can not match.
+
+    Co-occurrences are computed as products of sparse document-term incidence matrices.
+    This function requires the optional dependency `scipy`.
+
+    Examples
+    --------
+    Compute counts and co-occurrences for terms, from an existing ``Words`` object:
+
+    >>> terms = [['frontal lobe'], ['temporal lobe']]
+    >>> coocs, counts, meta_data = collect_counts_local(words, terms) # doctest:+SKIP
+    """
+
+    joiners_b = joiners_b if joiners_b else joiners_a
+    for joiner in list(joiners_a.values()) + list(joiners_b.values()):
+        check_joiner(joiner)
+
+    docs = get_documents(data, fields)
+
+    if verbose:
+        print('Computing counts across {} documents.'.format(len(docs)))
+
+    matches = {}
+    incidence_a = make_incidence_matrix(docs, terms_a, inclusions_a, exclusions_a, labels_a,
+                                        joiners_a, matches)
+    counts_a = np.asarray(incidence_a.sum(axis=0)).ravel().astype(int)
+
+    if collect_coocs:
+
+        square = not terms_b
+        if square:
+            incidence_b, counts_b = incidence_a, counts_a
+        else:
+            incidence_b = make_incidence_matrix(docs, terms_b, inclusions_b, exclusions_b,
+                                                labels_b, joiners_b, matches)
+            counts_b = np.asarray(incidence_b.sum(axis=0)).ravel().astype(int)
+
+        co_occurences = np.asarray((incidence_a.T @ incidence_b).toarray(), dtype=int)
+
+        # Set diagonal to zero if square (term co-occurrence with itself)
+        if square:
+            np.fill_diagonal(co_occurences, 0)
+
+    meta_data = MetaData()
+    meta_data.add_settings({'source' : 'local', 'fields' : list(fields),
+                            'n_documents' : len(docs)})
+
+    if not collect_coocs:
+        return counts_a, meta_data
+    else:
+        counts = counts_a if square else [counts_a, counts_b]
+        return co_occurences, counts, meta_data
+
+
+def get_documents(data, fields=('titles', 'words')):
+    """Get normalized documents from collected article data, dropping duplicate articles.
+
+    Parameters
+    ----------
+    data : Words or list of Articles
+        Collected article data.
+    fields : tuple of str, optional, default: ('titles', 'words')
+        Article data fields to include in each document.
+
+    Returns
+    -------
+    docs : list of str
+        Normalized text of each unique article.
+    """
+
+    docs, seen = [], set()
+    for arts in data:
+        for ind, art_id in enumerate(arts.ids):
+
+            if art_id is not None:
+                if art_id in seen:
+                    continue
+                seen.add(art_id)
+
+            docs.append(' ' + ' '.join(normalize_text(getattr(arts, field)[ind]) \
+                for field in fields) + ' ')
+
+    return docs
+
+
+def normalize_text(text):
+    """Normalize text for phrase matching, as lower case tokens separated by single spaces.
+
+    Parameters
+    ----------
+    text : str or list of str or None
+        Text to normalize, either as a string or as a list of tokens.
+
+    Returns
+    -------
+    str
+        Normalized text.
+
+    Examples
+    --------
+    >>> normalize_text('The Frontal-Lobe, and (temporal) lobe.')
+    'the frontal-lobe and temporal lobe'
+    """
+
+    if not text:
+        return ''
+
+    if isinstance(text, str):
+        text = tokenize(text)
+
+    return ' '.join(text).lower()
+
+
+def make_incidence_matrix(docs, terms, inclusions=None, exclusions=None, labels=None,
+                          joiners=DEFAULT_TERM_JOINERS, matches=None):
+    """Make a sparse document-term incidence matrix.
+
+    Parameters
+    ----------
+    docs : list of str
+        Normalized documents, as returned by `get_documents`.
+    terms : list of list of str
+        Search terms.
+    inclusions, exclusions : list of list of str, optional
+        Inclusion and exclusion words for search terms.
+    labels : list of str, optional
+        Labels for the search terms.
+    joiners : dict, optional
+        The joiner to use for each of the term types.
+    matches : dict, optional
+        A cache of phrase matches, to re-use across calls.
+
+    Returns
+    -------
+    scipy.sparse.csc_matrix
+        Incidence matrix, with shape [n_docs, n_terms], with 1 where a document matches a term.
+    """
+
+    n_terms = len(terms)
+    labels = labels if labels else [term[0] for term in terms]
+    inclusions = inclusions if inclusions else [[]] * n_terms
+    exclusions = exclusions if exclusions else [[]] * n_terms
+    matches = {} if matches is None else matches
+
+    rows, cols = [], []
+    for ind, term in enumerate(zip(labels, terms, inclusions, exclusions)):
+        doc_inds = np.flatnonzero(match_term(docs, Term(*term), joiners, matches))
+        rows.append(doc_inds)
+        cols.append(np.full(len(doc_inds), ind))
+
+    rows = np.concatenate(rows) if rows else np.zeros(0, dtype=int)
+    cols = np.concatenate(cols) if cols else np.zeros(0, dtype=int)
+
+    return sparse.csc_matrix((np.ones(len(rows), dtype=int), (rows, cols)),
+                             shape=(len(docs), n_terms))
+
+
+def match_term(docs, term, joiners=DEFAULT_TERM_JOINERS, matches=None):
+    """Find the documents that match a search term definition.
+
+    Parameters
+    ----------
+    docs : list of str
+        Normalized documents, as returned by `get_documents`.
+    term : Term
+        Term definition.
+    joiners : dict, optional
+        The joiner to use for each of the term types.
+    matches : dict, optional
+        A cache of phrase matches, to re-use across calls.
+
+    Returns
+    -------
+    match : 1d array of bool
+        Whether each document matches the term.
+    """
+
+    matches = {} if matches is None else matches
+
+    match = _match_component(docs, term.search, joiners['search'], matches)
+
+    # Only apply inclusions & exclusions if there are search terms, as in `make_term`
+    if match is None:
+        return np.zeros(len(docs), dtype=bool)
+
+    incl = _match_component(docs, term.inclusions, joiners['inclusions'], matches)
+    if incl is not None:
+        match = match & incl
+
+    excl = _match_component(docs, term.exclusions, joiners['exclusions'], matches)
+    if excl is not None:
+        match = match & ~excl
+
+    return match
+
+
+def _match_component(docs, phrases, joiner, matches):
+    """Match a search term component, joining the matches for each phrase.
+
+    Returns
+    -------
+    1d array of bool or None
+        Whether each document matches the component, or None if the component is empty.
+    """
+
+    # Empty components are dropped, as in `make_comp`
+    if not phrases or not phrases[0]:
+        return None
+
+    if isinstance(phrases, str):
+        phrases = [phrases]
+
+    out = None
+    for phrase in phrases:
+
+        key = ' ' + normalize_text(phrase) + ' '
+        if key not in matches:
+            matches[key] = np.fromiter((key in doc for doc in docs), dtype=bool, count=len(docs))
+        match = matches[key]
+
+        if out is None:
+            out = match
+        elif joiner == 'OR':
+            out = out | match
+        elif joiner == 'AND':
+            out = out & match
+        elif joiner == 'NOT':
+            out = out & ~match
+
+    return out
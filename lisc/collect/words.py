@@ -5,20 +5,28 @@ from bs4 import BeautifulSoup
 from lisc.data.term import Term
 from lisc.requester import Requester
 from lisc.data.articles import Articles
+from lisc.data.base_articles import DATA_FIELDS
 from lisc.data.meta_data import MetaData
+from lisc.io.db import batch_manifest
+from lisc.modutils.errors import CollectionStopped
 from lisc.collect.terms import make_term
 from lisc.collect.info import get_db_info
+from lisc.collect.hooks import check_hooks, run_request
 from lisc.collect.process import get_info, extract_tag
 from lisc.collect.process import process_ids, process_authors, process_pub_date
-from lisc.urls.eutils import EUtils, get_wait_time
+from lisc.urls.eutils import EUtils, get_wait_time, check_post
 
 ###################################################################################################
 ###################################################################################################
 
+# Number of articles to fetch per request, by ID, when not using history
+#   IDs are sent with POST requests, so the batch size is not limited by URL length
+FETCH_BATCH_SIZE = 500
+
 def collect_words(terms, inclusions=None, exclusions=None, labels=None,
                   db='pubmed', retmax=100, field='TIAB', usehistory=False,
                   api_key=None, save_and_clear=False, logging=None, directory=None,
-                  collect_info=True, verbose=False, **eutils_kwargs):
+                  collect_info=True, verbose=False, hooks=None, **eutils_kwargs):
     """Collect text data and metadata from EUtils using specified search term(s).
 
     Parameters
@@ -52,6 +60,16 @@ def collect_words(terms, inclusions=None, exclusions=None, labels=None,
         Whether to collect database information, to be added to meta data.
     verbose : bool, optional, default: False
         Whether to print out updates.
+    hooks : dict, optional
+        Functions to call with updates during the collection, with hook names as keys:
+
+        * 'on_request': called after each request, as `on_request(url, response)`.
+        * 'on_term_start': called as collection starts for each term,
+          as `on_term_start(ind, label)`.
+        * 'on_batch_parsed': called after each batch of articles is collected and parsed,
+          as `on_batch_parsed(ind, arts)`, where `arts` holds all articles for the term so far.
+        * 'on_error': called if a request for a batch of articles fails, as
+          `on_error(url, error)`. If provided, the collection continues, skipping the batch.
     **eutils_kwargs
         Additional settings for the EUtils API.
 
@@ -70,6 +88,9 @@ def collect_words(terms, inclusions=None, exclusions=None, labels=None,
     For each article, it pulls and saves out data (including title, abstract, authors, etc),
     using the hierarchical tag structure that organizes the articles.
 
+    Raising `CollectionStopped` from any hook stops the collection early, returning the
+    data for the terms that were completed.
+
     Examples
     --------
     Collect words data for two terms, limiting the results to 5 articles per term:
@@ -109,9 +130,8 @@ def collect_words(terms, inclusions=None, exclusions=None, labels=None,
         Requester(wait_time=get_wait_time(urls.authenticated),
                   logging=logging, directory=directory)
 
-    # Get current information about database being used
-    if collect_info:
-        meta_data.add_db_info(get_db_info(req, urls.get_url('info')))
+    # Check hooks
+    hooks = check_hooks(hooks)
 
     # Check labels, inclusions & exclusions
     labels = labels if labels else [term[0] for term in terms]
@@ -119,87 +139,171 @@ def collect_words(terms, inclusions=None, exclusions=None, labels=None,
     exclusions = exclusions if exclusions else [[]] * len(terms)
 
     # Loop through all the terms, launch collection, and collect results
+    #   This stops early, keeping completed terms, if a hook stops the collection
+    #   Any request hook is set on the requester, and is reset after collection
+    #   If saving to a database, the manifest is updated once, after all terms are saved
     results = []
-    for label, search, incl, excl in zip(labels, terms, inclusions, exclusions):
+    with req.request_hook(hooks['on_request']), \
+        batch_manifest(directory if save_and_clear else None):
+
+        # Get current information about database being used
+        if collect_info:
+            meta_data.add_db_info(get_db_info(req, urls.get_url('info')))
+
+        try:
+            for t_ind, (label, search, incl, excl) in \
+                enumerate(zip(labels, terms, inclusions, exclusions)):
+
+                # Collect term information and make search term argument
+                term = Term(label, search, incl, excl)
+                term_arg = make_term(term)
+
+                if verbose:
+                    print('Collecting data for: ', term.label)
+                if hooks['on_term_start']:
+                    hooks['on_term_start'](t_ind, term.label)
+
+                # Initialize object to store data for current term articles
+                arts = Articles(term)
+
+                # Search for articles, getting the number of articles, and the IDs or history
+                #   If the search fails, with an error hook, no articles are collected
+                url = urls.get_url('search', settings={'term' : term_arg})
+                count, ids, web_env, query_key = run_request(\
+                    search_articles, req, url, hooks['on_error'], (0, [], None, None),
+                    post=check_post(url))
+
+                # Collect articles, using history
+                if usehistory:
+
+                    # Set default retmax per history iteration
+                    retmax_hist = 100
+
+                    # Loop through, using history to collect groups of articles at a time
+                    retstart_it = 0
+                    while retstart_it < count:
+
+                        # Set the retmax for the current iteration
+                        retmax_it = min(retmax-retstart_it, retmax_hist)
+
+                        # Get article page, collect data
+                        url_settings = {'WebEnv' : web_env, 'query_key' : query_key,
+                                        'retstart' : str(retstart_it), 'retmax' : str(retmax_it)}
+                        art_url = urls.get_url('fetch', settings=url_settings)
+                        arts = run_request(get_articles, req, art_url, hooks['on_error'], arts,
+                                           arts=arts)
+                        if hooks['on_batch_parsed']:
+                            hooks['on_batch_parsed'](t_ind, arts)
+
+                        # Update position for counting, and break out if more than global retmax
+                        retstart_it += retmax_hist
+                        if retstart_it >= int(retmax):
+                            break
+
+                # Without using history
+                else:
+
+                    # Batch requested IDs into groups, each requested with a POST request
+                    for ind in range(0, len(ids), FETCH_BATCH_SIZE):
+                        art_url = urls.get_url('fetch', settings=\
+                            {'id' : ','.join(ids[ind:ind + FETCH_BATCH_SIZE])})
+                        arts = run_request(get_articles, req, art_url, hooks['on_error'], arts,
+                                           arts=arts, post=True)
+                        if hooks['on_batch_parsed']:
+                            hooks['on_batch_parsed'](t_ind, arts)
+
+                arts._check_results()
+
+                if save_and_clear:
+                    arts.save_and_clear(directory=directory)
+                results.append(arts)
+
+        except CollectionStopped:
+            if verbose:
+                print('Collection stopped.')
 
-        # Collect term information and make search term argument
-        term = Term(label, search, incl, excl)
-        term_arg = make_term(term)
+    # If a requester was passed in, assume it is to contiune (don't close)
+    meta_data.add_requester(req, close=not isinstance(logging, Requester))
 
-        if verbose:
-            print('Collecting data for: ', term.label)
+    return results, meta_data
 
-        # Initialize object to store data for current term articles
-        arts = Articles(term)
 
-        # Request web page
-        url = urls.get_url('search', settings={'term' : term_arg})
-        page = req.request_url(url)
-        page_soup = BeautifulSoup(page.content, 'lxml')
+def search_articles(req, url, post=False):
+    """Search for articles, getting the information needed to collect them.
 
-        # Get number of articles
-        count = int(page_soup.find('count').text)
-
-        # Collect articles, using history
-        if usehistory:
+    Parameters
+    ----------
+    req : Requester
+        Requester object to launch requests from.
+    url : str
+        URL for the search.
+    post : bool, optional, default: False
+        Whether to request the URL with a POST request, such as for a long search term.
 
-            # Get the information from the page for using history
-            web_env = page_soup.find('webenv').text
-            query_key = page_soup.find('querykey').text
+    Returns
+    -------
+    count : int
+        Number of articles found by the search.
+    ids : list of str
+        IDs of the articles returned by the search.
+    web_env, query_key : str or None
+        The history information of the search, if the search used history.
+    """
 
-            # Set default retmax per history iteration
-            retmax_hist = 100
+    page = req.request_url(url, post=post)
 
-            # Loop through, using history to collect groups of articles at a time
-            retstart_it = 0
-            while retstart_it < count:
+    with req.metrics.time_parse():
 
-                # Set the retmax for the current iteration
-                retmax_it = min(retmax-retstart_it, retmax_hist)
+        page_soup = BeautifulSoup(page.content, 'lxml')
 
-                # Get article page, collect data
-                url_settings = {'WebEnv' : web_env, 'query_key' : query_key,
-                                'retstart' : str(retstart_it), 'retmax' : str(retmax_it)}
-                art_url = urls.get_url('fetch', settings=url_settings)
-                arts = get_articles(req, art_url, arts)
+        count = int(page_soup.find('count').text)
+        ids = [el.text for el in page_soup.find_all('id')]
+        web_env, query_key = [tag.text if tag else None for tag in \
+            [page_soup.find('webenv'), page_soup.find('querykey')]]
 
-                # Update position for counting, and break out if more than global retmax
-                retstart_it += retmax_hist
-                if retstart_it >= int(retmax):
-                    break
+    return count, ids, web_env, query_key
 
-        # Without using history
-        else:
 
-            ids = page_soup.find_all('id')
-            ids_str = ','.join([el.text for el in ids])
+def get_articles(req, url, arts, post=False):
+    """Collect information for each article found for a given term.
 
-            # Batch requested IDs into groups of 100 to avoid URL length limits
-            for ind in range(0, len(ids_str), 100):
-                art_url = urls.get_url('fetch', settings={'id' : ids_str[ind:ind+100]})
-                arts = get_articles(req, art_url, arts)
+    Parameters
+    ----------
+    req : Requester
+        Requester object to launch requests from.
+    url : str
+        URL for the article to be collected.
+    arts : Articles
+        Object to add data to.
+    post : bool, optional, default: False
+        Whether to request the URL with a POST request, such as for a long list of IDs.
 
-        arts._check_results()
+    Returns
+    -------
+    arts : Articles
+        Object to store information for the current term.
+    """
 
-        if save_and_clear:
-            arts.save_and_clear(directory=directory)
-        results.append(arts)
+    # Get page of all articles
+    page = req.request_url(url, post=post)
 
-    # If a requester was passed in, assume it is to contiune (don't close)
-    meta_data.add_requester(req, close=not isinstance(logging, Requester))
+    # Parse the page into a new object, which is added once the whole page is parsed
+    #   This is so that an error while parsing doesn't leave a partially added page
+    with req.metrics.time_parse():
+        page_arts = parse_articles(page, Articles(arts.term))
+        for field in DATA_FIELDS:
+            getattr(arts, field).extend(getattr(page_arts, field))
 
-    return results, meta_data
+    return arts
 
 
-def get_articles(req, url, arts):
-    """Collect information for each article found for a given term.
+def parse_articles(page, arts):
+    """Parse information for each article on a requested page of articles.
 
     Parameters
     ----------
-    req : Requester
-        Requester object to launch requests from.
-    url : str
-        URL for the article to be collected.
+    page : requests.models.Response
+        Requested page of articles.
     arts : Articles
         Object to add data to.
 
@@ -209,8 +313,6 @@ def get_articles(req, url, arts):
         Object to store information for the current term.
     """
 
-    # Get page of all articles
-    page = req.request_url(url)
     page_soup = BeautifulSoup(page.content, 'xml')
 
     # Get a list of all articles on the page
@@ -1,11 +1,13 @@
 """Classes and functions to store and process extracted article data."""
 
 from lisc.data.term import Term
-from lisc.data.process import process_articles
-from lisc.data.base_articles import BaseArticles
+from lisc.data.process import process_articles, process_in_batches
+from lisc.data.base_articles import BaseArticles, DATA_FIELDS
+from lisc.data.compact import CategoricalList, RaggedCategoricalList, IntegerList
 from lisc.modutils.errors import InconsistentDataError, ProcessingError
-from lisc.io.db import check_directory
+from lisc.io.db import SCDB, check_directory
 from lisc.io.io import save_jsonlines, parse_json_data
+from lisc.io.utils import check_ext
 
 ###################################################################################################
 ###################################################################################################
@@ -41,15 +43,20 @@ class Articles(BaseArticles):
         DOIs of each article.
     processed : bool
         Whether the article data has been processed.
+    is_compact : bool
+        Whether the journals, authors and years data are stored in compact containers.
     """
 
-    def __init__(self, term):
+    def __init__(self, term, compact=False):
         """Initialize Articles object.
 
         Parameters
         ----------
         term : Term or str
             Search term definition. If input is a string, it is used as the label for the term.
+        compact : bool, optional, default: False
+            Whether to store journals, authors and years data in compact containers.
+            Compact storage reduces memory usage for large collections of articles.
 
         Examples
         --------
@@ -59,9 +66,34 @@ class Articles(BaseArticles):
         """
 
         # Inherit from the BaseArticles object
+        self.is_compact = compact
         BaseArticles.__init__(self, term)
         self.processed = False
 
+        # Initialize the file location & cache, used if data is lazily loaded
+        self._directory = None
+        self._cache = None
+
+
+    def __getattr__(self, attr):
+        """Load lazily loaded data the first time a data attribute is accessed."""
+
+        # Check the instance dictionary directly, to be safe during copying & unpickling
+        if attr in DATA_FIELDS and self.__dict__.get('_directory') is not None:
+            self._load_lazy()
+            return getattr(self, attr)
+
+        raise AttributeError("'Articles' object has no attribute '{}'".format(attr))
+
+
+    def __getstate__(self):
+        """Get the state of the object for copying and pickling, dropping any cache."""
+
+        state = self.__dict__.copy()
+        state['_cache'] = None
+
+        return state
+
 
     def __getitem__(self, ind):
         """Index into a object, getting a specific article based on it's index."""
@@ -113,6 +145,32 @@ class Articles(BaseArticles):
         getattr(self, field).append(new_data)
 
 
+    def compact(self):
+        """Convert the journals, authors and years data to compact containers.
+
+        Notes
+        -----
+        Journals and authors are stored as integer codes into tables of unique, interned values,
+        and years are stored in a typed integer array. Indexing and iterating the object, and the
+        data attributes, return the same values as for list storage, except that list values,
+        such as journal and author definitions, are returned as tuples.
+
+        Examples
+        --------
+        Convert an ``Articles`` object to use compact storage:
+
+        >>> articles = Articles('frontal lobe')
+        >>> articles.add_data('years', 2000)
+        >>> articles.compact()
+        """
+
+        self.journals = CategoricalList(self.journals)
+        self.authors = RaggedCategoricalList(self.authors)
+        self.years = IntegerList(self.years)
+
+        self.is_compact = True
+
+
     def save(self, directory=None):
         """Save out a json file with all attached data.
 
@@ -120,6 +178,7 @@ class Articles(BaseArticles):
         ----------
         directory : str or SCDB, optional
             Folder or database object specifying the save location.
+            If a database object, the saved file is added to the manifest of the database.
 
         Examples
         --------
@@ -134,14 +193,23 @@ class Articles(BaseArticles):
         save_jsonlines(self, self.label, check_directory(directory, 'raw'),
                        header={'term' : self.term})
 
+        if isinstance(directory, SCDB):
+            file_path = check_directory(directory, 'raw') / check_ext(self.label, '.json')
+            directory.manifest.add('raw', self.label, file_path, 'Articles')
+
 
-    def load(self, directory=None):
+    def load(self, directory=None, lazy=False, cache=None):
         """Load raw data from json file.
 
         Parameters
         ----------
         directory : str or SCDB, optional
             Folder or database object specifying the save location.
+        lazy : bool, optional, default: False
+            Whether to defer loading until the first time a data attribute is accessed.
+        cache : ArticlesCache, optional
+            Cache to register with when data is lazily loaded, which may later unload the data.
+            Only used if `lazy` is True.
 
         Examples
         --------
@@ -152,6 +220,13 @@ class Articles(BaseArticles):
         >>> articles.load(SCDB('lisc_db')) # doctest:+SKIP
         """
 
+        self._directory = directory
+
+        if lazy:
+            self._cache = cache
+            self.unload()
+            return
+
         data = parse_json_data(self.label, check_directory(directory, 'raw'))
 
         self.term = Term(*next(data)['term'])
@@ -169,6 +244,27 @@ class Articles(BaseArticles):
         self._check_results()
 
 
+    def unload(self):
+        """Unload the data attached to the object, to be reloaded from file when next accessed.
+
+        Raises
+        ------
+        ValueError
+            If the object was not loaded from file, and so can not be reloaded.
+        ProcessingError
+            If the object has been processed, as unloading would discard the processing.
+        """
+
+        if self._directory is None:
+            raise ValueError('Articles were not loaded from file - cannot unload.')
+
+        if self.processed:
+            raise ProcessingError('Articles have been processed - cannot unload.')
+
+        for field in DATA_FIELDS:
+            self.__dict__.pop(field, None)
+
+
     def save_and_clear(self, directory=None):
         """Save out the attached data and clear the object.
 
@@ -191,7 +287,7 @@ class Articles(BaseArticles):
         self.clear()
 
 
-    def process(self, process_func=None):
+    def process(self, process_func=None, executor=None, batch_size=1000):
         """Process the data stored in the current object.
 
         Parameters
@@ -199,6 +295,11 @@ class Articles(BaseArticles):
         process_func : callable, optional
             A function to process the articles. Must take as input an `Articles` object.
             If not provided, applies the default `process_articles` function.
+        executor : concurrent.futures.Executor, optional
+            An executor to process batches of articles in parallel.
+            If not provided, the articles are processed serially.
+        batch_size : int, optional, default: 1000
+            The number of articles per batch. Only used if `executor` is provided.
         """
 
         if self.processed:
@@ -207,9 +308,34 @@ class Articles(BaseArticles):
         if not process_func:
             process_func = process_articles
 
-        process_func(self)
+        if executor is None:
+            process_func(self)
+        else:
+            process_in_batches(self, process_func, executor, batch_size)
         self.processed = True
 
+        if self.is_compact:
+            self.compact()
+
+
+    def _load_lazy(self):
+        """Load data from file, for an object that was set to be lazily loaded."""
+
+        self._initialize_attributes()
+        self.load(self._directory)
+
+        if self._cache is not None:
+            self._cache.add(self)
+
+
+    def _initialize_attributes(self):
+        """Initialize the data attributes of the object."""
+
+        BaseArticles._initialize_attributes(self)
+
+        if self.is_compact:
+            self.compact()
+
 
     def _check_results(self):
         """Check for consistency in extracted results.
@@ -1,16 +1,23 @@
 """Classes and functions to store aggregated term article data."""
 
 from copy import deepcopy
+from itertools import repeat
+from collections import Counter
 
 from lisc.io.io import save_json
 from lisc.io.db import check_directory
 from lisc.data.utils import combine_lists, count_elements
+from lisc.data.sketch import SpaceSavingCounter
 from lisc.data.base_articles import BaseArticles
-from lisc.data.process import process_articles
+from lisc.data.process import process_articles, split_articles, join_articles
 
 ###################################################################################################
 ###################################################################################################
 
+# Define the attributes that store frequency distributions
+COUNT_ATTRS = ['years', 'journals', 'first_authors', 'last_authors',
+               'authors', 'words', 'keywords']
+
 class ArticlesAll(BaseArticles):
     """An object to hold term data, aggregated across articles.
 
@@ -34,8 +41,9 @@ class ArticlesAll(BaseArticles):
         Frequency distribution for each first author.
     last_authors : collections.Counter
         Frequency distribution for each last author.
-    words : collections.Counter
+    words : collections.Counter or SpaceSavingCounter
         Frequency distribution of all words.
+        If `max_words` is set, this is an approximate, bounded, frequency distribution.
     keywords : collections.Counter
         Frequency distribution of all keywords.
     years : collections.Counter
@@ -44,9 +52,15 @@ class ArticlesAll(BaseArticles):
         DOIs of each article included in object.
     summary : dict
         A summary of the data associated with the current object.
+
+    Notes
+    -----
+    The most common items of each frequency distribution are cached once computed.
+    The cache is cleared when new data is added.
     """
 
-    def __init__(self, articles, exclusions=None):
+    def __init__(self, articles, exclusions=None, executor=None, batch_size=1000,
+                 max_words=None):
         """Initialize ArticlesAll object.
 
         Parameters
@@ -55,6 +69,14 @@ class ArticlesAll(BaseArticles):
             Data for all articles from a given search term.
         exclusions : list of str, optional
             Words to exclude from the word collections.
+        executor : concurrent.futures.Executor, optional
+            An executor to process and count batches of articles in parallel.
+            If not provided, the articles are processed and counted serially.
+        batch_size : int, optional, default: 1000
+            The number of articles per batch. Only used if `executor` is provided.
+        max_words : int, optional
+            If provided, the maximum number of words to track in the words frequency distribution.
+            Word counts are then approximate, with bounded memory use across added articles.
 
         Examples
         --------
@@ -68,32 +90,115 @@ class ArticlesAll(BaseArticles):
         # Inherit from the BaseArticles object
         BaseArticles.__init__(self, articles.term)
 
-        # Process the article data
-        if not articles.processed:
-            articles = process_articles(articles)
-
         # Set exclusions, copying input list, if given, and adding current search terms
-        exclusions = list(set((deepcopy(exclusions) if exclusions else []) + \
+        self._exclusions = list(set((deepcopy(exclusions) if exclusions else []) + \
             [articles.term.label] + articles.term.search + articles.term.inclusions))
 
-        # Copy over tracking of included IDs & DOIs
-        self.ids = articles.ids
-        self.dois = articles.dois
+        # Initialize frequency distributions for each attribute
+        for attr in COUNT_ATTRS:
+            setattr(self, attr, Counter())
+        if max_words is not None:
+            self.words = SpaceSavingCounter(max_words)
+
+        # Initialize summary dictionary, and cache of most common items
+        self.summary = dict()
+        self._top = dict()
+
+        # Add the article data
+        self.add_articles(articles, executor, batch_size)
+
+
+    def __setstate__(self, state):
+        """Set the state of the object when unpickling, adding defaults for any missing attributes.
+
+        Notes
+        -----
+        Objects pickled by earlier versions do not have attributes that have since been added.
+        For these objects, the exclusions for adding articles are set from the search term,
+        as any other exclusions used to create the object were not stored.
+        """
+
+        state.setdefault('_top', dict())
+        if '_exclusions' not in state:
+            term = state['term']
+            state['_exclusions'] = list(set([term.label] + term.search + term.inclusions))
+        self.__dict__.update(state)
 
-        # Get frequency distributions of years, journals, authors
-        self.years = count_elements(articles.years)
-        self.journals = count_elements(articles.journals)
-        self.first_authors = count_elements(\
-            auth[0] if auth else None for auth in articles.authors)
-        self.last_authors = count_elements(\
-            auth[-1] if auth and len(auth) > 1 else None for auth in articles.authors)
-        self.authors = count_elements(combine_lists(articles.authors))
 
-        # Convert lists of all words to frequency distributions
-        self.words = count_elements(combine_lists(articles.words), exclusions)
-        self.keywords = count_elements(combine_lists(articles.keywords), exclusions)
+    def add_articles(self, articles, executor=None, batch_size=1000):
+        """Add data from a batch of articles, merging into the current frequency distributions.
+
+        Parameters
+        ----------
+        articles : Articles
+            Data for articles to add, for the same search term.
+        executor : concurrent.futures.Executor, optional
+            An executor to process and count batches of articles in parallel.
+            If not provided, the articles are processed and counted serially.
+        batch_size : int, optional, default: 1000
+            The number of articles per batch. Only used if `executor` is provided.
+
+        Notes
+        -----
+        If the articles have not been processed, they are processed, in place, and are then
+        marked as processed, such that they are not processed again.
+        Adding articles clears any previously created summary.
+
+        Examples
+        --------
+        Add a new batch of articles to an existing ``ArticlesAll`` object:
+
+        >>> from lisc.data import Articles
+        >>> articles_all = ArticlesAll(Articles('frontal lobe'))
+        >>> articles_all.add_articles(Articles('frontal lobe'))
+        """
+
+        if executor is None:
+
+            if not articles.processed:
+                articles = process_articles(articles)
+            partial_counts = [count_articles(articles, self._exclusions)]
+
+        else:
+
+            # Process, if not yet processed, and count each batch in a single pass
+            outputs = list(executor.map(_process_and_count, split_articles(articles, batch_size),
+                                        repeat(self._exclusions), repeat(not articles.processed)))
+            if not articles.processed:
+                articles = join_articles(articles, [batch for batch, _ in outputs])
+            partial_counts = [counts for _, counts in outputs]
+
+        # Mark the input as processed, so that it is not processed again
+        articles.processed = True
+
+        # Track included IDs & DOIs, copying so as to not alter the input object
+        self.ids = self.ids + list(articles.ids)
+        self.dois = self.dois + list(articles.dois)
+
+        for counts in partial_counts:
+            self._merge_counts(counts)
+
+        self.summary = dict()
+
+
+    def merge(self, other):
+        """Merge the data from another object, for the same search term, into the current object.
+
+        Parameters
+        ----------
+        other : ArticlesAll
+            Object with aggregated data, to merge into the current object.
+
+        Notes
+        -----
+        This supports map-reduce aggregation, in which separate objects are created for
+        chunks of articles, and then merged together.
+        """
+
+        self.ids = self.ids + list(other.ids)
+        self.dois = self.dois + list(other.dois)
+        self._merge_counts({attr : getattr(other, attr) for attr in COUNT_ATTRS})
 
-        # Initialize summary dictionary
         self.summary = dict()
 
 
@@ -114,23 +219,57 @@ class ArticlesAll(BaseArticles):
         >>> articles_all.check_frequencies() # doctest:+SKIP
         """
 
-        if data_type in ['words', 'keywords']:
-            freqs = getattr(self, data_type)
-        else:
+        if data_type not in ['words', 'keywords']:
             raise ValueError('Requested data not understood')
 
-        # Reset number to check if there are fewer words available
-        if n_check > len(freqs):
-            n_check = len(freqs)
-
         # Get the requested number of most common words, and convert to str
-        top = freqs.most_common()[0:n_check]
-        top_str = ', '.join([word[0] for word in top[:n_check]])
+        top = self.get_top(data_type, n_check)
+        top_str = ', '.join([word[0] for word in top])
 
         # Print out the top words for the current term
         print("{:5} : ".format(self.label) + top_str)
 
 
+    def get_top(self, data_type, n_items):
+        """Get the most common items in a frequency distribution.
+
+        Parameters
+        ----------
+        data_type : str
+            Which frequency distribution to check, such as 'words' or 'authors'.
+        n_items : int
+            Number of most common items to get.
+
+        Returns
+        -------
+        list of tuple
+            Items and counts, sorted from most to least common.
+
+        Notes
+        -----
+        This selects the top items with a heap, rather than sorting the whole distribution.
+        Results are cached, such that requests for the same or fewer items are not recomputed.
+
+        Examples
+        --------
+        Get the 10 most common words, assuming an initialized ``ArticlesAll`` object with data:
+
+        >>> articles_all.get_top('words', 10) # doctest:+SKIP
+        """
+
+        if data_type not in COUNT_ATTRS:
+            raise ValueError('Requested data not understood')
+
+        freqs = getattr(self, data_type)
+
+        top = self._top.get(data_type)
+        if top is None or (len(top) < n_items and len(top) < len(freqs)):
+            top = freqs.most_common(n_items)
+            self._top[data_type] = top
+
+        return top[:n_items]
+
+
     def create_summary(self):
         """Fill the summary dictionary of the current terms Words data.
 
@@ -145,11 +284,13 @@ class ArticlesAll(BaseArticles):
         self.summary['label'] = self.label
         self.summary['n_articles'] = str(self.n_articles)
         if self.has_data:
-            self.summary['top_author_name'] = ' '.join(self.authors.most_common()[0][0])
-            self.summary['top_author_count'] = str(self.authors.most_common()[0][1])
-            self.summary['top_journal_name'] = self.journals.most_common()[0][0]
-            self.summary['top_journal_count'] = str(self.journals.most_common()[0][1])
-            self.summary['top_keywords'] = [freq[0] for freq in self.keywords.most_common()[0:5]]
+            top_author = self.get_top('authors', 1)[0]
+            top_journal = self.get_top('journals', 1)[0]
+            self.summary['top_author_name'] = ' '.join(top_author[0])
+            self.summary['top_author_count'] = str(top_author[1])
+            self.summary['top_journal_name'] = top_journal[0]
+            self.summary['top_journal_count'] = str(top_journal[1])
+            self.summary['top_keywords'] = [freq[0] for freq in self.get_top('keywords', 5)]
             self.summary['first_publication'] = str(min(self.years.keys()))
         else:
             labels = ['top_author_name', 'top_author_count', 'top_journal_name',
@@ -195,3 +336,64 @@ class ArticlesAll(BaseArticles):
         """
 
         save_json(self.summary, self.label, check_directory(directory, 'summary'))
+
+
+    def _merge_counts(self, counts):
+        """Merge frequency distributions into the current object.
+
+        Parameters
+        ----------
+        counts : dict of collections.Counter
+            Frequency distributions to merge, with a key for each count attribute.
+        """
+
+        for attr in COUNT_ATTRS:
+            getattr(self, attr).update(counts[attr])
+
+        self._top = dict()
+
+
+def count_articles(articles, exclusions=None):
+    """Compute frequency distributions for data from a set of articles.
+
+    Parameters
+    ----------
+    articles : Articles
+        Data for a set of articles, which should already be processed.
+    exclusions : list of str, optional
+        Words to exclude from the word collections.
+
+    Returns
+    -------
+    counts : dict of collections.Counter
+        Frequency distributions, with a key for each count attribute.
+    """
+
+    counts = {}
+
+    # Get frequency distributions of years, journals, authors
+    counts['years'] = count_elements(articles.years)
+    counts['journals'] = count_elements(articles.journals)
+    counts['first_authors'] = count_elements(\
+        auth[0] if auth else None for auth in articles.authors)
+    counts['last_authors'] = count_elements(\
+        auth[-1] if auth and len(auth) > 1 else None for auth in articles.authors)
+    counts['authors'] = count_elements(combine_lists(articles.authors))
+
+    # Convert lists of all words to frequency distributions
+    counts['words'] = count_elements(combine_lists(articles.words), exclusions)
+    counts['keywords'] = count_elements(combine_lists(articles.keywords), exclusions)
+
+    return counts
+
+
+def _process_and_count(batch, exclusions, process):
+    """Process, if requested, and count a batch of articles, as a top-level function for pools.
+
+    The processed batch is returned, if processed, to be joined back into the input.
+    """
+
+    if process:
+        batch = process_articles(batch)
+
+    return batch if process else None, count_articles(batch, exclusions)
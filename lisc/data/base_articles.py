@@ -5,6 +5,8 @@ from lisc.data.term import Term
 ###################################################################################################
 ###################################################################################################
 
+DATA_FIELDS = ['ids', 'titles', 'journals', 'authors', 'words', 'keywords', 'years', 'dois']
+
 class BaseArticles():
     """Base object for storing collected article data."""
 
@@ -0,0 +1,159 @@
+"""Cache object to manage lazily loaded article data."""
+
+from collections import OrderedDict
+
+###################################################################################################
+###################################################################################################
+
+class ArticlesCache():
+    """Track lazily loaded Articles objects, unloading cold objects to stay within a budget.
+
+    Attributes
+    ----------
+    max_articles : int or None
+        The maximum number of articles to hold in memory, across all tracked objects.
+        If None, no limit is applied, and objects are never unloaded.
+    n_loaded : int
+        The number of tracked objects that currently have data loaded.
+    n_articles : int
+        The number of articles currently loaded, across all tracked objects.
+
+    Notes
+    -----
+    Objects are unloaded in least recently used order. Objects are marked as used when
+    they are loaded, and when they are accessed with `touch`, such as from a ``ResultsList``.
+
+    Articles that have been processed are never unloaded, as unloading would discard the
+    processing. Processed articles still count towards `max_articles`, such that if they
+    exceed it, all other objects are unloaded, and the number of loaded articles can
+    exceed `max_articles`. The limit therefore only bounds unprocessed articles.
+    """
+
+    def __init__(self, max_articles=None):
+        """Initialize an ArticlesCache object.
+
+        Parameters
+        ----------
+        max_articles : int, optional
+            The maximum number of articles to hold in memory, across all tracked objects.
+
+        Examples
+        --------
+        Initialize a cache that holds up to 10000 articles in memory:
+
+        >>> cache = ArticlesCache(max_articles=10000)
+        """
+
+        self.max_articles = max_articles
+        self._loaded = OrderedDict()
+
+
+    @property
+    def n_loaded(self):
+        """The number of tracked objects that currently have data loaded."""
+
+        return len(self._loaded)
+
+
+    @property
+    def n_articles(self):
+        """The number of articles currently loaded, across all tracked objects."""
+
+        return sum(arts.n_articles for arts in self._loaded.values())
+
+
+    def add(self, arts):
+        """Add a newly loaded object to the cache, unloading cold objects if over budget.
+
+        Parameters
+        ----------
+        arts : Articles
+            An object that has just loaded its data.
+        """
+
+        self._loaded[id(arts)] = arts
+        self._loaded.move_to_end(id(arts))
+        self._evict(keep=arts)
+
+
+    def touch(self, arts):
+        """Mark an object as recently used.
+
+        Parameters
+        ----------
+        arts : Articles
+            An object that is being accessed.
+        """
+
+        if id(arts) in self._loaded:
+            self._loaded.move_to_end(id(arts))
+
+
+    def _evict(self, keep):
+        """Unload least recently used objects until the cache is within budget.
+
+        Parameters
+        ----------
+        keep : Articles
+            An object that should not be unloaded.
+        """
+
+        if self.max_articles is None:
+            return
+
+        while self.n_articles > self.max_articles:
+
+            candidates = [arts for arts in self._loaded.values() \
+                if arts is not keep and not arts.processed]
+            if not candidates:
+                break
+
+            arts = candidates[0]
+            arts.unload()
+            del self._loaded[id(arts)]
+
+
+class ResultsList(list):
+    """A list of Articles objects, marking objects as recently used when they are accessed.
+
+    Notes
+    -----
+    This is used for lazily loaded results, such that accessing results directly, by index
+    or by iterating, updates the order in which objects are unloaded by their cache.
+    """
+
+    def __getitem__(self, ind):
+
+        out = list.__getitem__(self, ind)
+        for arts in out if isinstance(ind, slice) else [out]:
+            touch_articles(arts)
+
+        return out
+
+
+    def __iter__(self):
+
+        for arts in list.__iter__(self):
+            yield touch_articles(arts)
+
+
+def touch_articles(arts):
+    """Mark an Articles object as recently used, if it is tracked by a cache.
+
+    Parameters
+    ----------
+    arts : Articles
+        An object that is being accessed.
+
+    Returns
+    -------
+    arts : Articles
+        The input object.
+    """
+
+    # Check the instance dictionary directly, so as not to trigger loading the data
+    cache = arts.__dict__.get('_cache')
+    if cache is not None:
+        cache.touch(arts)
+
+    return arts
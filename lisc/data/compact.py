@@ -0,0 +1,384 @@
+"""Compact, list-like containers for storing collected article data."""
+
+import sys
+from array import array
+
+###################################################################################################
+###################################################################################################
+
+class CategoricalList():
+    """A list-like container that stores repeated values as integer codes.
+
+    Attributes
+    ----------
+    codes : array of int
+        The code for each element, indexing into `categories`.
+    categories : list
+        The unique values that have been added to the container.
+
+    Notes
+    -----
+    Values are stored once in `categories`, and each element is stored as an integer code.
+    String values are interned, and lists are stored as tuples, so that they are hashable.
+    """
+
+    def __init__(self, values=None):
+        """Initialize a CategoricalList object.
+
+        Parameters
+        ----------
+        values : iterable, optional
+            Values to initialize the container with.
+
+        Examples
+        --------
+        Store a list of repeated journal names:
+
+        >>> journals = CategoricalList(['Nature', 'Science', 'Nature'])
+        >>> journals.categories
+        ['Nature', 'Science']
+        """
+
+        self.codes = array('i')
+        self.categories = []
+        self._lookup = {}
+
+        if values is not None:
+            self.extend(values)
+
+
+    def __getitem__(self, ind):
+
+        if isinstance(ind, slice):
+            return [self.categories[code] for code in self.codes[ind]]
+
+        return self.categories[self.codes[ind]]
+
+
+    def __setitem__(self, ind, value):
+
+        self.codes[ind] = self._get_code(value)
+
+
+    def __len__(self):
+
+        return len(self.codes)
+
+
+    def __iter__(self):
+
+        categories = self.categories
+        for code in self.codes:
+            yield categories[code]
+
+
+    def __eq__(self, other):
+
+        return list(self) == list(other)
+
+
+    def __repr__(self):
+
+        return repr(list(self))
+
+
+    def __getstate__(self):
+
+        return {'codes' : self.codes, 'categories' : self.categories}
+
+
+    def __setstate__(self, state):
+
+        self.codes = state['codes']
+        self.categories = state['categories']
+        self._lookup = {value : code for code, value in enumerate(self.categories)}
+
+
+    def append(self, value):
+        """Add a value to the end of the container.
+
+        Parameters
+        ----------
+        value : object
+            Value to add.
+        """
+
+        self.codes.append(self._get_code(value))
+
+
+    def extend(self, values):
+        """Add multiple values to the end of the container.
+
+        Parameters
+        ----------
+        values : iterable
+            Values to add.
+        """
+
+        for value in values:
+            self.append(value)
+
+
+    def _get_code(self, value):
+        """Get the code for a value, adding it as a new category if needed."""
+
+        value = intern_value(value)
+
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            self._lookup[value] = code
+
+        return code
+
+
+class RaggedCategoricalList():
+    """A list-like container for lists of repeated values, such as author lists.
+
+    Attributes
+    ----------
+    items : CategoricalList
+        The flattened items, across all elements.
+    ends : array of int
+        The end position, in `items`, of each element.
+    missing : array of int
+        Indicator for whether each element is None.
+
+    Notes
+    -----
+    Each element is returned as a list, or as None if a missing value was added.
+    """
+
+    def __init__(self, values=None):
+        """Initialize a RaggedCategoricalList object.
+
+        Parameters
+        ----------
+        values : iterable of (list or None), optional
+            Values to initialize the container with.
+
+        Examples
+        --------
+        Store a list of author lists, in which some authors are repeated:
+
+        >>> authors = RaggedCategoricalList([[('Smith', 'J')], [('Smith', 'J'), ('Doe', 'A')]])
+        >>> authors[1]
+        [('Smith', 'J'), ('Doe', 'A')]
+        """
+
+        self.items = CategoricalList()
+        self.ends = array('q')
+        self.missing = array('b')
+
+        if values is not None:
+            self.extend(values)
+
+
+    def __getitem__(self, ind):
+
+        if isinstance(ind, slice):
+            return [self[cind] for cind in range(*ind.indices(len(self)))]
+
+        if ind < 0:
+            ind += len(self)
+        if not 0 <= ind < len(self):
+            raise IndexError('Index out of range.')
+
+        if self.missing[ind]:
+            return None
+
+        start = self.ends[ind - 1] if ind > 0 else 0
+
+        return self.items[start:self.ends[ind]]
+
+
+    def __len__(self):
+
+        return len(self.ends)
+
+
+    def __iter__(self):
+
+        start = 0
+        for end, missing in zip(self.ends, self.missing):
+            yield None if missing else self.items[start:end]
+            start = end
+
+
+    def __eq__(self, other):
+
+        return list(self) == list(other)
+
+
+    def __repr__(self):
+
+        return repr(list(self))
+
+
+    def append(self, value):
+        """Add a list of values, or None, to the end of the container.
+
+        Parameters
+        ----------
+        value : list or None
+            Value to add.
+        """
+
+        if value is not None:
+            self.items.extend(value)
+
+        self.ends.append(len(self.items))
+        self.missing.append(value is None)
+
+
+    def extend(self, values):
+        """Add multiple lists of values to the end of the container.
+
+        Parameters
+        ----------
+        values : iterable of (list or None)
+            Values to add.
+        """
+
+        for value in values:
+            self.append(value)
+
+
+class IntegerList():
+    """A list-like container that stores integers, or None, in a typed array.
+
+    Attributes
+    ----------
+    values : array of int
+        The stored values, with missing values stored as a sentinel value.
+    """
+
+    def __init__(self, values=None, typecode='h'):
+        """Initialize an IntegerList object.
+
+        Parameters
+        ----------
+        values : iterable of (int or None), optional
+            Values to initialize the container with.
+        typecode : str, optional, default: 'h'
+            The array typecode to use to store the values.
+            The default, 'h', is a signed short integer, which is sufficient for years.
+
+        Examples
+        --------
+        Store a list of publication years:
+
+        >>> years = IntegerList([2000, None, 2010])
+        >>> years[1] is None
+        True
+        """
+
+        self.values = array(typecode)
+        self._missing = -2 ** (self.values.itemsize * 8 - 1)
+
+        if values is not None:
+            self.extend(values)
+
+
+    def __getitem__(self, ind):
+
+        if isinstance(ind, slice):
+            return [self._decode(value) for value in self.values[ind]]
+
+        return self._decode(self.values[ind])
+
+
+    def __setitem__(self, ind, value):
+
+        self.values[ind] = self._encode(value)
+
+
+    def __len__(self):
+
+        return len(self.values)
+
+
+    def __iter__(self):
+
+        for value in self.values:
+            yield self._decode(value)
+
+
+    def __eq__(self, other):
+
+        return list(self) == list(other)
+
+
+    def __repr__(self):
+
+        return repr(list(self))
+
+
+    def append(self, value):
+        """Add a value to the end of the container.
+
+        Parameters
+        ----------
+        value : int or None
+            Value to add.
+        """
+
+        self.values.append(self._encode(value))
+
+
+    def extend(self, values):
+        """Add multiple values to the end of the container.
+
+        Parameters
+        ----------
+        values : iterable of (int or None)
+            Values to add.
+        """
+
+        for value in values:
+            self.append(value)
+
+
+    def _encode(self, value):
+        """Encode a value for storage, converting None to the missing value sentinel."""
+
+        return self._missing if value is None else value
+
+
+    def _decode(self, value):
+        """Decode a stored value, converting the missing value sentinel to None."""
+
+        return None if value == self._missing else value
+
+###################################################################################################
+###################################################################################################
+
+def intern_value(value):
+    """Intern a value, so that equal values can share memory.
+
+    Parameters
+    ----------
+    value : object
+        Value to intern. Strings are interned, and lists and tuples are interned
+        element-wise and returned as tuples. Other values are returned as is.
+
+    Returns
+    -------
+    object
+        The interned value.
+
+    Examples
+    --------
+    Intern a journal definition, as (Journal Name, ISO abbreviation):
+
+    >>> intern_value(['Nature', 'Nature'])
+    ('Nature', 'Nature')
+    """
+
+    if isinstance(value, str):
+        value = sys.intern(value)
+    elif isinstance(value, (list, tuple)):
+        value = tuple(intern_value(el) for el in value)
+
+    return value
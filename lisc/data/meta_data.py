@@ -3,7 +3,9 @@
 from copy import deepcopy
 from datetime import datetime
 
-from lisc.requester import Requester
+from lisc.requester.requester import BaseRequester
+from lisc.requester.metrics import RequestMetrics
+from lisc.requester.keys import KeyPool
 
 ###################################################################################################
 ###################################################################################################
@@ -21,6 +23,11 @@ class MetaData():
         Details of the database from which the data was accessed.
     settings : dict
         Details of any search settings that were used during the collection.
+    metrics : dict
+        Timing and size metrics of the requests made during the collection.
+    api_keys : dict
+        Usage of each API key, if requests were shared across a pool of keys,
+        labeled by the index of each key in the pool, with the masked key.
     log : list or None
         A log of requested URLs, if requests were logged.
     """
@@ -32,12 +39,14 @@ class MetaData():
         self.requester = None
         self.db_info = None
         self.settings = None
+        self.metrics = None
+        self.api_keys = None
         self.log = None
 
         self.get_date()
 
         # Add information about which attributes are themselves dictionaries, etc
-        self._dict_attrs = ['requester', 'db_info', 'settings']
+        self._dict_attrs = ['requester', 'db_info', 'settings', 'metrics', 'api_keys']
         self._flat_attrs = ['date', 'log']
 
 
@@ -71,16 +80,19 @@ class MetaData():
 
         Parameters
         ----------
-        requester : Requester or dict
-            If Requester, the object used to launch URL requests.
-            If dict, information from a requester object.
+        requester : Requester or AsyncRequester or dict
+            If a requester object, the object used to launch URL requests, the metrics and any
+            key pool usage of which are also added. If dict, information from a requester object.
         close : bool, optional, default: True
             Whether to close the requester.
         """
 
-        if isinstance(requester, Requester):
+        if isinstance(requester, BaseRequester):
             if close:
                 requester.close()
+            self.add_metrics(requester.metrics)
+            if requester.key_pool is not None:
+                self.add_api_keys(requester.key_pool)
             requester = requester.as_dict()
 
         _ = requester.pop('is_active', None)
@@ -115,6 +127,36 @@ class MetaData():
         self.settings = settings
 
 
+    def add_metrics(self, metrics):
+        """Add request metrics to the MetaData object.
+
+        Parameters
+        ----------
+        metrics : RequestMetrics or dict
+            Timing and size metrics of the requests made during the collection.
+        """
+
+        if isinstance(metrics, RequestMetrics):
+            metrics = metrics.as_dict()
+
+        self.metrics = metrics
+
+
+    def add_api_keys(self, api_keys):
+        """Add API key usage to the MetaData object.
+
+        Parameters
+        ----------
+        api_keys : KeyPool or dict
+            Pool of API keys used during the collection, or the usage of each key.
+        """
+
+        if isinstance(api_keys, KeyPool):
+            api_keys = api_keys.as_dict()
+
+        self.api_keys = api_keys
+
+
     def from_dict(self, meta_dict):
         """Populate object from an input dictionary.
 
@@ -130,8 +172,9 @@ class MetaData():
         for label in self._flat_attrs:
             setattr(self, label, meta_dict[label])
 
+        # Attributes added in later versions may be missing from older meta data
         for label in self._dict_attrs:
-            if meta_dict[label]:
+            if meta_dict.get(label):
                 getattr(self, 'add_' + label)(meta_dict[label])
 
 
@@ -139,7 +182,7 @@ class MetaData():
         """Unpack dictionary representation attributes to create a flattened dictionary."""
 
         for label in self._dict_attrs:
-            attr = meta_dict.pop(label)
+            attr = meta_dict.pop(label, None)
             if attr:
                 for key, val in attr.items():
                     meta_dict[label + '_' + key] = val
@@ -1,8 +1,10 @@
 """Utilities for processing article data."""
 
-from copy import deepcopy
+from copy import copy, deepcopy
+from itertools import chain, repeat
 
-from lisc.data.utils import convert_string, lower_list
+from lisc.data.utils import convert_strings, lower_list
+from lisc.data.base_articles import DATA_FIELDS
 
 ###################################################################################################
 ###################################################################################################
@@ -26,7 +28,7 @@ def process_articles(articles, process_copy=False):
         articles = deepcopy(articles)
 
     # Process text data: tokenizing, dropping stopwords, and making lowercase
-    articles.words = [convert_string(words) for words in articles.words]
+    articles.words = convert_strings(articles.words)
     articles.keywords = [lower_list(keywords) for keywords in articles.keywords]
 
     # Sub-select the journal names, keeping only the
@@ -38,6 +40,92 @@ def process_articles(articles, process_copy=False):
     return articles
 
 
+def process_in_batches(articles, process_func, executor, batch_size=1000):
+    """Process collected data in an Articles object, in batches, using an executor.
+
+    Parameters
+    ----------
+    articles : Articles
+        Articles data.
+    process_func : callable
+        A function to process the articles. Must take as input an `Articles` object.
+    executor : concurrent.futures.Executor
+        An executor to run the processing of each batch.
+    batch_size : int, optional, default: 1000
+        The number of articles per batch.
+
+    Notes
+    -----
+    Batches are processed independently, and their results are combined in order, such that the
+    outputs are identical to processing all the articles together, for any processing function
+    that processes each article independently.
+    """
+
+    batches = executor.map(_process_batch, split_articles(articles, batch_size),
+                           repeat(process_func))
+
+    return join_articles(articles, batches)
+
+
+def split_articles(articles, batch_size):
+    """Split an Articles object into batches of articles.
+
+    Parameters
+    ----------
+    articles : Articles
+        Articles data.
+    batch_size : int
+        The number of articles per batch.
+
+    Returns
+    -------
+    batches : list of Articles
+        Objects containing consecutive batches of articles.
+    """
+
+    batches = []
+    for start in range(0, len(articles), batch_size):
+        batch = copy(articles)
+        for field in DATA_FIELDS:
+            setattr(batch, field, list(getattr(articles, field)[start:start + batch_size]))
+        batches.append(batch)
+
+    return batches
+
+
+def join_articles(articles, batches):
+    """Join batches of articles, setting the combined data into an Articles object.
+
+    Parameters
+    ----------
+    articles : Articles
+        Articles object to set the data of, replacing any existing data.
+    batches : iterable of Articles
+        Objects containing consecutive batches of articles.
+
+    Returns
+    -------
+    articles : Articles
+        Object containing the data of all batches, in order.
+    """
+
+    batches = list(batches)
+
+    for field in DATA_FIELDS:
+        setattr(articles, field,
+                list(chain.from_iterable(getattr(batch, field) for batch in batches)))
+
+    return articles
+
+
+def _process_batch(batch, process_func):
+    """Process a batch of articles, returning the processed batch."""
+
+    process_func(batch)
+
+    return batch
+
+
 def _process_authors(authors):
     """Process author names.
 
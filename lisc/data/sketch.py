@@ -0,0 +1,159 @@
+"""Bounded memory frequency distributions, for approximate counting of large vocabularies."""
+
+from heapq import nlargest
+from collections.abc import Mapping
+from collections import Counter
+from operator import itemgetter
+
+###################################################################################################
+###################################################################################################
+
+class SpaceSavingCounter(Mapping):
+    """A frequency distribution that tracks a bounded number of the most common items.
+
+    Attributes
+    ----------
+    capacity : int
+        The maximum number of items to track.
+    floor : int
+        An upper bound on the count of any item that is not tracked.
+        This is also the maximum amount by which the count of any tracked item is overestimated.
+
+    Notes
+    -----
+    This implements the space-saving algorithm, with batched updates. After each update,
+    only the `capacity` items with the highest counts are kept, and the count of any dropped
+    item raises the floor. Items that are added later start from the floor, such that counts
+    are never underestimated, and any item with a true count above the floor is tracked.
+
+    Memory use is bounded by the capacity plus the number of unique items in each update.
+    Counters can be merged with `update`, supporting counting across streamed batches of data.
+
+    As a mapping of items to estimated counts, a counter can also be merged into a
+    ``collections.Counter``, with its `update` method, adding the estimated counts.
+    """
+
+    def __init__(self, capacity, counts=None):
+        """Initialize a SpaceSavingCounter object.
+
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of items to track.
+        counts : iterable or dict, optional
+            Items, or a mapping of items to counts, to initialize the counter with.
+
+        Examples
+        --------
+        Track the two most common words:
+
+        >>> counter = SpaceSavingCounter(2, ['brain', 'brain', 'cell', 'memory', 'brain'])
+        >>> counter.most_common(1)
+        [('brain', 3)]
+        """
+
+        self.capacity = capacity
+        self.floor = 0
+        self._counts = dict()
+
+        if counts is not None:
+            self.update(counts)
+
+
+    def __getitem__(self, item):
+
+        return self._counts.get(item, 0)
+
+
+    def __contains__(self, item):
+
+        return item in self._counts
+
+
+    def __len__(self):
+
+        return len(self._counts)
+
+
+    def __iter__(self):
+
+        return iter(self._counts)
+
+
+    def __repr__(self):
+
+        return '{}({})'.format(type(self).__name__, self.most_common())
+
+
+    def keys(self):
+        """Get the tracked items."""
+
+        return self._counts.keys()
+
+
+    def values(self):
+        """Get the estimated counts of the tracked items."""
+
+        return self._counts.values()
+
+
+    def items(self):
+        """Get the tracked items and their estimated counts."""
+
+        return self._counts.items()
+
+
+    def update(self, counts):
+        """Add counts to the counter, dropping the least common items if over capacity.
+
+        Parameters
+        ----------
+        counts : iterable or dict or SpaceSavingCounter
+            Items to count, or a mapping of items to counts, to add to the counter.
+        """
+
+        floor = 0
+        if isinstance(counts, SpaceSavingCounter):
+            floor = counts.floor
+            counts = counts._counts
+        elif not isinstance(counts, Mapping):
+            counts = Counter(counts)
+
+        merged = {item : count + counts.get(item, floor) for item, count in self._counts.items()}
+        for item, count in counts.items():
+            if item not in merged:
+                merged[item] = self.floor + count
+
+        self.floor += floor
+        self._counts = merged
+        self._prune()
+
+
+    def most_common(self, n_items=None):
+        """Get the most common items, and their estimated counts.
+
+        Parameters
+        ----------
+        n_items : int, optional
+            The number of items to return. If not provided, returns all tracked items.
+
+        Returns
+        -------
+        list of tuple
+            Items and counts, sorted from most to least common.
+        """
+
+        if n_items is None:
+            return sorted(self._counts.items(), key=itemgetter(1), reverse=True)
+
+        return nlargest(n_items, self._counts.items(), key=itemgetter(1))
+
+
+    def _prune(self):
+        """Drop the least common items if over capacity, raising the floor."""
+
+        if len(self._counts) > self.capacity:
+
+            ranked = sorted(self._counts.items(), key=itemgetter(1), reverse=True)
+            self.floor = max(self.floor, ranked[self.capacity][1])
+            self._counts = dict(ranked[:self.capacity])
@@ -9,6 +9,16 @@ from lisc.data.stopwords import STOPWORDS
 ###################################################################################################
 ###################################################################################################
 
+# Define punctuation that is kept in, or replaced by a space in, tokenized text
+PUNC_KEEP = ['-', '/']
+PUNC_CUSTOM = ['.', ',']
+
+# Precompute a translation table to drop all other punctuation, and a set of default stopwords
+PUNC_DROP = ''.join(sorted(set(punctuation) - set(PUNC_KEEP + PUNC_CUSTOM)))
+PUNC_TABLE = str.maketrans('', '', PUNC_DROP)
+STOPWORDS_SET = frozenset(STOPWORDS)
+
+
 def count_elements(lst, exclude=None):
     """Count how often each element occurs in a list.
 
@@ -117,16 +127,12 @@ def tokenize(text):
         Tokenized text.
     """
 
-    punc_keep = ['-', '/']
-    punc_custom = ['.', ',']
-
-    # Drop general punctuation from the string
-    for punc in set(punctuation) - set(punc_keep + punc_custom):
-        text = text.replace(punc, '')
+    # Drop general punctuation from the string, in a single pass
+    text = text.translate(PUNC_TABLE)
 
     # For some custom punctuation, replace them with a space
-    for custom_punc in set([el + ' ' for el in punc_custom]):
-        text = text.replace(custom_punc, ' ')
+    for custom_punc in PUNC_CUSTOM:
+        text = text.replace(custom_punc + ' ', ' ')
 
     # The final period may be missed, so check and remove if so
     if len(text) > 0 and text[-1] == '.':
@@ -155,15 +161,61 @@ def convert_string(text, stopwords=STOPWORDS):
     This function sets text to lower case, and removes stopwords and punctuation.
     """
 
-    # Converting to use a dictionary makes checking a little more efficient
-    stopwords = Counter(stopwords)
+    stopwords = get_stopwords_set(stopwords)
 
     # Tokenize and remove stopwords
-    words_cleaned = [word.lower() for word in tokenize(text) if word.lower() not in stopwords]
+    words_cleaned = [word for word in map(str.lower, tokenize(text)) if word not in stopwords]
 
     return words_cleaned
 
 
+def convert_strings(texts, stopwords=STOPWORDS):
+    """Convert a batch of strings of text into tokenized lists of words.
+
+    Parameters
+    ----------
+    texts : list of str
+        Texts to convert, each as one long string.
+    stopwords : list of str
+        Stopwords to remove from the text.
+
+    Returns
+    -------
+    list of list of str
+        List of tokenized words for each text, after processing.
+
+    Notes
+    -----
+    This gives the same outputs as applying `convert_string` to each text,
+    with the stopword lookup prepared once for the whole batch.
+    """
+
+    stopwords = get_stopwords_set(stopwords)
+
+    return [[word for word in map(str.lower, tokenize(text)) if word not in stopwords]
+            for text in texts]
+
+
+def get_stopwords_set(stopwords):
+    """Get a set of stopwords, for efficient checking.
+
+    Parameters
+    ----------
+    stopwords : list of str or frozenset of str
+        Stopwords.
+
+    Returns
+    -------
+    frozenset of str
+        Set of stopwords. The default set of stopwords is precomputed.
+    """
+
+    if stopwords is STOPWORDS:
+        return STOPWORDS_SET
+
+    return frozenset(stopwords)
+
+
 def lower_list(lst):
     """Convert a list of strings to all be lowercase.
 
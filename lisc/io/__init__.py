@@ -1,5 +1,6 @@
 """Utilities."""
 
 from .db import SCDB, create_file_structure
-from .io import (save_object, load_object, load_api_key, load_txt_file,
+from .time import TimeResults
+from .io import (save_object, load_object, load_object_header, load_api_key, load_txt_file,
                  save_time_results, load_time_results, save_meta_data, load_meta_data)
@@ -0,0 +1,214 @@
+"""Container file format for saving LISC objects, with arrays stored as raw array sections.
+
+Format
+------
+A container file has the following layout:
+
+- A preamble of `PREAMBLE_SIZE` bytes: the magic string `MAGIC`, the format version as a
+  little-endian uint16, and the offset and length of the header as little-endian uint64s.
+- Array sections, each stored in the `.npy` format, and aligned to `ALIGNMENT` bytes.
+- The header, as UTF-8 encoded JSON, with the object definition and the offset of each array.
+
+Since each array is stored in the `.npy` format, at a known offset, arrays can be memory mapped
+when loaded, without reading or copying the data, and the header can be read without reading
+any arrays.
+"""
+
+import os
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+
+###################################################################################################
+###################################################################################################
+
+MAGIC = b'LISC'
+FORMAT_VERSION = 1
+PREAMBLE_SIZE = 64
+ALIGNMENT = 64
+
+_PREAMBLE = struct.Struct('<4sHQQ')
+
+
+def write_container(file_path, header, arrays=None):
+    """Write a container file.
+
+    Parameters
+    ----------
+    file_path : str or Path
+        Path of the file to write.
+    header : dict
+        Header information to save, which must be JSON serializable.
+    arrays : dict of {str : array}, optional
+        Arrays to save, each as a section of the file.
+
+    Examples
+    --------
+    Write a container with a single array, using a temporary directory:
+
+    >>> import numpy as np
+    >>> from tempfile import TemporaryDirectory
+    >>> with TemporaryDirectory() as dirpath:
+    ...     write_container(dirpath + '/data.lisc', {'label' : 'data'}, {'values' : np.ones(3)})
+    """
+
+    header = dict(header, format_version=FORMAT_VERSION, arrays={})
+
+    # Write to a temporary file, as arrays being saved may be memory mapped from the target file
+    file_path = Path(file_path)
+    temp_path = file_path.with_name(file_path.name + '.tmp')
+
+    with open(temp_path, 'wb') as f_obj:
+
+        f_obj.write(b'\x00' * PREAMBLE_SIZE)
+
+        for label, array in (arrays if arrays else {}).items():
+            offset = _align(f_obj)
+            np.lib.format.write_array(f_obj, np.asanyarray(array), allow_pickle=False)
+            header['arrays'][label] = offset
+
+        header_offset = _align(f_obj)
+        header_bytes = json.dumps(header).encode('utf-8')
+        f_obj.write(header_bytes)
+
+        f_obj.seek(0)
+        f_obj.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, header_offset, len(header_bytes)))
+
+    os.replace(temp_path, file_path)
+
+
+def read_container_header(file_path):
+    """Read the header of a container file, without reading any arrays.
+
+    Parameters
+    ----------
+    file_path : str or Path
+        Path of the file to read.
+
+    Returns
+    -------
+    header : dict
+        Header information of the file.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a container file, or is from a newer format version.
+    """
+
+    with open(file_path, 'rb') as f_obj:
+        header = _read_header(f_obj)
+
+    return header
+
+
+def read_container(file_path, mmap_mode='r'):
+    """Read a container file.
+
+    Parameters
+    ----------
+    file_path : str or Path
+        Path of the file to read.
+    mmap_mode : {None, 'r', 'r+', 'c'}, optional, default: 'r'
+        If not None, arrays are memory mapped from the file, with the given mode.
+        If None, arrays are read into memory.
+
+    Returns
+    -------
+    header : dict
+        Header information of the file.
+    arrays : dict of {str : array}
+        Arrays stored in the file.
+
+    Examples
+    --------
+    Write and then read a container, using a temporary directory:
+
+    >>> import numpy as np
+    >>> from tempfile import TemporaryDirectory
+    >>> with TemporaryDirectory() as dirpath:
+    ...     write_container(dirpath + '/data.lisc', {'label' : 'data'}, {'values' : np.ones(3)})
+    ...     header, arrays = read_container(dirpath + '/data.lisc', mmap_mode=None)
+    >>> header['label'], arrays['values'].shape
+    ('data', (3,))
+    """
+
+    arrays = {}
+    with open(file_path, 'rb') as f_obj:
+
+        header = _read_header(f_obj)
+
+        for label, offset in header['arrays'].items():
+
+            f_obj.seek(offset)
+            version = np.lib.format.read_magic(f_obj)
+            shape, fortran_order, dtype = _read_array_header(f_obj, version)
+
+            # Memory map arrays with data, as empty arrays can not be memory mapped
+            if mmap_mode and np.prod(shape) > 0:
+                arrays[label] = np.memmap(file_path, dtype=dtype, mode=mmap_mode,
+                                          offset=f_obj.tell(), shape=shape,
+                                          order='F' if fortran_order else 'C')
+            else:
+                f_obj.seek(offset)
+                arrays[label] = np.lib.format.read_array(f_obj, allow_pickle=False)
+
+    return header, arrays
+
+
+def is_container(file_path):
+    """Check whether a file is a container file.
+
+    Parameters
+    ----------
+    file_path : str or Path
+        Path of the file to check.
+
+    Returns
+    -------
+    bool
+        Whether the file is a container file.
+    """
+
+    with open(file_path, 'rb') as f_obj:
+        magic = f_obj.read(len(MAGIC))
+
+    return magic == MAGIC
+
+
+def _align(f_obj):
+    """Pad a file being written, so that the current position is aligned, and return it."""
+
+    position = f_obj.tell()
+    padding = -position % ALIGNMENT
+    f_obj.write(b'\x00' * padding)
+
+    return position + padding
+
+
+def _read_header(f_obj):
+    """Read the header from an open container file."""
+
+    magic, version, header_offset, header_length = \
+        _PREAMBLE.unpack(f_obj.read(_PREAMBLE.size))
+
+    if magic != MAGIC:
+        raise ValueError('File is not a LISC container file.')
+    if version > FORMAT_VERSION:
+        raise ValueError('File format version {} is newer than the supported version {} - '
+                         'update LISC to load this file.'.format(version, FORMAT_VERSION))
+
+    f_obj.seek(header_offset)
+
+    return json.loads(f_obj.read(header_length).decode('utf-8'))
+
+
+def _read_array_header(f_obj, version):
+    """Read the header of an array section, for the given '.npy' format version."""
+
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(f_obj)
+
+    return np.lib.format.read_array_header_2_0(f_obj)
@@ -2,14 +2,16 @@
 
 import os
 from pathlib import Path
+from contextlib import nullcontext
 
 from lisc.io.utils import get_files, make_folder
+from lisc.io.manifest import Manifest, MANIFEST_FILE
 
 ###################################################################################################
 ###################################################################################################
 
 STRUCTURE = {1 : {'base' : ['terms', 'logs', 'data', 'figures']},
-             2 : {'data' : ['counts', 'words']},
+             2 : {'data' : ['counts', 'words', 'citations']},
              3 : {'words' : ['raw', 'summary']}}
 
 class SCDB():
@@ -19,6 +21,8 @@ class SCDB():
     ----------
     paths : dict
         Dictionary of all folder paths in the project.
+    manifest : Manifest
+        Catalog of the files saved to the database, stored in the base folder.
 
     Notes
     -----
@@ -41,6 +45,8 @@ class SCDB():
     +-----------+---------------+------------------+-----------------------------+
     |           |words          |Words data files. |                             |
     +-----------+---------------+------------------+-----------------------------+
+    |           |citations      |Citations files.  |                             |
+    +-----------+---------------+------------------+-----------------------------+
     |           |               |**Level 3: Words**|                             |
     +-----------+---------------+------------------+-----------------------------+
     |           |               |raw               |Raw words data files.        |
@@ -48,6 +54,8 @@ class SCDB():
     |           |               |summary           |Summary files for words data.|
     +-----------+---------------+------------------+-----------------------------+
 
+    Objects, articles, and meta data saved with a database object are cataloged in a manifest
+    file, which is used to look up saved files without searching the database folders.
     """
 
     def __init__(self, base=None, generate_paths=True, structure=STRUCTURE):
@@ -75,6 +83,20 @@ class SCDB():
         if generate_paths:
             self.gen_paths(structure)
 
+        self._manifest = None
+
+
+    @property
+    def manifest(self):
+        """Catalog of the files saved to the database, loaded when first accessed."""
+
+        if getattr(self, '_manifest', None) is None:
+            self._manifest = Manifest(self.paths['base'] / MANIFEST_FILE)
+        else:
+            self._manifest.reload()
+
+        return self._manifest
+
 
     def gen_paths(self, structure=STRUCTURE):
         """Generate all the full paths for the database object.
@@ -98,6 +120,7 @@ class SCDB():
          'figures': PosixPath('lisc_db/figures'),
          'counts': PosixPath('lisc_db/data/counts'),
          'words': PosixPath('lisc_db/data/words'),
+         'citations': PosixPath('lisc_db/data/citations'),
          'raw': PosixPath('lisc_db/data/words/raw'),
          'summary': PosixPath('lisc_db/data/words/summary')}
         """
@@ -234,6 +257,33 @@ def check_directory(directory, folder=None):
     return Path(path)
 
 
+def batch_manifest(directory):
+    """Get a context manager to batch updates to the manifest of a database.
+
+    Parameters
+    ----------
+    directory : SCDB or str or Path or None
+        A database object, or a file path.
+
+    Returns
+    -------
+    context manager
+        The batch context of the manifest, if `directory` is a database object.
+        Otherwise, a context manager that does nothing.
+
+    Examples
+    --------
+    Save multiple files to a database, writing the manifest once:
+
+    >>> db = SCDB('lisc_db')
+    >>> with batch_manifest(db):  # doctest: +SKIP
+    ...     for arts in results:
+    ...         arts.save(db)
+    """
+
+    return directory.manifest.batch() if isinstance(directory, SCDB) else nullcontext()
+
+
 def create_file_structure(base=None, name='lisc_db', structure=STRUCTURE):
     """Create the file structure for a SCANR database.
 
@@ -3,11 +3,18 @@
 import os
 import json
 import pickle
+import warnings
 from pathlib import Path
 
-from lisc.io.db import SCDB, check_directory
+import numpy as np
+
+from lisc.io.db import SCDB, check_directory, batch_manifest
 from lisc.io.utils import check_ext, get_files, make_folder
+from lisc.io.time import TimeResults
+from lisc.io.container import (write_container, read_container, read_container_header,
+                               is_container)
 from lisc.objects.utils import check_object_type
+from lisc.version import __version__
 
 ###################################################################################################
 ###################################################################################################
@@ -189,17 +196,36 @@ def load_api_key(file_name, directory=None, required=False):
     return api_key
 
 
-def save_object(obj, file_name, directory=None):
-    """Save a custom object as a pickle file.
+def save_object(obj, file_name, directory=None, file_format=None):
+    """Save a custom object to file.
 
     Parameters
     ----------
-    obj : Counts or Words
+    obj : Counts1D or Counts or Words
         Object to save out.
     file_name : str
         Name for the file to be saved out.
     directory : str or Path or SCDB, optional
         Folder or database object specifying the save location.
+    file_format : {'lisc', 'pickle'}, optional
+        The format to save the object in.
+        If 'lisc', the object is saved as a LISC container file, with the '.lisc' extension.
+        If 'pickle', the object is pickled, with the '.p' extension.
+        If not provided, the format is set from the extension of the file name, if given,
+        with '.p' files pickled, and is otherwise 'lisc'.
+
+    Notes
+    -----
+    LISC container files store arrays, such as counts and scores, as raw array sections,
+    which can be memory mapped when loaded, and store the terms and meta data as JSON.
+    Container files are versioned, and do not depend on the layout of the object classes.
+
+    If saving to a database object, the saved file is added to the manifest of the database.
+
+    For ``Words`` objects, the articles data of each result is saved, in its own section,
+    but combined results are not, and can be recomputed with `process_combined_results`
+    after loading. A warning is raised if combined results would be dropped.
+    To save combined results, use the 'pickle' format.
 
     Examples
     --------
@@ -208,18 +234,34 @@ def save_object(obj, file_name, directory=None):
     >>> from tempfile import TemporaryDirectory
     >>> from lisc.objects import Counts
     >>> with TemporaryDirectory() as dirpath:
-    ...     save_object(Counts(), 'counts.p', directory=dirpath)
+    ...     save_object(Counts(), 'counts', directory=dirpath)
     """
 
     obj_type = check_object_type(obj)
-    file_path = check_directory(directory, obj_type) / check_ext(file_name, '.p')
+    folder_path = check_directory(directory, obj_type)
+
+    if file_format is None:
+        file_format = 'pickle' if file_name.endswith('.p') else 'lisc'
 
-    with open(file_path, 'wb') as file_path:
-        pickle.dump(obj, file_path)
+    if file_format == 'lisc':
+        file_path = folder_path / check_ext(file_name, '.lisc')
+        write_container(file_path, *_object_to_container(obj))
 
+    elif file_format == 'pickle':
+        file_path = folder_path / check_ext(file_name, '.p')
+        with open(file_path, 'wb') as f_obj:
+            pickle.dump(obj, f_obj)
+
+    else:
+        raise ValueError('File format not understood.')
+
+    if isinstance(directory, SCDB):
+        directory.manifest.add(obj_type, file_name.split('.')[0], file_path, type(obj).__name__)
 
-def load_object(file_name, directory=None, reload_results=False):
-    """Load a custom object, from a pickle file.
+
+def load_object(file_name, directory=None, reload_results=False, lazy=False, max_articles=None,
+                mmap_mode=None):
+    """Load a custom object, from a LISC container or pickle file.
 
     Parameters
     ----------
@@ -230,11 +272,31 @@ def load_object(file_name, directory=None, reload_results=False):
     reload_results : bool, optional, default: False
         Whether to reload individual results into the loaded object.
         Only applies if loading a Words object.
+    lazy : bool, optional, default: False
+        Whether to lazily reload results, only reading each file when its data is first accessed.
+        Only applies if `reload_results` is True.
+    max_articles : int, optional
+        The maximum number of unprocessed articles to hold in memory across lazily reloaded
+        results. If exceeded, the least recently used results are unloaded, to be reloaded if
+        accessed. Processed results are never unloaded, and are not bounded by this limit.
+        Only applies if `reload_results` and `lazy` are True.
+    mmap_mode : {None, 'r', 'r+', 'c'}, optional
+        If not None, arrays are memory mapped from file, with the given mode, rather than read.
+        With 'r', arrays are read-only, and with 'c', changes are not written to file.
+        Only applies if loading from a LISC container file.
 
     Returns
     -------
     custom_object
-        Custom object loaded from pickle file.
+        Custom object loaded from file.
+
+    Notes
+    -----
+    If no file extension is given, a LISC container file ('.lisc') is looked for first,
+    followed by a pickle file ('.p').
+
+    If lazily reloading results, any results that have already been processed are kept as
+    loaded, rather than reloaded, as reloading would discard the processing.
 
     Examples
     --------
@@ -243,37 +305,71 @@ def load_object(file_name, directory=None, reload_results=False):
     >>> from tempfile import TemporaryDirectory
     >>> from lisc.objects import Counts
     >>> with TemporaryDirectory() as dirpath:
-    ...     save_object(Counts(), 'counts.p', directory=dirpath)
-    ...     counts = load_object('counts.p', directory=dirpath)
+    ...     save_object(Counts(), 'counts', directory=dirpath)
+    ...     counts = load_object('counts', directory=dirpath)
     """
 
-    load_path = None
+    load_path = _get_object_path(file_name, directory)
 
-    if isinstance(directory, SCDB):
+    if is_container(load_path):
+        custom_object = _object_from_container(*read_container(load_path, mmap_mode))
+    else:
+        with open(load_path, 'rb') as load_obj:
+            custom_object = pickle.load(load_obj)
 
-        if check_ext(file_name, '.p') in directory.get_files('counts'):
-            load_path = directory.get_folder_path('counts') / check_ext(file_name, '.p')
-        elif check_ext(file_name, '.p') in directory.get_files('words'):
-            load_path = directory.get_folder_path('words') / check_ext(file_name, '.p')
+    if reload_results:
 
-    elif isinstance(directory, (str, Path)) or directory is None:
+        # Import objects locally, to avoid circular imports
+        from lisc.data.cache import ArticlesCache, ResultsList
 
-        if file_name in os.listdir(directory):
-            directory = '' if directory is None else directory
-            load_path = os.path.join(directory, check_ext(file_name, '.p'))
+        cache = ArticlesCache(max_articles) if lazy else None
+        for result in custom_object.results:
+            if lazy and result.processed:
+                continue
+            result.load(directory=directory, lazy=lazy, cache=cache)
 
-    if not load_path:
-        raise ValueError('Can not find requested file name.')
+        # Track access to lazily reloaded results, including when accessed directly
+        if lazy:
+            custom_object.results = ResultsList(custom_object.results)
 
-    with open(load_path, 'rb') as load_obj:
-        custom_object = pickle.load(load_obj)
+    return custom_object
 
-    if reload_results:
 
-        for result in custom_object.results:
-            result.load(directory=directory)
+def load_object_header(file_name, directory=None):
+    """Load the header of a saved object, without loading any data.
 
-    return custom_object
+    Parameters
+    ----------
+    file_name : str
+        File name of the object.
+    directory : str or Path or SCDB, optional
+        Folder or database object specifying the location to load from.
+
+    Returns
+    -------
+    header : dict
+        Header of the saved object, including the object type, the LISC version it was
+        saved with, its terms and its meta data.
+
+    Raises
+    ------
+    ValueError
+        If the object is not saved as a LISC container file.
+
+    Examples
+    --------
+    Check the type of a saved object, using a temporary directory:
+
+    >>> from tempfile import TemporaryDirectory
+    >>> from lisc.objects import Counts
+    >>> with TemporaryDirectory() as dirpath:
+    ...     save_object(Counts(), 'counts', directory=dirpath)
+    ...     header = load_object_header('counts', directory=dirpath)
+    >>> header['object']
+    'Counts'
+    """
+
+    return read_container_header(_get_object_path(file_name, directory))
 
 
 def save_time_results(results, folder, file_name, directory=None):
@@ -288,19 +384,28 @@ def save_time_results(results, folder, file_name, directory=None):
     file_name : str
         The name of the file to save each object with.
         Each individual object is saved with this label plus a year marker.
-    directory : str or Path
+    directory : str or Path or SCDB
         Location to save to.
+        If a database object, each saved object is added to the manifest of the database,
+        labeled with the folder name and the file name, as 'folder/file_name_year'.
     """
 
     obj_type = check_object_type(results[list(results.keys())[0]])
     folder_path = check_directory(directory, obj_type) / folder
     make_folder(folder_path)
 
-    for key, obj in results.items():
-        save_object(obj, file_name + '_' + str(key), folder_path)
+    with batch_manifest(directory):
+        for key, obj in results.items():
+            label = file_name + '_' + str(key)
+            save_object(obj, label, folder_path)
+            if isinstance(directory, SCDB):
+                directory.manifest.add(obj_type, folder + '/' + label,
+                                       folder_path / check_ext(label, '.lisc'),
+                                       type(obj).__name__)
 
 
-def load_time_results(folder, file_name=None, directory=None):
+def load_time_results(folder, file_name=None, directory=None, lazy=False, n_jobs=1,
+                      pool='thread', mmap_mode=None):
     """Load a set of results collected across time.
 
     Parameters
@@ -309,18 +414,58 @@ def load_time_results(folder, file_name=None, directory=None):
         Folder to load the results from.
     file_name : str, optional
         A file name to specify a set of files to load.
-    directory : str or Path
+    directory : str or Path or SCDB
         Location to load from.
+        If a database object, the files are found from the manifest of the database,
+        falling back to listing the folder if the results are not in the manifest.
+    lazy : bool, optional, default: False
+        Whether to return a view that only loads each result when it is accessed.
+    n_jobs : int, optional, default: 1
+        The number of workers to use to load results, if not lazy.
+        If 1, results are loaded serially. If -1, uses the default number of workers.
+    pool : {'thread', 'process'}, optional, default: 'thread'
+        The kind of pool to load results with, if `n_jobs` is not 1.
+    mmap_mode : {None, 'r', 'r+', 'c'}, optional
+        If not None, arrays are memory mapped from file, with the given mode.
+        Only applies to results saved as LISC container files.
+
+    Returns
+    -------
+    results : dict or TimeResults
+        Results for each year label, in ascending order.
+        If `lazy`, a dictionary-like ``TimeResults`` view, that loads results when accessed.
+
+    Examples
+    --------
+    Lazily load results saved across time (assuming results were saved to 'time_counts'):
+
+    >>> results = load_time_results('time_counts', lazy=True) # doctest: +SKIP
+    >>> counts_2000 = results[2000] # doctest: +SKIP
     """
 
+    files = {}
     folder_path = None
 
     if isinstance(directory, SCDB):
 
-        if folder in directory.get_files('counts'):
-            folder_path = check_directory(directory, 'counts') / folder
-        elif folder in directory.get_files('words'):
-            folder_path = check_directory(directory, 'words') / folder
+        # Use the manifest to find the saved files, if the results were added to it
+        for obj_type in ['counts', 'words']:
+            for label in directory.manifest.get_labels(obj_type, prefix=folder + '/'):
+                if file_name and file_name not in label[len(folder) + 1:]:
+                    continue
+                file_path = directory.manifest.get_path(obj_type, label)
+                if file_path:
+                    files[int(label.split('_')[-1])] = file_path.name
+                    folder_path = file_path.parent
+            if files:
+                break
+
+        # Otherwise, check for the folder directly, to avoid listing the database folders
+        if not files:
+            for obj_type in ['counts', 'words']:
+                if (check_directory(directory, obj_type) / folder).is_dir():
+                    folder_path = check_directory(directory, obj_type) / folder
+                    break
 
     elif isinstance(directory, (str, Path)) or directory is None:
 
@@ -331,12 +476,17 @@ def load_time_results(folder, file_name=None, directory=None):
     if not folder_path:
         raise ValueError('Can not find requested folder name.')
 
-    files = get_files(folder_path, select=file_name)
+    if not files:
+        for file in get_files(folder_path, select=file_name):
+            year_label = int(file.split('.')[0].split('_')[-1])
+            if year_label not in files or file.endswith('.lisc'):
+                files[year_label] = file
 
-    results = {}
-    for file in files:
-        year_label = file.split('.')[0].split('_')[-1]
-        results[int(year_label)] = load_object(file, folder_path)
+    results = TimeResults(files, folder_path, mmap_mode)
+
+    if not lazy:
+        results.load_all(n_jobs, pool)
+        results = dict(results)
 
     return results
 
@@ -352,10 +502,16 @@ def save_meta_data(meta_data, file_name, directory):
         Name of the file to save to.
     directory : str or Path or SCDB, optional
         Folder or database object specifying the location to save the file.
+        If a database object, the saved file is added to the manifest of the database.
     """
 
     save_json(meta_data.as_dict(), file_name, check_directory(directory, 'logs'))
 
+    if isinstance(directory, SCDB):
+        directory.manifest.add('logs', file_name.split('.')[0],
+                               check_directory(directory, 'logs') / check_ext(file_name, '.json'),
+                               'MetaData')
+
 
 def load_meta_data(file_name, directory=None):
     """Load a MetaData object from file.
@@ -382,3 +538,139 @@ def load_meta_data(file_name, directory=None):
     meta_data.from_dict(meta_dict)
 
     return meta_data
+
+
+def _get_object_path(file_name, directory=None):
+    """Get the path of a saved object, checking for LISC container and pickle files.
+
+    Parameters
+    ----------
+    file_name : str
+        File name of the object, with or without the file extension.
+    directory : str or Path or SCDB, optional
+        Folder or database object specifying the location to load from.
+
+    Returns
+    -------
+    Path
+        Path of the saved object.
+    """
+
+    candidates = [file_name] if file_name.endswith(('.lisc', '.p')) else \
+        [check_ext(file_name, '.lisc'), check_ext(file_name, '.p')]
+
+    if isinstance(directory, SCDB):
+
+        # Check the manifest first, for the folder the object was saved to
+        folders = [directory.get_folder_path(folder) for folder in ['counts', 'words'] \
+            if directory.manifest.get(folder, file_name.split('.')[0])]
+        folders.extend(folder for folder in \
+            [directory.get_folder_path('counts'), directory.get_folder_path('words')] \
+            if folder not in folders)
+    elif isinstance(directory, (str, Path)) or directory is None:
+        folders = [Path('' if directory is None else directory)]
+
+    for candidate in candidates:
+        for folder in folders:
+            if (folder / candidate).is_file():
+                return folder / candidate
+
+    raise ValueError('Can not find requested file name.')
+
+
+def _object_to_container(obj):
+    """Get the header and arrays to save a LISC object as a container file."""
+
+    # Import objects locally, to avoid circular imports
+    from lisc.objects import Counts1D, Counts
+    from lisc.data.base_articles import DATA_FIELDS
+
+    header = {'object' : type(obj).__name__, 'lisc_version' : __version__,
+              'meta_data' : obj.meta_data.as_dict() if obj.meta_data else None}
+    arrays = {}
+
+    if isinstance(obj, Counts1D):
+        header['terms'] = _get_terms_state(obj)
+        arrays['counts'] = obj.counts
+
+    elif isinstance(obj, Counts):
+        header['terms'] = {dim : _get_terms_state(obj.terms[dim]) for dim in ['A', 'B']}
+        header['square'] = obj.square
+        header['score_info'] = obj.score_info
+        arrays.update({'counts' : obj.counts, 'score' : obj.score,
+                       'counts_A' : obj.terms['A'].counts, 'counts_B' : obj.terms['B'].counts})
+
+    else:
+
+        if getattr(obj, 'combined_results', None):
+            warnings.warn('Combined results are not saved in the LISC container format, '
+                          'and can be recomputed after loading, or saved with the '
+                          "'pickle' format.")
+
+        # Store the data of each result as a JSON encoded section, to keep the header small
+        header['terms'] = _get_terms_state(obj)
+        header['results'] = []
+        for ind, result in enumerate(obj.results):
+            header['results'].append({'term' : list(result.term), 'processed' : result.processed,
+                                      'is_compact' : result.is_compact})
+            data = {field : list(getattr(result, field)) for field in DATA_FIELDS}
+            arrays['result_' + str(ind)] = \
+                np.frombuffer(json.dumps(data).encode('utf-8'), dtype=np.uint8)
+
+    return header, arrays
+
+
+def _object_from_container(header, arrays):
+    """Create a LISC object from the header and arrays of a container file."""
+
+    # Import objects locally, to avoid circular imports
+    from lisc.objects import Counts1D, Counts, Words
+    from lisc.data import Articles, Term, MetaData
+    from lisc.data.base_articles import DATA_FIELDS
+
+    obj = {'Counts1D' : Counts1D, 'Counts' : Counts, 'Words' : Words}[header['object']]()
+
+    if isinstance(obj, Counts1D):
+        _set_terms_state(obj, header['terms'])
+        obj.counts = arrays['counts']
+
+    elif isinstance(obj, Counts):
+        for dim in ['A', 'B']:
+            _set_terms_state(obj.terms[dim], header['terms'][dim])
+            obj.terms[dim].counts = arrays['counts_' + dim]
+        obj.square = header['square']
+        obj.score_info = header['score_info']
+        obj.counts, obj.score = arrays['counts'], arrays['score']
+
+    else:
+        _set_terms_state(obj, header['terms'])
+        for ind, result in enumerate(header['results']):
+            arts = Articles(Term(*result['term']), compact=result['is_compact'])
+            data = json.loads(np.asarray(arrays['result_' + str(ind)]).tobytes().decode('utf-8'))
+            for field in DATA_FIELDS:
+                for datum in data[field]:
+                    arts.add_data(field, datum)
+            arts.processed = result['processed']
+            obj.results.append(arts)
+
+    if header['meta_data']:
+        obj.meta_data = MetaData()
+        obj.meta_data.from_dict(header['meta_data'])
+
+    return obj
+
+
+def _get_terms_state(base):
+    """Get the definition of the terms of a Base object, as a dictionary."""
+
+    return {'terms' : base.terms, 'inclusions' : base.inclusions,
+            'exclusions' : base.exclusions, 'labels' : base._labels, 'joiners' : base._joiners}
+
+
+def _set_terms_state(base, state):
+    """Set the definition of the terms of a Base object, from a dictionary."""
+
+    base.terms, base.inclusions, base.exclusions = \
+        state['terms'], state['inclusions'], state['exclusions']
+    base._labels, base._joiners = state['labels'], state['joiners']
+
@@ -0,0 +1,302 @@
+"""Manifest object, to catalog the files saved in a database."""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+
+###################################################################################################
+###################################################################################################
+
+MANIFEST_FILE = 'manifest.json'
+
+# Time, in seconds, after which a lock on the manifest file is assumed to be stale
+LOCK_TIMEOUT = 30.
+
+class Manifest():
+    """A catalog of saved files, stored as a JSON file in the base folder of a database.
+
+    Attributes
+    ----------
+    file_path : Path
+        Path of the manifest file.
+    entries : dict
+        Entries for each saved file, organized as {folder : {label : entry}}.
+
+    Notes
+    -----
+    Each entry records the path of the file, relative to the folder of the manifest,
+    the size of the file in bytes, the type of object saved, the SHA-256 hash of the file,
+    and the date the file was saved.
+
+    Files are only cataloged when they are saved with a database object, and files that
+    are moved, deleted, or saved outside of LISC are not reflected in the manifest. The manifest
+    is therefore used to locate files, which are then checked on disk.
+
+    Each save of the manifest locks the manifest file, with a lock file, and merges in any
+    entries added by other writers since it was read, such that multiple processes can add
+    entries to the same manifest. Adding many entries can be batched, with `batch`, such that
+    the manifest is written once.
+    """
+
+    def __init__(self, file_path):
+        """Initialize a Manifest object.
+
+        Parameters
+        ----------
+        file_path : str or Path
+            Path of the manifest file, which is loaded if it already exists.
+
+        Examples
+        --------
+        Initialize a ``Manifest`` object, for a database named 'lisc_db':
+
+        >>> manifest = Manifest('lisc_db/manifest.json')
+        """
+
+        self.file_path = Path(file_path)
+        self.entries = {}
+
+        self._mtime = None
+        self._pending = {}
+        self._n_batch = 0
+        self.reload()
+
+
+    def reload(self, force=False):
+        """Reload the manifest from file, if the file has changed since it was last read.
+
+        Parameters
+        ----------
+        force : bool, optional, default: False
+            Whether to reload the manifest, even if the file has not changed.
+
+        Notes
+        -----
+        Any entries that have been added, but not yet saved, are kept.
+        """
+
+        # If the file was removed since it was read, clear entries, keeping any unsaved entries
+        if not self.file_path.is_file():
+            if self._mtime is not None:
+                self._mtime = None
+                self._set_entries({})
+            return
+
+        mtime = self.file_path.stat().st_mtime_ns
+        if force or mtime != self._mtime:
+            with open(self.file_path) as f_obj:
+                self._set_entries(json.load(f_obj))
+            self._mtime = mtime
+
+
+    def save(self):
+        """Save the manifest to file, merging in any entries saved by other writers."""
+
+        with self._lock():
+
+            self.reload(force=True)
+
+            # Write to a temporary file, and replace, so the manifest is never partially written
+            temp_path = self.file_path.with_name(self.file_path.name + '.tmp')
+            with open(temp_path, 'w') as f_obj:
+                json.dump(self.entries, f_obj, indent=1)
+            os.replace(temp_path, self.file_path)
+
+            self._mtime = self.file_path.stat().st_mtime_ns
+            self._pending = {}
+
+
+    @contextmanager
+    def batch(self):
+        """Context manager to batch added entries, saving the manifest once on exit.
+
+        Examples
+        --------
+        Add entries for multiple saved files, writing the manifest once:
+
+        >>> manifest = Manifest('lisc_db/manifest.json')  # doctest: +SKIP
+        >>> with manifest.batch():  # doctest: +SKIP
+        ...     for label in ['frontal_lobe', 'temporal_lobe']:
+        ...         manifest.add('raw', label, 'lisc_db/data/words/raw/' + label + '.json',
+        ...                      'Articles')
+        """
+
+        self._n_batch += 1
+        try:
+            yield self
+        finally:
+            self._n_batch -= 1
+            if not self._n_batch and self._pending:
+                self.save()
+
+
+    def add(self, folder, label, file_path, object_type, save=True):
+        """Add an entry for a saved file.
+
+        Parameters
+        ----------
+        folder : str
+            The database folder the file is saved to.
+        label : str
+            The label of the file, which replaces any existing entry with the same label.
+        file_path : str or Path
+            Path of the saved file.
+        object_type : str
+            The type of object saved to the file.
+        save : bool, optional, default: True
+            Whether to save the manifest after adding the entry.
+            The manifest is not saved if entries are being batched, with `batch`.
+        """
+
+        entry = {'path' : Path(os.path.relpath(file_path, self.file_path.parent)).as_posix(),
+                 'size' : os.path.getsize(file_path),
+                 'object' : object_type,
+                 'sha256' : compute_file_hash(file_path),
+                 'created' : datetime.now().strftime("%Y-%m-%d_%H:%M:%S")}
+
+        self._pending.setdefault(folder, {})[label] = entry
+        self.entries.setdefault(folder, {})[label] = entry
+
+        if save and not self._n_batch:
+            self.save()
+
+
+    def get(self, folder, label):
+        """Get the entry for a saved file.
+
+        Parameters
+        ----------
+        folder : str
+            The database folder the file is saved to.
+        label : str
+            The label of the file.
+
+        Returns
+        -------
+        dict or None
+            The entry for the file, or None if there is no entry.
+        """
+
+        return self.entries.get(folder, {}).get(label)
+
+
+    def get_path(self, folder, label):
+        """Get the path of a saved file, if the file is in the manifest and still exists.
+
+        Parameters
+        ----------
+        folder : str
+            The database folder the file is saved to.
+        label : str
+            The label of the file.
+
+        Returns
+        -------
+        Path or None
+            The path of the file, or None if there is no entry, or the file no longer exists.
+        """
+
+        entry = self.get(folder, label)
+        if not entry:
+            return None
+
+        file_path = self.file_path.parent / entry['path']
+
+        return file_path if file_path.is_file() else None
+
+
+    def get_labels(self, folder, prefix=None):
+        """Get the labels of the saved files in a folder.
+
+        Parameters
+        ----------
+        folder : str
+            The database folder to get the labels for.
+        prefix : str, optional
+            If provided, only labels that start with this prefix are returned.
+
+        Returns
+        -------
+        list of str
+            Labels of the saved files, sorted.
+        """
+
+        labels = self.entries.get(folder, {})
+
+        return sorted(label for label in labels if not prefix or label.startswith(prefix))
+
+
+    def _set_entries(self, entries):
+        """Set the entries of the manifest, keeping any entries that have not yet been saved."""
+
+        for folder, folder_entries in self._pending.items():
+            entries.setdefault(folder, {}).update(folder_entries)
+
+        self.entries = entries
+
+
+    @contextmanager
+    def _lock(self):
+        """Context manager to hold a lock on the manifest file, while it is being written."""
+
+        lock_path = self.file_path.with_name(self.file_path.name + '.lock')
+
+        start = time.monotonic()
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                if time.monotonic() - start > LOCK_TIMEOUT:
+                    # Assume the lock was left by a writer that did not finish, and remove it
+                    try:
+                        os.remove(lock_path)
+                    except FileNotFoundError:
+                        pass
+                    start = time.monotonic()
+                time.sleep(0.01)
+
+        try:
+            yield
+        finally:
+            os.remove(lock_path)
+
+
+def compute_file_hash(file_path, chunk_size=2**20):
+    """Compute the SHA-256 hash of a file.
+
+    Parameters
+    ----------
+    file_path : str or Path
+        Path of the file.
+    chunk_size : int, optional, default: 1 MiB
+        Number of bytes to read at a time.
+
+    Returns
+    -------
+    str
+        The hash of the file, as a hexadecimal string.
+
+    Examples
+    --------
+    Compute the hash of a file, using a temporary directory:
+
+    >>> from tempfile import TemporaryDirectory
+    >>> with TemporaryDirectory() as dirpath:
+    ...     with open(dirpath + '/file.txt', 'w') as f_obj:
+    ...         _ = f_obj.write('lisc')
+    ...     file_hash = compute_file_hash(dirpath + '/file.txt')
+    >>> file_hash[:8]
+    '906beb18'
+    """
+
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as f_obj:
+        for chunk in iter(lambda: f_obj.read(chunk_size), b''):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
@@ -0,0 +1,143 @@
+"""Object for lazily loading results collected across time."""
+
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+###################################################################################################
+###################################################################################################
+
+class TimeResults(Mapping):
+    """A dictionary-like view of results collected across time, loading each result on access.
+
+    Attributes
+    ----------
+    folder_path : str or Path
+        Folder that the results are loaded from.
+    mmap_mode : {None, 'r', 'r+', 'c'}
+        The mode to memory map arrays with, if not None.
+    n_loaded : int
+        The number of results that have been loaded.
+
+    Notes
+    -----
+    Keys are the year labels of the results, in ascending order. Each result is loaded from
+    file the first time it is accessed, and is then kept. Checking the keys, the length, or
+    membership does not load any results.
+    """
+
+    def __init__(self, files, folder_path, mmap_mode=None):
+        """Initialize a TimeResults object.
+
+        Parameters
+        ----------
+        files : dict of {int : str}
+            File name of the result for each year label.
+        folder_path : str or Path
+            Folder that the results are loaded from.
+        mmap_mode : {None, 'r', 'r+', 'c'}, optional
+            If not None, arrays are memory mapped from file, with the given mode.
+            Only applies to results saved as LISC container files.
+
+        Examples
+        --------
+        Initialize a view of two results, saved in the 'time_counts' folder:
+
+        >>> results = TimeResults({1990 : 'counts_1990.lisc', 2000 : 'counts_2000.lisc'},
+        ...                       'time_counts')
+        >>> list(results.keys())
+        [1990, 2000]
+        """
+
+        self.folder_path = folder_path
+        self.mmap_mode = mmap_mode
+
+        self._files = {key : files[key] for key in sorted(files)}
+        self._results = {}
+
+
+    def __getitem__(self, key):
+
+        if key not in self._results:
+            self._results[key] = _load_result(self._files[key], self.folder_path, self.mmap_mode)
+
+        return self._results[key]
+
+
+    def __contains__(self, key):
+
+        return key in self._files
+
+
+    def __iter__(self):
+
+        return iter(self._files)
+
+
+    def __len__(self):
+
+        return len(self._files)
+
+
+    def __repr__(self):
+
+        return 'TimeResults({} results, {} loaded)'.format(len(self), self.n_loaded)
+
+
+    @property
+    def n_loaded(self):
+        """The number of results that have been loaded."""
+
+        return len(self._results)
+
+
+    def load_all(self, n_jobs=1, pool='thread'):
+        """Load all results that have not yet been loaded.
+
+        Parameters
+        ----------
+        n_jobs : int, optional, default: 1
+            The number of workers to use to load results.
+            If 1, results are loaded serially. If -1, uses the default number of workers.
+        pool : {'thread', 'process'}, optional, default: 'thread'
+            The kind of pool to load results with, if `n_jobs` is not 1.
+
+        Notes
+        -----
+        A thread pool overlaps reading files, which suits memory mapped results, as little
+        data is read when loading. A process pool also parallelizes unpickling, but results
+        are returned to the main process by pickling, such that any memory mapped arrays are
+        read into memory.
+
+        Examples
+        --------
+        Load all results, using 4 threads (assuming `results` is a ``TimeResults`` object):
+
+        >>> results.load_all(n_jobs=4) # doctest: +SKIP
+        """
+
+        keys = [key for key in self._files if key not in self._results]
+
+        if n_jobs == 1:
+            for key in keys:
+                self[key]
+
+        else:
+
+            if pool not in ['thread', 'process']:
+                raise ValueError('Pool type not understood.')
+
+            pool_type = ThreadPoolExecutor if pool == 'thread' else ProcessPoolExecutor
+            with pool_type(None if n_jobs == -1 else n_jobs) as executor:
+                loaded = executor.map(_load_result, [self._files[key] for key in keys],
+                                      [self.folder_path] * len(keys),
+                                      [self.mmap_mode] * len(keys))
+                self._results.update(zip(keys, loaded))
+
+
+def _load_result(file_name, folder_path, mmap_mode):
+    """Load a single result, as a top-level function, so that it can be run in a process pool."""
+
+    # Import locally, to avoid circular imports
+    from lisc.io.io import load_object
+
+    return load_object(file_name, folder_path, mmap_mode=mmap_mode)
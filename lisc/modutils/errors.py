@@ -11,3 +11,6 @@ class InconsistentDataError(LISCError):
 
 class ProcessingError(LISCError):
     """Custom error for when there is an issue processing data."""
+
+class CollectionStopped(LISCError):
+    """Custom error, to be raised from a collection hook, to stop a data collection early."""
@@ -2,3 +2,5 @@
 
 from .counts import Counts, Counts1D
 from .words import Words
+from .citations import CitationGraph
+from .shards import make_shards, collect_shard, merge_shards
@@ -0,0 +1,392 @@
+"""Class for LISC citation analysis: a graph of citations between articles."""
+
+import numpy as np
+
+from lisc.io.io import save_json, load_json
+from lisc.io.db import check_directory
+from lisc.io.utils import check_ext
+from lisc.requester import Requester
+from lisc.data.meta_data import MetaData
+from lisc.collect.citations import get_citations
+
+###################################################################################################
+###################################################################################################
+
+UTILS = ['citations', 'references']
+
+class CitationGraph():
+    """A class for collecting and storing a graph of citations between articles.
+
+    Attributes
+    ----------
+    label : str
+        Label for the graph, used as the file name when saving.
+    dois : list of str
+        The DOI of each node in the graph.
+    sources, targets : 1d array of int
+        The citing and the cited node of each edge in the graph.
+    expanded : dict of 1d array of bool
+        Whether the citations and references of each node have been collected.
+    meta_data : list of MetaData
+        Meta data information about each data collection.
+
+    Notes
+    -----
+    Nodes are indexed by integers, with a DOI to index mapping, and edges are stored as
+    arrays of source and target indices, with each edge pointing from the citing article
+    to the cited article. DOIs are stored in lower case, as they are case insensitive.
+    """
+
+    def __init__(self, label='citations'):
+        """Initialize a CitationGraph object.
+
+        Parameters
+        ----------
+        label : str, optional, default: 'citations'
+            Label for the graph.
+
+        Examples
+        --------
+        Initialize a ``CitationGraph`` object:
+
+        >>> graph = CitationGraph()
+        """
+
+        self.label = label
+
+        self.dois = list()
+        self._index = dict()
+
+        self.sources = np.zeros(0, dtype=int)
+        self.targets = np.zeros(0, dtype=int)
+        self.expanded = {util : np.zeros(0, dtype=bool) for util in UTILS}
+
+        self.meta_data = list()
+
+
+    def __contains__(self, doi):
+
+        return doi.lower() in self._index
+
+
+    def __len__(self):
+
+        return len(self.dois)
+
+
+    @property
+    def n_nodes(self):
+        """The number of nodes, or articles, in the graph."""
+
+        return len(self.dois)
+
+
+    @property
+    def n_edges(self):
+        """The number of edges, or citations, in the graph."""
+
+        return len(self.sources)
+
+
+    def get_index(self, dois):
+        """Get the node index of each of a list of DOIs.
+
+        Parameters
+        ----------
+        dois : str or list of str
+            DOI(s) to get the node index for.
+
+        Returns
+        -------
+        int or 1d array of int
+            The node index for each DOI, or -1 for DOIs not in the graph.
+        """
+
+        if isinstance(dois, str):
+            return self._index.get(dois.lower(), -1)
+
+        return np.array([self._index.get(doi.lower(), -1) for doi in dois], dtype=int)
+
+
+    def add_nodes(self, dois):
+        """Add nodes to the graph, for any DOIs that are not already in the graph.
+
+        Parameters
+        ----------
+        dois : list of str
+            DOIs to add as nodes.
+
+        Returns
+        -------
+        inds : 1d array of int
+            The node index for each DOI.
+        """
+
+        inds = np.zeros(len(dois), dtype=int)
+        for ind, doi in enumerate(dois):
+            doi = doi.lower()
+            if doi not in self._index:
+                self._index[doi] = len(self.dois)
+                self.dois.append(doi)
+            inds[ind] = self._index[doi]
+
+        for util in UTILS:
+            n_new = self.n_nodes - len(self.expanded[util])
+            if n_new:
+                self.expanded[util] = np.concatenate(\
+                    [self.expanded[util], np.zeros(n_new, dtype=bool)])
+
+        return inds
+
+
+    def add_edges(self, citing, cited):
+        """Add edges to the graph, adding any new nodes, and dropping duplicate edges.
+
+        Parameters
+        ----------
+        citing, cited : list of str
+            The DOIs of the citing and the cited article for each edge.
+        """
+
+        sources = np.concatenate([self.sources, self.add_nodes(citing)])
+        targets = np.concatenate([self.targets, self.add_nodes(cited)])
+
+        edges = np.unique(np.stack([sources, targets], axis=1), axis=0) if len(sources) \
+            else np.zeros([0, 2], dtype=int)
+        self.sources, self.targets = edges[:, 0], edges[:, 1]
+
+
+    def add_citations(self, cite_dois, util='citations', failed=None):
+        """Add collected citation data to the graph.
+
+        Parameters
+        ----------
+        cite_dois : dict
+            The DOIs of citing or referenced articles for each article, as returned by
+            `collect_citations`, with `collect_dois` set as True.
+        util : {'citations', 'references'}
+            Which utility the citation data was collected with.
+        failed : list of str, optional
+            DOIs for which the request failed, which are added, but not marked as expanded,
+            so that they are collected again by later collections.
+        """
+
+        inds = self.add_nodes(list(cite_dois.keys()))
+        failed = {doi.lower() for doi in failed} if failed else set()
+
+        citing, cited = [], []
+        for doi, dois in cite_dois.items():
+            dois = dois if dois else []
+            if util == 'citations':
+                citing.extend(dois)
+                cited.extend([doi] * len(dois))
+            else:
+                citing.extend([doi] * len(dois))
+                cited.extend(dois)
+
+        self.add_edges(citing, cited)
+        self.expanded[util][inds[[doi.lower() not in failed for doi in cite_dois]]] = True
+
+
+    def run_collection(self, dois, util='citations', depth=1, batch_size=1, n_jobs=1,
+                       wait_time=0.1, logging=None, directory=None, verbose=False):
+        """Collect citation data, expanding the graph from the given DOIs.
+
+        Parameters
+        ----------
+        dois : list of str
+            DOIs to start collecting citation data from.
+        util : {'citations', 'references'}
+            Which utility to collect citation data with.
+        depth : int, optional, default: 1
+            How many steps to expand out from the given DOIs.
+            For example, a depth of 2 also collects the citations of citing articles.
+        batch_size : int, optional, default: 1
+            The number of DOIs to request per URL.
+        n_jobs : int, optional, default: 1
+            The number of requests to run concurrently.
+        wait_time : float, optional, default: 0.1
+            Minimum time to wait between launching requests, in seconds.
+        logging : {None, 'print', 'store', 'file'} or Requester, optional
+            What kind of logging, if any, to do for requested URLs.
+        directory : str or SCDB, optional
+            Folder or database object specifying the save location.
+        verbose : bool, optional, default: False
+            Whether to print out updates.
+
+        Notes
+        -----
+        Collection is incremental: DOIs that have already been expanded, with the same
+        utility, are not collected again, though their neighbours are still expanded.
+        DOIs for which the request fails are not marked as expanded, and so are collected
+        again by later collections.
+
+        Examples
+        --------
+        Collect the citations, and the citations of citing articles, for an article:
+
+        >>> graph = CitationGraph()
+        >>> graph.run_collection(['10.1038/nmeth.1635'], depth=2) # doctest:+SKIP
+        """
+
+        if util not in UTILS:
+            raise ValueError('Citation utility not understood.')
+
+        meta_data = MetaData()
+        meta_data.add_settings({'util' : util, 'depth' : depth,
+                                'batch_size' : batch_size, 'n_jobs' : n_jobs})
+
+        req = logging if isinstance(logging, Requester) else \
+            Requester(wait_time=wait_time, logging=logging, directory=directory)
+
+        frontier = self.add_nodes(dois)
+        visited = set(frontier)
+
+        for step in range(depth):
+
+            to_collect = [self.dois[ind] for ind in frontier if not self.expanded[util][ind]]
+
+            if verbose:
+                print('Step {}: collecting {} of {} DOIs.'.format(\
+                    step + 1, len(to_collect), len(frontier)))
+
+            if to_collect:
+                _, cite_dois, failed = get_citations(req, to_collect, util, collect_dois=True,
+                                                     batch_size=batch_size, n_jobs=n_jobs)
+                self.add_citations(cite_dois, util, failed)
+
+            # Get the next set of DOIs to expand, as the unvisited neighbours of the current set
+            neighbours = self.get_neighbours(frontier, 'in' if util == 'citations' else 'out')
+            frontier = np.array(sorted(set(neighbours) - visited), dtype=int)
+            visited.update(frontier)
+
+        meta_data.add_requester(req)
+        self.meta_data.append(meta_data)
+
+
+    def get_neighbours(self, inds, direction='out'):
+        """Get the neighbours of a set of nodes.
+
+        Parameters
+        ----------
+        inds : 1d array of int
+            Node indices to get the neighbours of.
+        direction : {'out', 'in'}
+            Whether to get the articles cited by ('out') or citing ('in') the given articles.
+
+        Returns
+        -------
+        1d array of int
+            The unique node indices of the neighbours.
+        """
+
+        source, target = (self.sources, self.targets) if direction == 'out' \
+            else (self.targets, self.sources)
+
+        return np.unique(target[np.isin(source, inds)])
+
+
+    def get_in_degree(self, dois=None):
+        """Get the in-degree, the number of citing articles in the graph, of each node.
+
+        Parameters
+        ----------
+        dois : list of str, optional
+            DOIs to get the in-degree for. If not provided, returns values for all nodes.
+
+        Returns
+        -------
+        1d array of int
+            The in-degree of each node. DOIs not in the graph have an in-degree of 0.
+        """
+
+        return self._get_degree(self.targets, dois)
+
+
+    def get_out_degree(self, dois=None):
+        """Get the out-degree, the number of referenced articles in the graph, of each node.
+
+        Parameters
+        ----------
+        dois : list of str, optional
+            DOIs to get the out-degree for. If not provided, returns values for all nodes.
+
+        Returns
+        -------
+        1d array of int
+            The out-degree of each node. DOIs not in the graph have an out-degree of 0.
+        """
+
+        return self._get_degree(self.sources, dois)
+
+
+    def save(self, directory=None):
+        """Save out the graph, as arrays of edges and a json file of nodes.
+
+        Parameters
+        ----------
+        directory : str or SCDB, optional
+            Folder or database object specifying the save location.
+
+        Examples
+        --------
+        Save a ``CitationGraph`` object, using a temporary directory:
+
+        >>> from tempfile import TemporaryDirectory
+        >>> graph = CitationGraph()
+        >>> with TemporaryDirectory() as dirpath:
+        ...     graph.save(directory=dirpath)
+        """
+
+        directory = check_directory(directory, 'citations')
+
+        np.savez(directory / check_ext(self.label, '.npz'),
+                 sources=self.sources, targets=self.targets, **self.expanded)
+        save_json({'label' : self.label, 'dois' : self.dois,
+                   'meta_data' : [meta_data.as_dict() for meta_data in self.meta_data]},
+                  self.label, directory)
+
+
+    def load(self, directory=None):
+        """Load a graph from file.
+
+        Parameters
+        ----------
+        directory : str or SCDB, optional
+            Folder or database object specifying the load location.
+
+        Examples
+        --------
+        Load a ``CitationGraph``, assuming an :class:`~.SCDB` organization named 'lisc_db':
+
+        >>> from lisc.io import SCDB
+        >>> graph = CitationGraph()
+        >>> graph.load(SCDB('lisc_db')) # doctest:+SKIP
+        """
+
+        directory = check_directory(directory, 'citations')
+
+        nodes = load_json(self.label, directory)
+        self.dois = nodes['dois']
+        self._index = {doi : ind for ind, doi in enumerate(self.dois)}
+        self.meta_data = []
+        for meta_dict in nodes['meta_data']:
+            meta_data = MetaData()
+            meta_data.from_dict(meta_dict)
+            self.meta_data.append(meta_data)
+
+        with np.load(directory / check_ext(self.label, '.npz')) as arrays:
+            self.sources, self.targets = arrays['sources'], arrays['targets']
+            self.expanded = {util : arrays[util] for util in UTILS}
+
+
+    def _get_degree(self, nodes, dois=None):
+        """Get the number of edges for each node, from an array of edge nodes."""
+
+        degree = np.bincount(nodes, minlength=self.n_nodes)
+
+        if dois is not None:
+            inds = self.get_index(dois)
+            degree = np.where(inds >= 0, degree[inds], 0)
+
+        return degree
@@ -1,15 +1,17 @@
 """Class for collection and analyses of co-occurrences data."""
 
+import os
 from copy import deepcopy
+from pathlib import Path
 from collections import defaultdict
 
 import numpy as np
 
 from lisc.objects.base import Base
-from lisc.utils.base import wrap, get_max_length
-from lisc.collect import collect_counts
+from lisc.utils.base import wrap, get_max_length, get_chunks
+from lisc.collect import collect_counts, collect_counts_local
 from lisc.analysis.counts import (compute_normalization, compute_association_index,
-                                  compute_similarity)
+                                  compute_similarity, CHUNK_SIZE)
 
 ###################################################################################################
 ###################################################################################################
@@ -52,11 +54,13 @@ class Counts1D(Base):
     def has_data(self):
         """Indicator for if the object has collected data."""
 
-        return np.any(self.counts)
+        # Check in chunks, stopping at the first chunk with data, to avoid reading all the data
+        return any(np.any(self.counts[chunk]) \
+            for chunk in get_chunks(self.counts.shape[0], CHUNK_SIZE))
 
 
     def run_collection(self, db='pubmed', field='TIAB', api_key=None, logging=None,
-                       directory=None, verbose=False, **eutils_kwargs):
+                       directory=None, verbose=False, hooks=None, **eutils_kwargs):
         """Collect counts data.
 
         Parameters
@@ -74,6 +78,9 @@ class Counts1D(Base):
             Folder or database object specifying the save location.
         verbose : bool, optional, default: False
             Whether to print out updates.
+        hooks : dict, optional
+            Functions to call with updates during the collection, with hook names as keys.
+            See `collect_counts` for the available hooks.
         **eutils_kwargs
             Additional settings for the EUtils API.
 
@@ -90,7 +97,35 @@ class Counts1D(Base):
             terms_a=self.terms, inclusions_a=self.inclusions,
             exclusions_a=self.exclusions, labels_a=self.labels,
             db=db, field=field, api_key=api_key, collect_coocs=False,
-            logging=logging, directory=directory, verbose=verbose, **eutils_kwargs)
+            logging=logging, directory=directory, hooks=hooks, verbose=verbose,
+            **eutils_kwargs)
+
+
+    def run_local_collection(self, data, fields=('titles', 'words'), verbose=False):
+        """Compute counts data from already collected article data.
+
+        Parameters
+        ----------
+        data : Words or list of Articles
+            Collected article data to search within.
+        fields : tuple of str, optional, default: ('titles', 'words')
+            Article data fields to search for terms within.
+        verbose : bool, optional, default: False
+            Whether to print out updates.
+
+        Examples
+        --------
+        Compute counts data for added terms, from an existing ``Words`` object:
+
+        >>> counts = Counts1D()
+        >>> counts.add_terms(['frontal lobe', 'temporal lobe', 'parietal lobe', 'occipital lobe'])
+        >>> counts.run_local_collection(words) # doctest: +SKIP
+        """
+
+        self.counts, self.meta_data = collect_counts_local(
+            data, terms_a=self.terms, inclusions_a=self.inclusions,
+            exclusions_a=self.exclusions, labels_a=self.labels, fields=fields,
+            collect_coocs=False, joiners_a=self._joiners, verbose=verbose)
 
 
     def check_top(self):
@@ -156,6 +191,8 @@ class Counts():
         Whether the count data matrix is symmetrical.
     meta_data : MetaData
         Meta data information about the data collection.
+    memmap_dir : Path or None
+        Folder of the memory mapped files backing the count and score data, if any.
     """
 
     def __init__(self):
@@ -172,6 +209,7 @@ class Counts():
         self.score_info = {}
         self.square = bool()
         self.meta_data = None
+        self.memmap_dir = None
 
 
     def __getitem__(self, keys):
@@ -206,7 +244,9 @@ class Counts():
     def has_data(self):
         """Indicator for if the object has collected data."""
 
-        return np.any(self.counts)
+        # Check in chunks, stopping at the first chunk with data, to avoid reading all the data
+        return any(np.any(self.counts[chunk]) \
+            for chunk in get_chunks(self.counts.shape[0], CHUNK_SIZE))
 
 
     def add_terms(self, terms, term_type='terms', directory=None, dim='A'):
@@ -268,7 +308,7 @@ class Counts():
 
 
     def run_collection(self, db='pubmed', field='TIAB', api_key=None, logging=None,
-                       directory=None, verbose=False, **eutils_kwargs):
+                       directory=None, verbose=False, hooks=None, **eutils_kwargs):
         """Collect co-occurrence data.
 
         Parameters
@@ -286,6 +326,9 @@ class Counts():
             Folder or database object specifying the save location.
         verbose : bool, optional, default: False
             Whether to print out updates.
+        hooks : dict, optional
+            Functions to call with updates during the collection, with hook names as keys.
+            See `collect_counts` for the available hooks.
         **eutils_kwargs
             Additional settings for the EUtils API.
 
@@ -315,7 +358,7 @@ class Counts():
                 labels_a=self.terms['A'].labels,
                 db=db, field=field, api_key=api_key,
                 logging=logging, directory=directory,
-                verbose=verbose, **eutils_kwargs)
+                hooks=hooks, verbose=verbose, **eutils_kwargs)
 
         # Run two different sets of terms
         else:
@@ -331,7 +374,63 @@ class Counts():
                 labels_b=self.terms['B'].labels,
                 db=db, field=field, api_key=api_key,
                 logging=logging, directory=directory,
-                verbose=verbose, **eutils_kwargs)
+                hooks=hooks, verbose=verbose, **eutils_kwargs)
+            self.terms['A'].counts, self.terms['B'].counts = term_counts
+
+
+    def run_local_collection(self, data, fields=('titles', 'words'), verbose=False):
+        """Compute co-occurrence data from already collected article data.
+
+        Parameters
+        ----------
+        data : Words or list of Articles
+            Collected article data to search within.
+        fields : tuple of str, optional, default: ('titles', 'words')
+            Article data fields to search for terms within.
+        verbose : bool, optional, default: False
+            Whether to print out updates.
+
+        Notes
+        -----
+        This computes co-occurrences locally, without making any requests, and requires scipy.
+        Any articles that do not match a term are included in the search space, and so the
+        results are relative to the collected articles, rather than to the whole database.
+
+        Examples
+        --------
+        Compute co-occurrence data for added terms, from an existing ``Words`` object:
+
+        >>> counts = Counts()
+        >>> counts.add_terms(['frontal lobe', 'temporal lobe', 'parietal lobe', 'occipital lobe'])
+        >>> counts.run_local_collection(words) # doctest: +SKIP
+        """
+
+        # Run single list of terms against themselves, in 'square' mode
+        if not self.terms['B'].has_terms:
+            self.square = True
+            self.counts, self.terms['A'].counts, self.meta_data = collect_counts_local(
+                data,
+                terms_a=self.terms['A'].terms,
+                inclusions_a=self.terms['A'].inclusions,
+                exclusions_a=self.terms['A'].exclusions,
+                labels_a=self.terms['A'].labels,
+                fields=fields, joiners_a=self.terms['A']._joiners, verbose=verbose)
+
+        # Run two different sets of terms
+        else:
+            self.square = False
+            self.counts, term_counts, self.meta_data = collect_counts_local(
+                data,
+                terms_a=self.terms['A'].terms,
+                inclusions_a=self.terms['A'].inclusions,
+                exclusions_a=self.terms['A'].exclusions,
+                labels_a=self.terms['A'].labels,
+                terms_b=self.terms['B'].terms,
+                inclusions_b=self.terms['B'].inclusions,
+                exclusions_b=self.terms['B'].exclusions,
+                labels_b=self.terms['B'].labels, fields=fields,
+                joiners_a=self.terms['A']._joiners, joiners_b=self.terms['B']._joiners,
+                verbose=verbose)
             self.terms['A'].counts, self.terms['B'].counts = term_counts
 
 
@@ -374,6 +473,8 @@ class Counts():
 
         >>> from lisc.plts.counts import plot_dendrogram  # doctest:+SKIP
         >>> plot_dendrogram(counts)  # doctest:+SKIP
+
+        If the object is memory mapped, with `to_memmap`, the score is written to file.
         """
 
         # Clear any previously computed score
@@ -385,20 +486,28 @@ class Counts():
         if score_type == 'association':
             if self.square:
                 self.score = compute_association_index(
-                    self.counts, self.terms['A'].counts, self.terms['A'].counts)
+                    self.counts, self.terms['A'].counts, self.terms['A'].counts,
+                    out=self._get_score_out(self.counts.shape))
             else:
                 self.score = compute_association_index(
-                    self.counts, self.terms['A'].counts, self.terms['B'].counts)
+                    self.counts, self.terms['A'].counts, self.terms['B'].counts,
+                    out=self._get_score_out(self.counts.shape))
 
         elif score_type == 'normalize':
-            self.score = compute_normalization(self.counts, self.terms[dim].counts, dim)
+            self.score = compute_normalization(self.counts, self.terms[dim].counts, dim,
+                                               out=self._get_score_out(self.counts.shape))
 
         elif score_type == 'similarity':
-            self.score = compute_similarity(self.counts, dim=dim)
+            n_terms = self.counts.shape[0 if dim == 'A' else 1]
+            self.score = compute_similarity(self.counts, dim=dim,
+                                            out=self._get_score_out((n_terms, n_terms)))
 
         else:
             raise ValueError('Score type not understood.')
 
+        if isinstance(self.score, np.memmap):
+            self.score.flush()
+
         self.score_info['type'] = score_type
         if score_type in ['normalize', 'similarity']:
             self.score_info['dim'] = dim
@@ -414,6 +523,40 @@ class Counts():
         self.score_info = {}
 
 
+    def to_memmap(self, directory):
+        """Move the count and score data to memory mapped files.
+
+        Parameters
+        ----------
+        directory : str or Path
+            Folder to save the memory mapped files to.
+
+        Notes
+        -----
+        The co-occurrence data is saved to 'counts.npy', and any computed score to 'score.npy',
+        in the '.npy' format, and both are then memory mapped, such that data is only read
+        from disk when it is accessed. Afterwards, computed scores are written to 'score.npy',
+        and dropping data rewrites 'counts.npy', such that the full matrices are never loaded
+        into memory. Objects loaded with `load_object` are already memory mapped, but read-only.
+
+        Examples
+        --------
+        Memory map the data of a saved object, such that scores are computed to file:
+
+        >>> from lisc.io import load_object
+        >>> counts = load_object('counts') # doctest: +SKIP
+        >>> counts.to_memmap('counts_memmap') # doctest: +SKIP
+        >>> counts.compute_score('association') # doctest: +SKIP
+        """
+
+        self.memmap_dir = Path(directory)
+        self.memmap_dir.mkdir(parents=True, exist_ok=True)
+
+        self.counts = _save_memmap(self.counts, self.memmap_dir / 'counts.npy')
+        if self.score.size > 0:
+            self.score = _save_memmap(self.score, self.memmap_dir / 'score.npy')
+
+
     def check_top(self, dim='A'):
         """Check the terms with the most articles.
 
@@ -583,7 +726,8 @@ class Counts():
             if value == 'count':
                 drop_inds = np.where(self.terms[dim].counts < n_articles)[0]
             elif value == 'coocs':
-                drop_inds = list(np.where(np.all(self.counts < n_articles, dim_inds[dim]))[0])
+                drop_inds = list(np.where(\
+                    _all_below(self.counts, n_articles, dim_inds[dim]))[0])
 
             self._drop_terms(drop_inds, dim)
 
@@ -635,4 +779,66 @@ class Counts():
             inds[dim] = keep_inds
 
         # Drop raw count data for terms without enough data
-        self.counts = self.counts[inds['A'], inds['B']]
+        if self.memmap_dir:
+            self.counts = _save_memmap(self.counts, self.memmap_dir / 'counts.npy',
+                                       inds['A'], inds['B'])
+        else:
+            self.counts = self.counts[inds['A'], inds['B']]
+
+
+    def _get_score_out(self, shape):
+        """Get the output array for a score, as a memory mapped file, if the object is."""
+
+        if not self.memmap_dir:
+            return None
+
+        return np.lib.format.open_memmap(self.memmap_dir / 'score.npy', mode='w+',
+                                         dtype=float, shape=shape)
+
+
+def _save_memmap(data, file_path, row_inds=np.s_[:], col_inds=np.s_[:]):
+    """Save a selection of a 2d array to a '.npy' file, in chunks, and memory map it.
+
+    Parameters
+    ----------
+    data : 2d array
+        Data to save, which may itself be memory mapped, including from `file_path`.
+    file_path : Path
+        Path of the file to save to.
+    row_inds, col_inds : slice or array of int, optional
+        Indices of the rows and columns to save. Defaults to all rows and columns.
+
+    Returns
+    -------
+    np.memmap
+        The saved data, memory mapped read-only.
+    """
+
+    row_inds = np.arange(data.shape[0])[row_inds].ravel()
+    col_inds = np.arange(data.shape[1])[col_inds].ravel()
+
+    # Write to a temporary file, as the data may be memory mapped from the target file
+    temp_path = file_path.with_suffix('.tmp.npy')
+    out = np.lib.format.open_memmap(temp_path, mode='w+', dtype=data.dtype,
+                                    shape=(len(row_inds), len(col_inds)))
+    for chunk in get_chunks(len(row_inds), CHUNK_SIZE):
+        out[chunk] = data[row_inds[chunk]][:, col_inds]
+    out.flush()
+    del out
+
+    os.replace(temp_path, file_path)
+
+    return np.load(file_path, mmap_mode='r')
+
+
+def _all_below(data, threshold, axis):
+    """Check if all values are below a threshold along an axis, processing rows in chunks."""
+
+    below = np.ones(data.shape[1 - axis], dtype=bool)
+    for chunk in get_chunks(data.shape[0], CHUNK_SIZE):
+        if axis == 1:
+            below[chunk] = np.all(data[chunk] < threshold, 1)
+        else:
+            below &= np.all(data[chunk] < threshold, 0)
+
+    return below
@@ -0,0 +1,462 @@
+"""Split the collection of co-occurrence data into shards, to be collected by independent workers.
+
+Notes
+-----
+Coordination between workers is done through files, in a shard folder within the 'counts'
+folder of the database, which can be on a shared filesystem:
+
+- 'manifest.json' defines the terms, settings and shards of the collection.
+- 'shard_<ind>.lock' is created, exclusively, by the worker that claims a shard.
+- 'shard_<ind>.npz' and 'shard_<ind>.json' hold the collected data and meta data of a shard.
+"""
+
+import os
+import time
+import socket
+
+import numpy as np
+
+from lisc.data.term import Term
+from lisc.data.meta_data import MetaData
+from lisc.requester import Requester
+from lisc.requester.metrics import combine_metrics
+from lisc.io.io import save_json, load_json
+from lisc.io.db import check_directory
+from lisc.io.utils import check_ext
+from lisc.objects.counts import Counts
+from lisc.collect.info import get_db_info
+from lisc.collect.counts import make_counts_urls, get_count
+from lisc.urls.eutils import get_wait_time
+
+###################################################################################################
+###################################################################################################
+
+def make_shards(counts, n_shards, directory=None, label='shards', db='pubmed', field='TIAB',
+                **eutils_kwargs):
+    """Split the collection of co-occurrence data into shards, saving out a job manifest.
+
+    Parameters
+    ----------
+    counts : Counts
+        Object with the search terms to collect co-occurrence data for.
+    n_shards : int
+        The number of shards to split the collection into.
+    directory : str or SCDB, optional
+        Folder or database object specifying the save location.
+    label : str, optional, default: 'shards'
+        Label for the collection, used as the name of the shard folder.
+    db : str, optional, default: 'pubmed'
+        Which database to access from EUtils.
+    field : str, optional, default: 'TIAB'
+        Field to search for term within.
+    **eutils_kwargs
+        Additional settings for the EUtils API.
+
+    Returns
+    -------
+    manifest : dict
+        The job manifest, defining the terms, settings and shards of the collection.
+
+    Notes
+    -----
+    Shards are defined as contiguous ranges of terms in the first list, with the ranges
+    chosen so that each shard has a similar number of requests. Each shard collects the
+    count of each of its terms, and their co-occurrences with all terms in the second list
+    (or, for a single list of terms, with each subsequent term). If there are two lists of
+    terms, each shard also collects the counts for a range of terms in the second list.
+
+    Examples
+    --------
+    Split the collection of co-occurrence data for a set of terms into two shards:
+
+    >>> from lisc.objects import Counts
+    >>> from tempfile import TemporaryDirectory
+    >>> counts = Counts()
+    >>> counts.add_terms(['frontal lobe', 'temporal lobe', 'parietal lobe', 'occipital lobe'])
+    >>> with TemporaryDirectory() as dirpath:
+    ...     manifest = make_shards(counts, 2, directory=dirpath)
+    >>> [shard['a_inds'] for shard in manifest['shards']]
+    [[0, 1], [1, 4]]
+    """
+
+    square = not counts.terms['B'].has_terms
+    dims = ['A'] if square else ['A', 'B']
+
+    n_terms_a = counts.terms['A'].n_terms
+    n_terms_b = n_terms_a if square else counts.terms['B'].n_terms
+
+    # Get the number of requests per term in the first list, and define the shards from this
+    n_requests = 1 + (np.arange(n_terms_a)[::-1] if square else np.full(n_terms_a, n_terms_b))
+    a_bounds = get_shard_bounds(n_requests, n_shards)
+    b_bounds = [0] * (n_shards + 1) if square else \
+        get_shard_bounds(np.ones(n_terms_b, dtype=int), n_shards)
+
+    shards = []
+    for ind in range(n_shards):
+        shards.append({
+            'shard' : ind,
+            'a_inds' : [int(a_bounds[ind]), int(a_bounds[ind + 1])],
+            'b_inds' : [int(b_bounds[ind]), int(b_bounds[ind + 1])],
+            'n_requests' : int(n_requests[a_bounds[ind]:a_bounds[ind + 1]].sum() + \
+                b_bounds[ind + 1] - b_bounds[ind])})
+
+    settings = {'db' : db, 'field' : field}
+    settings.update(eutils_kwargs)
+
+    manifest = {
+        'label' : label,
+        'square' : square,
+        'n_shards' : n_shards,
+        'n_requests' : sum(shard['n_requests'] for shard in shards),
+        'settings' : settings,
+        'terms' : {dim : _get_terms_info(counts.terms[dim]) for dim in dims},
+        'shards' : shards,
+    }
+
+    folder = get_shard_folder(directory, label)
+    folder.mkdir(parents=True, exist_ok=True)
+    save_json(manifest, 'manifest', folder)
+
+    return manifest
+
+
+def collect_shard(shard=None, directory=None, label='shards', api_key=None, logging=None,
+                  verbose=False):
+    """Collect the co-occurrence data for a shard of a collection.
+
+    Parameters
+    ----------
+    shard : int, optional
+        Index of the shard to collect. If not provided, the next unclaimed shard is collected.
+    directory : str or SCDB, optional
+        Folder or database object specifying the location of the collection.
+    label : str, optional, default: 'shards'
+        Label for the collection, as used when making the shards.
+    api_key : str, optional
+        An API key for a NCBI account.
+    logging : {None, 'print', 'store', 'file'} or Requester, optional
+        What kind of logging, if any, to do for requested URLs.
+    verbose : bool, optional, default: False
+        Whether to print out updates.
+
+    Returns
+    -------
+    shard : int or None
+        Index of the shard that was collected, or None if there were no unclaimed shards.
+
+    Notes
+    -----
+    A shard is claimed by creating its lock file, which fails if the file already exists, such
+    that each shard is only collected once, across workers. Shards given by index are collected
+    regardless of any lock, which can be used to re-run shards from workers that failed.
+
+    Examples
+    --------
+    Collect shards, until all shards are claimed, assuming an :class:`~.SCDB` named 'lisc_db':
+
+    >>> from lisc.io import SCDB
+    >>> while collect_shard(directory=SCDB('lisc_db')) is not None: # doctest:+SKIP
+    ...     pass
+    """
+
+    folder = get_shard_folder(directory, label)
+    manifest = load_json('manifest', folder)
+
+    if shard is None:
+        shard = claim_shard(manifest['n_shards'], directory, label)
+        if shard is None:
+            return None
+
+    info = manifest['shards'][shard]
+    a_start, a_stop = info['a_inds']
+    b_start, b_stop = info['b_inds']
+    args_a = manifest['terms']['A']['args']
+    args_b = args_a if manifest['square'] else manifest['terms']['B']['args']
+
+    if verbose:
+        print('Collecting shard {}, with {} requests.'.format(shard, info['n_requests']))
+
+    meta_data = MetaData()
+    urls, settings = make_counts_urls(**manifest['settings'], api_key=api_key)
+    meta_data.add_settings(dict(settings, shard=shard))
+
+    req = logging if isinstance(logging, Requester) else \
+        Requester(wait_time=get_wait_time(urls.authenticated),
+                  logging=logging, directory=directory)
+
+    if shard == 0:
+        meta_data.add_db_info(get_db_info(req, urls.get_url('info')))
+
+    counts_a = np.ones(a_stop - a_start, dtype=int) * -1
+    counts_b = np.ones(b_stop - b_start, dtype=int) * -1
+    co_occurences = np.ones([a_stop - a_start, len(args_b)], dtype=int) * -1
+
+    template = urls.get_template('search', 'term')
+    template_ab = urls.get_template('search', 'term', '{}AND{}')
+
+    for a_ind in range(a_start, a_stop):
+
+        counts_a[a_ind - a_start] = get_count(req, template.format(args_a[a_ind]))
+
+        b_inds = range(a_ind + 1, len(args_b)) if manifest['square'] else range(len(args_b))
+        for b_ind in b_inds:
+            co_occurences[a_ind - a_start, b_ind] = \
+                get_count(req, template_ab.format(args_a[a_ind], args_b[b_ind]))
+
+    for b_ind in range(b_start, b_stop):
+        counts_b[b_ind - b_start] = get_count(req, template.format(args_b[b_ind]))
+
+    meta_data.add_requester(req, close=not isinstance(logging, Requester))
+
+    # Save out the data, via a temporary file, so that partial outputs are never loaded
+    temp_file = folder / get_shard_name(shard, '.tmp.npz')
+    np.savez(temp_file, counts_a=counts_a, counts_b=counts_b, co_occurences=co_occurences)
+    save_json(meta_data.as_dict(), get_shard_name(shard), folder)
+    os.replace(temp_file, folder / get_shard_name(shard, '.npz'))
+
+    return shard
+
+
+def merge_shards(directory=None, label='shards'):
+    """Merge the collected shards of a collection into a Counts object.
+
+    Parameters
+    ----------
+    directory : str or SCDB, optional
+        Folder or database object specifying the location of the collection.
+    label : str, optional, default: 'shards'
+        Label for the collection, as used when making the shards.
+
+    Returns
+    -------
+    counts : Counts
+        Object with the merged co-occurrence data, and combined meta data.
+
+    Raises
+    ------
+    ValueError
+        If any shards have not been collected.
+
+    Examples
+    --------
+    Merge the collected shards, assuming an :class:`~.SCDB` organization named 'lisc_db':
+
+    >>> from lisc.io import SCDB
+    >>> counts = merge_shards(directory=SCDB('lisc_db')) # doctest:+SKIP
+    """
+
+    folder = get_shard_folder(directory, label)
+    manifest = load_json('manifest', folder)
+
+    status = get_shard_status(directory, label)
+    if status['collected'] != list(range(manifest['n_shards'])):
+        raise ValueError('Not all shards have been collected - cannot merge.')
+
+    counts = Counts()
+    for dim, terms_info in manifest['terms'].items():
+        counts.add_terms([Term(*term) for term in zip(terms_info['labels'], terms_info['terms'],
+                                                      terms_info['inclusions'],
+                                                      terms_info['exclusions'])], dim=dim)
+        counts.terms[dim].set_joiners(**terms_info['joiners'])
+
+    counts.square = manifest['square']
+    n_terms_a = counts.terms['A'].n_terms
+    n_terms_b = n_terms_a if counts.square else counts.terms['B'].n_terms
+    counts.counts = np.ones([n_terms_a, n_terms_b], dtype=int) * -1
+    if not counts.square:
+        counts.terms['B'].counts = np.ones(n_terms_b, dtype=int) * -1
+
+    all_meta_data = []
+    for info in manifest['shards']:
+
+        (a_start, a_stop), (b_start, b_stop) = info['a_inds'], info['b_inds']
+        with np.load(folder / get_shard_name(info['shard'], '.npz')) as data:
+            counts.counts[a_start:a_stop, :] = data['co_occurences']
+            counts.terms['A'].counts[a_start:a_stop] = data['counts_a']
+            if not counts.square:
+                counts.terms['B'].counts[b_start:b_stop] = data['counts_b']
+
+        meta_data = MetaData()
+        meta_data.from_dict(load_json(get_shard_name(info['shard']), folder))
+        all_meta_data.append(meta_data)
+
+    if counts.square:
+        counts.counts = np.maximum(counts.counts, counts.counts.T)
+        np.fill_diagonal(counts.counts, 0)
+
+    counts.meta_data = _combine_meta_data(all_meta_data, manifest)
+
+    return counts
+
+
+def claim_shard(n_shards, directory=None, label='shards'):
+    """Claim the next unclaimed shard of a collection, by creating its lock file.
+
+    Parameters
+    ----------
+    n_shards : int
+        The number of shards in the collection.
+    directory : str or SCDB, optional
+        Folder or database object specifying the location of the collection.
+    label : str, optional, default: 'shards'
+        Label for the collection.
+
+    Returns
+    -------
+    shard : int or None
+        Index of the claimed shard, or None if all shards have been claimed.
+    """
+
+    folder = get_shard_folder(directory, label)
+
+    for shard in range(n_shards):
+        try:
+            lock = os.open(folder / get_shard_name(shard, '.lock'),
+                           os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            continue
+        with os.fdopen(lock, 'w') as f_obj:
+            f_obj.write('{} {} {}'.format(socket.gethostname(), os.getpid(), time.time()))
+        return shard
+
+    return None
+
+
+def get_shard_status(directory=None, label='shards'):
+    """Get the status of each shard of a collection.
+
+    Parameters
+    ----------
+    directory : str or SCDB, optional
+        Folder or database object specifying the location of the collection.
+    label : str, optional, default: 'shards'
+        Label for the collection.
+
+    Returns
+    -------
+    status : dict
+        Indices of the shards that are 'unclaimed', 'claimed' (but not yet collected),
+        and 'collected'.
+    """
+
+    folder = get_shard_folder(directory, label)
+    manifest = load_json('manifest', folder)
+
+    status = {'unclaimed' : [], 'claimed' : [], 'collected' : []}
+    for shard in range(manifest['n_shards']):
+        if (folder / get_shard_name(shard, '.npz')).exists():
+            status['collected'].append(shard)
+        elif (folder / get_shard_name(shard, '.lock')).exists():
+            status['claimed'].append(shard)
+        else:
+            status['unclaimed'].append(shard)
+
+    return status
+
+
+def get_shard_bounds(n_requests, n_shards):
+    """Split a sequence of items into contiguous ranges with similar numbers of requests.
+
+    Parameters
+    ----------
+    n_requests : 1d array of int
+        The number of requests for each item.
+    n_shards : int
+        The number of ranges to split the items into.
+
+    Returns
+    -------
+    bounds : 1d array of int
+        The start and stop indices of the ranges, with shard `ind` covering
+        ``bounds[ind]:bounds[ind + 1]``.
+
+    Examples
+    --------
+    Split 6 items, with decreasing numbers of requests, into 3 ranges:
+
+    >>> import numpy as np
+    >>> get_shard_bounds(np.array([6, 5, 4, 3, 2, 1]), 3)
+    array([0, 1, 3, 6])
+    """
+
+    cumulative = np.concatenate([[0], np.cumsum(n_requests)])
+    targets = np.linspace(0, cumulative[-1], n_shards + 1)
+
+    # Place each bound at the item boundary with the closest cumulative number of requests
+    inds = np.clip(np.searchsorted(cumulative, targets), 1, len(cumulative) - 1)
+    bounds = np.where(targets - cumulative[inds - 1] < cumulative[inds] - targets, inds - 1, inds)
+    bounds[0], bounds[-1] = 0, len(n_requests)
+
+    return np.maximum.accumulate(bounds)
+
+
+def get_shard_folder(directory=None, label='shards'):
+    """Get the path to the shard folder of a collection.
+
+    Parameters
+    ----------
+    directory : str or SCDB, optional
+        Folder or database object specifying the location of the collection.
+    label : str, optional, default: 'shards'
+        Label for the collection.
+
+    Returns
+    -------
+    Path
+        Path to the shard folder.
+    """
+
+    return check_directory(directory, 'counts') / label
+
+
+def get_shard_name(shard, ext=''):
+    """Get the file name for a shard.
+
+    Parameters
+    ----------
+    shard : int
+        Index of the shard.
+    ext : str, optional
+        Extension to add to the file name.
+
+    Returns
+    -------
+    str
+        The file name.
+    """
+
+    return check_ext('shard_{:04d}'.format(shard), ext) if ext else 'shard_{:04d}'.format(shard)
+
+
+def _get_terms_info(base):
+    """Get the information needed to reconstruct, and to search for, a set of terms."""
+
+    return {'terms' : base.terms, 'inclusions' : base.inclusions,
+            'exclusions' : base.exclusions, 'labels' : base.labels,
+            'joiners' : base._joiners,
+            'args' : [base.make_search_term(ind) for ind in range(base.n_terms)]}
+
+
+def _combine_meta_data(all_meta_data, manifest):
+    """Combine the meta data from each shard of a collection."""
+
+    meta_data = MetaData()
+    meta_data.add_settings(dict(manifest['settings'], n_shards=manifest['n_shards']))
+
+    db_info = [cmeta.db_info for cmeta in all_meta_data if cmeta.db_info]
+    if db_info:
+        meta_data.add_db_info(db_info[0])
+
+    requesters = [cmeta.requester for cmeta in all_meta_data]
+    meta_data.add_requester({
+        'n_requests' : sum(requester['n_requests'] for requester in requesters),
+        'wait_time' : requesters[0]['wait_time'],
+        'start_time' : requesters[0]['start_time'],
+        'end_time' : requesters[-1]['end_time'],
+        'logging' : requesters[0]['logging']})
+
+    metrics = [cmeta.metrics for cmeta in all_meta_data if cmeta.metrics]
+    if metrics:
+        meta_data.add_metrics(combine_metrics(metrics))
+
+    return meta_data
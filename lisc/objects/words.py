@@ -1,9 +1,14 @@
 """Class for LISC word analysis: analyses of text data."""
 
+from concurrent.futures import ProcessPoolExecutor
+
 from lisc.collect import collect_words
 from lisc.objects.base import Base
 from lisc.utils.base import get_max_length
 from lisc.data.articles_all import ArticlesAll
+from lisc.data.cache import touch_articles
+from lisc.analysis.matrix import (get_tokens, build_vocabulary, make_document_term_matrix,
+                                  compute_tfidf, compute_term_similarity)
 
 ###################################################################################################
 ###################################################################################################
@@ -23,6 +28,12 @@ class Words(Base):
         Results for each search term combined across individual articles.
     meta_data : MetaData
         Meta data information about the data collection.
+
+    Notes
+    -----
+    Document-term matrices are cached on the object once computed.
+    The cache is cleared when results are added, processed, or dropped,
+    and is not included when the object is copied or pickled.
     """
 
     def __init__(self):
@@ -33,6 +44,28 @@ class Words(Base):
         self.results = list()
         self.combined_results = list()
         self.meta_data = None
+        self._matrices = dict()
+
+
+    def __getstate__(self):
+        """Get the state of the object for copying and pickling, dropping any cached matrices."""
+
+        state = self.__dict__.copy()
+        state.pop('_matrices', None)
+
+        return state
+
+
+    def __setstate__(self, state):
+        """Set the state of the object when unpickling, with an empty cache of matrices.
+
+        Notes
+        -----
+        Objects pickled by earlier versions, without a cache of matrices, can also be loaded.
+        """
+
+        self.__dict__.update(state)
+        self._matrices = dict()
 
 
     def __getitem__(self, label):
@@ -57,14 +90,14 @@ class Words(Base):
         except ValueError:
             raise IndexError('Requested label not available.')
 
-        return self.results[ind]
+        return self._touch(self.results[ind])
 
 
     def __iter__(self):
         """Allow for iterating across the object by stepping through collected results."""
 
         for result in self.results:
-            yield result
+            yield self._touch(result)
 
 
     @property
@@ -85,11 +118,12 @@ class Words(Base):
 
         self.results.append(new_result)
         self._add_term(new_result.term)
+        self._matrices = dict()
 
 
     def run_collection(self, db='pubmed', retmax=None, field='TIAB', usehistory=False,
                        api_key=None, save_and_clear=False, logging=None,
-                       directory=None, verbose=False, **eutils_kwargs):
+                       directory=None, verbose=False, hooks=None, **eutils_kwargs):
         """Collect words data.
 
         Parameters
@@ -113,6 +147,9 @@ class Words(Base):
             Folder or database object specifying the save location for any outputs.
         verbose : bool, optional, default: False
             Whether to print out updates.
+        hooks : dict, optional
+            Functions to call with updates during the collection, with hook names as keys.
+            See `collect_words` for the available hooks.
         **eutils_kwargs
             Additional settings for the EUtils API.
 
@@ -131,7 +168,9 @@ class Words(Base):
                                                      usehistory=usehistory, api_key=api_key,
                                                      save_and_clear=save_and_clear,
                                                      logging=logging, directory=directory,
-                                                     verbose=verbose, **eutils_kwargs)
+                                                     hooks=hooks, verbose=verbose,
+                                                     **eutils_kwargs)
+        self._matrices = dict()
 
 
     def check_data(self):
@@ -182,8 +221,10 @@ class Words(Base):
             self.drop_term(ind)
             self.results.pop(ind)
 
+        self._matrices = dict()
+
 
-    def process_articles(self, process_func=None):
+    def process_articles(self, process_func=None, n_jobs=1, batch_size=1000):
         """Process the articles stored in the object.
 
         Parameters
@@ -191,19 +232,49 @@ class Words(Base):
         process_func : callable, optional
             A function to process article data. Must take as input an `Articles` object.
             If not provided, applies the default `process_articles` function.
+        n_jobs : int, optional, default: 1
+            The number of worker processes to use to process articles.
+            If 1, articles are processed serially. If -1, uses all available cores.
+        batch_size : int, optional, default: 1000
+            The number of articles per batch sent to each worker process.
+            Only used if `n_jobs` is not 1.
+
+        Notes
+        -----
+        If processing in parallel, `process_func` must be picklable, for example, defined at
+        the top level of a module, and should process each article independently.
+        The results are identical to processing serially.
         """
 
-        for arts in self.results:
-            arts.process(process_func)
+        if n_jobs == 1:
+            for arts in self.results:
+                arts.process(process_func)
+
+        else:
+            with ProcessPoolExecutor(None if n_jobs == -1 else n_jobs) as executor:
+                for arts in self.results:
+                    arts.process(process_func, executor=executor, batch_size=batch_size)
 
+        self._matrices = dict()
 
-    def process_combined_results(self, exclusions=None):
+
+    def process_combined_results(self, exclusions=None, n_jobs=1, batch_size=1000,
+                                 max_words=None):
         """Process article data to create combined results, across all articles, for each term.
 
         Parameters
         ----------
         exclusions : list of str, optional
             Words to exclude from the combined word collections.
+        n_jobs : int, optional, default: 1
+            The number of worker processes to use to process and count articles.
+            If 1, articles are processed serially. If -1, uses all available cores.
+        batch_size : int, optional, default: 1000
+            The number of articles per batch sent to each worker process.
+            Only used if `n_jobs` is not 1.
+        max_words : int, optional
+            If provided, the maximum number of words to track for each term.
+            Word counts are then approximate, with bounded memory use.
 
         Notes
         -----
@@ -213,4 +284,101 @@ class Words(Base):
         if not self.has_data:
             raise ValueError('Object has no data - cannot proceed.')
 
-        self.combined_results = [ArticlesAll(result, exclusions) for result in self.results]
+        if n_jobs == 1:
+            self.combined_results = [ArticlesAll(result, exclusions, max_words=max_words)
+                                     for result in self.results]
+
+        else:
+            with ProcessPoolExecutor(None if n_jobs == -1 else n_jobs) as executor:
+                self.combined_results = [ArticlesAll(result, exclusions, executor, batch_size,
+                                                     max_words) for result in self.results]
+
+
+    def get_document_term_matrix(self, field='words', min_df=1, weighting='tfidf'):
+        """Get a sparse document-term matrix across all articles, for all terms.
+
+        Parameters
+        ----------
+        field : {'words', 'titles', 'keywords'}, optional
+            Article data field to build the matrix from.
+        min_df : int, optional, default: 1
+            The minimum number of articles a word must occur in to be included.
+        weighting : {'tfidf', 'counts'}, optional
+            How to weight the matrix, as either normalized TF-IDF weights, or raw word counts.
+
+        Returns
+        -------
+        dtm : scipy.sparse.csr_matrix
+            Document-term matrix, with shape [n_articles, n_words].
+        vocab : list of str
+            The word for each column of the matrix.
+        doc_terms : 1d array of int
+            The index of the search term that each row of the matrix was collected for.
+
+        Notes
+        -----
+        Matrices are computed once, and cached on the object, per set of settings.
+        This requires the optional dependency `scipy`.
+
+        Examples
+        --------
+        Get the TF-IDF weighted matrix, for words in at least 5 articles:
+
+        >>> dtm, vocab, doc_terms = words.get_document_term_matrix(min_df=5) # doctest: +SKIP
+        """
+
+        if not self.has_data:
+            raise ValueError('Object has no data - cannot proceed.')
+
+        if weighting not in ['tfidf', 'counts']:
+            raise ValueError('Weighting not understood.')
+
+        key = (field, min_df, weighting)
+        if key not in self._matrices:
+
+            counts_key = (field, min_df, 'counts')
+            if counts_key not in self._matrices:
+                tokens, doc_terms = get_tokens(self, field)
+                vocab = build_vocabulary(tokens, min_df)
+                self._matrices[counts_key] = \
+                    (make_document_term_matrix(tokens, vocab), list(vocab), doc_terms)
+
+            if weighting == 'tfidf':
+                dtm, vocab, doc_terms = self._matrices[counts_key]
+                self._matrices[key] = (compute_tfidf(dtm), vocab, doc_terms)
+
+        return self._matrices[key]
+
+
+    def compute_similarity(self, field='words', min_df=1):
+        """Compute the similarity between search terms, based on the words in their articles.
+
+        Parameters
+        ----------
+        field : {'words', 'titles', 'keywords'}, optional
+            Article data field to compare terms on.
+        min_df : int, optional, default: 1
+            The minimum number of articles a word must occur in to be included.
+
+        Returns
+        -------
+        similarity : 2d array
+            Cosine similarity between the TF-IDF weighted words of each pair of search terms.
+
+        Examples
+        --------
+        Compute the similarity between terms, based on the words in their abstracts:
+
+        >>> similarity = words.compute_similarity() # doctest: +SKIP
+        """
+
+        dtm, _, doc_terms = self.get_document_term_matrix(field, min_df, 'tfidf')
+
+        return compute_term_similarity(dtm, doc_terms, len(self.results))
+
+
+    @staticmethod
+    def _touch(result):
+        """Mark a result as recently used, if it is tracked by a cache of lazily loaded data."""
+
+        return touch_articles(result)
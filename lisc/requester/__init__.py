@@ -1,3 +1,8 @@
 """Requester object and associated functionality."""
 
 from .requester import Requester
+from .asynchronous import AsyncRequester
+from .replay import ReplayServer
+from .metrics import RequestMetrics
+from .keys import KeyPool
+from .logs import RequestLog
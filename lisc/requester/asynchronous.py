@@ -0,0 +1,317 @@
+"""Object for handling URL requests asynchronously."""
+
+import time
+import asyncio
+
+from lisc.requester.requester import BaseRequester, RETRY_CODES, MEMO_SIZE
+from lisc.urls.utils import FORM_HEADERS
+from lisc.modutils.dependencies import safe_import
+
+aiohttp = safe_import('aiohttp')
+
+###################################################################################################
+###################################################################################################
+
+class AsyncRequester(BaseRequester):
+    """Object to handle URL requests asynchronously, from an asyncio event loop.
+
+    Attributes
+    ----------
+    is_active : bool
+        Status of the requester, reflecting whether it is currently being used to make requests.
+    n_requests : int
+        Number of requests that have been made from this object.
+    wait_time : float
+        Amount of time to wait between requests, in seconds.
+    start_time : str
+        Time when request session started.
+    end_time : str
+        Time when request session ended.
+    time_last_req : float
+        Time at which last request was sent.
+    logging : {None, 'print', 'store', 'file', 'jsonl'}
+        What kind of logging, if any, to do for requested URLs.
+    log : None or list or FileObject or RequestLog
+        Log of requested URLs. Format depends on `logging`.
+    redirect : str or None
+        URL of a replay server that requests are redirected to, if any.
+    max_retries : int
+        Maximum number of times to retry a request that fails.
+    metrics : RequestMetrics
+        Timing and size metrics of the requests made from this object.
+    key_pool : KeyPool or None
+        Pool of API keys that requests are shared across, if any.
+    memoize : bool
+        Whether to memoize results that are parsed from requested URLs.
+    memo_size : int or None
+        Maximum number of results to memoize, or None for no limit.
+    n_memo_hits : int
+        Number of results that were retrieved from the memo, rather than requested.
+
+    Notes
+    -----
+    This object requires the optional dependency `aiohttp`.
+
+    Requests are throttled as for a ``Requester``, such that requests are launched at most
+    once per `wait_time`, across all concurrent requests. After the throttle, any number of
+    requests can be in flight at once, so the number of concurrent requests should be
+    bounded by the caller, for example with an ``asyncio.Semaphore``.
+
+    The HTTP session is opened on the first request, and should be closed after use,
+    with `close_session`, or by using the object as an asynchronous context manager.
+    Any session that is still open is also closed by `close`.
+    """
+
+    def __init__(self, wait_time=0., logging=None, directory=None, redirect=None,
+                 max_retries=0, key_pool=None, memoize=False, memo_size=MEMO_SIZE):
+        """Initialize an asynchronous requester object.
+
+        Parameters
+        ----------
+        wait_time : float, optional, default: 0.0
+            Amount of time to wait between requests, in seconds.
+        logging : {None, 'print', 'store', 'file', 'jsonl'} or RequestLog, optional
+            What kind of logging, if any, to do for requested URLs.
+        directory : SCDB or str or None, optional
+            A string or object containing a file path, used for logging.
+        redirect : str, optional
+            URL of a replay server to redirect requests to, such as a running ``ReplayServer``.
+        max_retries : int, optional, default: 0
+            Maximum number of times to retry a request that fails.
+        key_pool : KeyPool, optional
+            Pool of API keys to share requests across.
+        memoize : bool, optional, default: False
+            Whether to memoize results that are parsed from requested URLs.
+        memo_size : int or None, optional, default: MEMO_SIZE
+            Maximum number of results to memoize, dropping the least recently used.
+
+        Examples
+        --------
+        Initialize an ``AsyncRequester`` object, with a wait time of 0.1 seconds:
+
+        >>> requester = AsyncRequester(wait_time=0.1)
+        """
+
+        BaseRequester.__init__(self, wait_time=wait_time, logging=logging, directory=directory,
+                               redirect=redirect, max_retries=max_retries, key_pool=key_pool,
+                               memoize=memoize, memo_size=memo_size)
+
+        self._async_lock = None
+        self._session = None
+        self._session_loop = None
+        self._close_task = None
+
+
+    async def __aenter__(self):
+
+        return self
+
+
+    async def __aexit__(self, *args):
+
+        await self.close_session()
+
+
+    async def throttle(self):
+        """Slow down rate of requests by waiting if a new request is initiated too soon.
+
+        Returns
+        -------
+        throttle_time : float
+            Time spent waiting, in seconds.
+        """
+
+        time_since_req = time.time() - self.time_last_req
+
+        throttle_time = 0.
+        if time_since_req < self.wait_time:
+            throttle_time = self.wait_time - time_since_req
+            await self.wait(throttle_time)
+
+        return throttle_time
+
+
+    @staticmethod
+    async def wait(wait_time):
+        """Pause for specified amount of time, without blocking the event loop.
+
+        Parameters
+        ----------
+        wait_time : float
+            Time to wait between launching URL requests, in seconds.
+        """
+
+        await asyncio.sleep(wait_time)
+
+
+    async def request_url(self, url, post=False):
+        """Request a URL.
+
+        Parameters
+        ----------
+        url : str
+            Web address to request.
+        post : bool, optional, default: False
+            Whether to make a POST request, sending the settings of the URL as form data.
+
+        Returns
+        -------
+        out : Response
+            Object containing the requested web page.
+
+        Examples
+        --------
+        Use an ``AsyncRequester`` object to request the LISC Github repository url:
+
+        >>> import asyncio
+        >>> async def request():
+        ...     async with AsyncRequester() as requester:
+        ...         return await requester.request_url('https://github.com/lisc-tools/lisc')
+        >>> response = asyncio.run(request()) # doctest:+SKIP
+        """
+
+        if not self.is_active:
+            raise ValueError('Requester object is not active.')
+
+        request_url, data = self._make_request(url, post=post)
+
+        for retry in range(self.max_retries + 1):
+
+            if self._key_pool is not None:
+                key, throttle_time = await self.acquire_key()
+                self._metrics.add_throttle(throttle_time)
+                request_url, data = self._make_request(url, key, post)
+
+            # Throttling is locked, so that it is consistent across concurrent requests
+            async with self._get_lock():
+                throttle_time = await self.throttle()
+                self._log_url(url)
+                self.time_last_req = time.time()
+                self.n_requests += 1
+            self._metrics.add_throttle(throttle_time)
+
+            start, out = time.perf_counter(), None
+            try:
+                session = self._get_session()
+                request = session.post(request_url, data=data, headers=FORM_HEADERS) \
+                    if post else session.get(request_url)
+                async with request as response:
+                    out = Response(url, response.status, dict(response.headers),
+                                   await response.read())
+            except aiohttp.ClientConnectionError:
+                if retry == self.max_retries:
+                    raise
+            finally:
+                self._record_request(url, out, time.perf_counter() - start, post, retry)
+
+            if out is not None and out.status_code not in RETRY_CODES:
+                break
+
+            if retry < self.max_retries:
+                self._metrics.add_retry()
+                await self.wait(self._get_retry_time(out, retry))
+
+        if self._on_request:
+            self._on_request(url, out)
+
+        return out
+
+
+    async def acquire_key(self):
+        """Take a request token from the key pool, without blocking the event loop.
+
+        Returns
+        -------
+        key : str
+            The key to use for the request.
+        throttle_time : float
+            Time spent waiting for a key to have capacity, in seconds.
+        """
+
+        throttle_time = 0.
+        key, wait_time = self._key_pool.try_acquire()
+        while key is None:
+            await self.wait(wait_time)
+            throttle_time += wait_time
+            key, wait_time = self._key_pool.try_acquire()
+
+        self._key_pool.add_throttle(key, throttle_time)
+
+        return key, throttle_time
+
+
+    def close(self):
+        """Set the current object as inactive, closing the HTTP session, if open.
+
+        Notes
+        -----
+        If called from within a running event loop, the session is closed in a task on the loop.
+        Otherwise, the session is closed from the event loop it was opened in, if that loop is
+        still open, or else from a new event loop.
+        """
+
+        if self._session is not None:
+
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+
+            if loop is not None:
+                self._close_task = loop.create_task(self.close_session())
+            elif not self._session_loop.is_closed():
+                self._session_loop.run_until_complete(self.close_session())
+            else:
+                asyncio.run(self.close_session())
+
+        BaseRequester.close(self)
+
+
+    async def close_session(self):
+        """Close the HTTP session, if open."""
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+    def _get_lock(self):
+        """Get the lock used for throttling, creating it from within the running event loop."""
+
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+
+        return self._async_lock
+
+
+    def _get_session(self):
+        """Get the HTTP session, opening it from within the running event loop."""
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+            self._session_loop = asyncio.get_running_loop()
+
+        return self._session
+
+
+class Response():
+    """A requested web page, with the same attributes used from a ``requests`` response.
+
+    Attributes
+    ----------
+    url : str
+        The requested URL.
+    status_code : int
+        Status code of the response.
+    headers : dict
+        Headers of the response.
+    content : bytes
+        Content of the response.
+    """
+
+    def __init__(self, url, status_code, headers, content):
+
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
@@ -0,0 +1,254 @@
+"""Object for sharing requests across a pool of API keys."""
+
+import re
+import time
+from threading import Lock
+
+###################################################################################################
+###################################################################################################
+
+class KeyPool():
+    """A pool of API keys, each with a token bucket to limit its rate of requests.
+
+    Attributes
+    ----------
+    rate : float
+        Maximum sustained number of requests per second, for each key.
+    burst : float
+        Maximum number of requests that can be launched at once, for each key.
+    usage : list of dict
+        Usage of each key, in the order of the pool, as the number of requests and the time
+        spent waiting for capacity, with the key masked for reporting.
+
+    Notes
+    -----
+    Each request is routed to the key with the most available capacity, such that the
+    total rate of requests scales with the number of keys, while each key stays within
+    its own rate limit. Keys can be used from multiple threads.
+
+    Keys should only be pooled if they are each legitimately held, and used in line
+    with the usage policies of the API they are for.
+    """
+
+    def __init__(self, keys, rate=10, burst=1):
+        """Initialize a KeyPool object.
+
+        Parameters
+        ----------
+        keys : list of str
+            The API keys to use.
+        rate : float, optional, default: 10
+            Maximum sustained number of requests per second, for each key.
+            The default is the rate limit for authenticated use of the EUtils API.
+        burst : float, optional, default: 1
+            Maximum number of requests that can be launched at once, for each key.
+
+        Examples
+        --------
+        Initialize a ``KeyPool`` object, for two keys:
+
+        >>> pool = KeyPool(['key_project_a', 'key_project_b'])
+        """
+
+        if not keys:
+            raise ValueError('At least one key is required.')
+        if len(set(keys)) != len(keys):
+            raise ValueError('Keys must be unique.')
+
+        self.keys = list(keys)
+        self.rate = rate
+        self.burst = burst
+
+        self._lock = Lock()
+        self._tokens = {key : float(burst) for key in self.keys}
+        self._inds = {key : ind for ind, key in enumerate(self.keys)}
+        self._time_update = time.monotonic()
+
+        # Usage is tracked by the index of each key, as masked keys are not necessarily unique
+        self.usage = [{'key' : mask_key(key), 'n_requests' : 0, 'throttle_time' : 0.} \
+            for key in self.keys]
+
+
+    def __len__(self):
+
+        return len(self.keys)
+
+
+    def try_acquire(self):
+        """Try to take a request token from the key with the most available capacity.
+
+        Returns
+        -------
+        key : str or None
+            The key to use for the request, or None if no key currently has capacity.
+        wait_time : float
+            If no key has capacity, the time until a key will have capacity, in seconds.
+
+        Examples
+        --------
+        Take a token from a pool with a single key:
+
+        >>> pool = KeyPool(['key_project_a'])
+        >>> pool.try_acquire()
+        ('key_project_a', 0.0)
+        """
+
+        with self._lock:
+
+            self._refill()
+            key = max(self.keys, key=self._tokens.get)
+
+            if self._tokens[key] >= 1:
+                self._tokens[key] -= 1
+                self.usage[self._inds[key]]['n_requests'] += 1
+                return key, 0.
+
+            return None, (1 - self._tokens[key]) / self.rate
+
+
+    def acquire(self):
+        """Take a request token from the key with the most available capacity, waiting if needed.
+
+        Returns
+        -------
+        key : str
+            The key to use for the request.
+        throttle_time : float
+            Time spent waiting for a key to have capacity, in seconds.
+
+        Examples
+        --------
+        Take tokens for two requests, from a pool with two keys:
+
+        >>> pool = KeyPool(['key_project_a', 'key_project_b'])
+        >>> key1, _ = pool.acquire()
+        >>> key2, _ = pool.acquire()
+        >>> key1 != key2
+        True
+        """
+
+        throttle_time = 0.
+        key, wait_time = self.try_acquire()
+        while key is None:
+            time.sleep(wait_time)
+            throttle_time += wait_time
+            key, wait_time = self.try_acquire()
+
+        self.add_throttle(key, throttle_time)
+
+        return key, throttle_time
+
+
+    def add_throttle(self, key, throttle_time):
+        """Record time spent waiting for capacity, to use a key.
+
+        Parameters
+        ----------
+        key : str
+            The key that was used.
+        throttle_time : float
+            Time spent waiting, in seconds.
+        """
+
+        with self._lock:
+            self.usage[self._inds[key]]['throttle_time'] += throttle_time
+
+
+    def as_dict(self):
+        """Get the usage of each key, labeled by the index of the key in the pool."""
+
+        with self._lock:
+            usage = {'key_' + str(ind) : dict(val) for ind, val in enumerate(self.usage)}
+
+        return usage
+
+
+    def _refill(self):
+        """Refill the token bucket of each key, based on the time since the last refill."""
+
+        now = time.monotonic()
+        n_tokens = (now - self._time_update) * self.rate
+        self._time_update = now
+
+        for key in self.keys:
+            self._tokens[key] = min(self._tokens[key] + n_tokens, self.burst)
+
+
+def mask_key(key, n_show=4):
+    """Mask an API key, for logging and reporting.
+
+    Parameters
+    ----------
+    key : str
+        The API key.
+    n_show : int, optional, default: 4
+        Number of characters to show, from the end of the key.
+
+    Returns
+    -------
+    str
+        The masked key.
+
+    Examples
+    --------
+    Mask an API key:
+
+    >>> mask_key('1234567890abcdef')
+    '****cdef'
+    """
+
+    return '****' + key[-n_show:] if len(key) > n_show else '****'
+
+
+def set_api_key(url, key):
+    """Set the API key of a URL, replacing any API key already in the URL.
+
+    Parameters
+    ----------
+    url : str
+        The URL.
+    key : str
+        The API key to set.
+
+    Returns
+    -------
+    str
+        The URL, with the API key set.
+
+    Examples
+    --------
+    Set the API key of an EUtils URL:
+
+    >>> url = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/einfo.fcgi?db=pubmed'
+    >>> set_api_key(url, 'abc123')
+    'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/einfo.fcgi?db=pubmed&api_key=abc123'
+    """
+
+    url = drop_api_key(url)
+
+    return url + ('&' if '?' in url else '?') + 'api_key=' + key
+
+
+def drop_api_key(url):
+    """Drop any API key from a URL.
+
+    Parameters
+    ----------
+    url : str
+        The URL.
+
+    Returns
+    -------
+    str
+        The URL, without any API key.
+
+    Examples
+    --------
+    Drop the API key from an EUtils URL:
+
+    >>> url = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/einfo.fcgi?api_key=abc123&db=pubmed'
+    >>> drop_api_key(url)
+    'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/einfo.fcgi?db=pubmed'
+    """
+
+    return re.sub(r'([&?])api_key=[^&]*&?', r'\1', url).rstrip('&?')
@@ -0,0 +1,214 @@
+"""Object for structured, buffered logging of URL requests."""
+
+import os
+import json
+import time
+import random
+from pathlib import Path
+from threading import Lock
+
+###################################################################################################
+###################################################################################################
+
+class RequestLog():
+    """A structured log of URL requests, written to a JSON lines file.
+
+    Attributes
+    ----------
+    file_path : Path
+        Path of the log file.
+    buffer_size : int
+        Maximum number of records to hold in memory before writing them to file.
+    max_bytes : int or None
+        Size of the log file, in bytes, above which it is rotated.
+    n_backups : int
+        Number of rotated log files to keep.
+    sample_rate : float
+        Proportion of successful requests to log.
+    n_records : int
+        Number of records that have been logged.
+    n_skipped : int
+        Number of requests that were not logged, due to sampling.
+
+    Notes
+    -----
+    Each record is a JSON object, on its own line, with the time the request completed,
+    the requested URL and method, the status code (None for connection errors), the
+    latency in seconds, the number of bytes downloaded, and the retry index.
+
+    Memory use is bounded by `buffer_size`, and disk use by `max_bytes` and `n_backups`.
+    When the log file exceeds `max_bytes`, it is renamed with a numbered suffix, such as
+    'requester_log.jsonl.1', and any older rotated files are shifted, dropping the oldest.
+
+    Requests that fail, with a status code other than 200, are always logged, regardless
+    of `sample_rate`.
+    """
+
+    def __init__(self, file_path, buffer_size=1000, max_bytes=100 * 2**20, n_backups=5,
+                 sample_rate=1., seed=None):
+        """Initialize a RequestLog object.
+
+        Parameters
+        ----------
+        file_path : str or Path
+            Path of the log file.
+        buffer_size : int, optional, default: 1000
+            Maximum number of records to hold in memory before writing them to file.
+        max_bytes : int or None, optional, default: 100 MiB
+            Size of the log file, in bytes, above which it is rotated.
+            If None, the file is not rotated.
+        n_backups : int, optional, default: 5
+            Number of rotated log files to keep.
+        sample_rate : float, optional, default: 1.
+            Proportion of successful requests to log, between 0 and 1.
+        seed : int, optional
+            Seed for the random generator used for sampling.
+
+        Examples
+        --------
+        Initialize a log that records 1% of successful requests, using a temporary directory:
+
+        >>> from tempfile import TemporaryDirectory
+        >>> with TemporaryDirectory() as dirpath:
+        ...     log = RequestLog(dirpath + '/requester_log.jsonl', sample_rate=0.01)
+        ...     log.close()
+        """
+
+        if not 0 <= sample_rate <= 1:
+            raise ValueError('Sample rate should be between 0 and 1.')
+
+        self.file_path = Path(file_path)
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self.n_backups = n_backups
+        self.sample_rate = sample_rate
+
+        self.n_records = 0
+        self.n_skipped = 0
+
+        self._buffer = []
+        self._random = random.Random(seed)
+        self._lock = Lock()
+
+
+    def __repr__(self):
+
+        return str(self.file_path)
+
+
+    def add_request(self, url, status_code, latency, n_bytes=0, method='GET', retry=0):
+        """Add a record of a request to the log.
+
+        Parameters
+        ----------
+        url : str
+            The requested URL.
+        status_code : int or None
+            Status code of the response, or None if no response was received.
+        latency : float
+            Time from launching the request to receiving the response, in seconds.
+        n_bytes : int, optional, default: 0
+            Number of bytes downloaded.
+        method : {'GET', 'POST'}, optional
+            The method of the request.
+        retry : int, optional, default: 0
+            The index of the retry, with 0 being the first attempt.
+        """
+
+        with self._lock:
+
+            if status_code == 200 and self._random.random() >= self.sample_rate:
+                self.n_skipped += 1
+                return
+
+            self._buffer.append(json.dumps(\
+                {'time' : round(time.time(), 3), 'url' : url, 'method' : method,
+                 'status' : status_code, 'latency' : round(latency, 4),
+                 'n_bytes' : n_bytes, 'retry' : retry}))
+            self.n_records += 1
+
+            if len(self._buffer) >= self.buffer_size:
+                self._flush()
+
+
+    def flush(self):
+        """Write any buffered records to file."""
+
+        with self._lock:
+            self._flush()
+
+
+    def close(self):
+        """Write any buffered records to file, and close the log."""
+
+        self.flush()
+
+
+    def _flush(self):
+        """Write any buffered records to file, rotating the file if needed."""
+
+        if not self._buffer:
+            return
+
+        lines = '\n'.join(self._buffer) + '\n'
+        self._buffer = []
+
+        if self.max_bytes and self.file_path.exists() and \
+            self.file_path.stat().st_size + len(lines) > self.max_bytes:
+            self._rotate()
+
+        with open(self.file_path, 'a') as f_obj:
+            f_obj.write(lines)
+
+
+    def _rotate(self):
+        """Rotate the log file, shifting any older rotated files and dropping the oldest."""
+
+        for ind in range(self.n_backups - 1, 0, -1):
+            older = self._get_backup_path(ind)
+            if older.exists():
+                os.replace(older, self._get_backup_path(ind + 1))
+
+        if self.n_backups > 0:
+            os.replace(self.file_path, self._get_backup_path(1))
+        else:
+            os.remove(self.file_path)
+
+
+    def _get_backup_path(self, ind):
+        """Get the path of a rotated log file."""
+
+        return self.file_path.with_name(self.file_path.name + '.' + str(ind))
+
+
+def load_request_log(file_path):
+    """Load the records of a request log.
+
+    Parameters
+    ----------
+    file_path : str or Path
+        Path of the log file.
+
+    Returns
+    -------
+    list of dict
+        The logged records.
+
+    Examples
+    --------
+    Load a request log, using a temporary directory:
+
+    >>> from tempfile import TemporaryDirectory
+    >>> with TemporaryDirectory() as dirpath:
+    ...     log = RequestLog(dirpath + '/requester_log.jsonl')
+    ...     log.add_request('https://www.google.com', 200, 0.1, 1024)
+    ...     log.close()
+    ...     records = load_request_log(dirpath + '/requester_log.jsonl')
+    >>> records[0]['status']
+    200
+    """
+
+    with open(file_path) as f_obj:
+        records = [json.loads(line) for line in f_obj if line.strip()]
+
+    return records
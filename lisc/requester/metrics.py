@@ -0,0 +1,280 @@
+"""Object for recording timing and size metrics of URL requests."""
+
+import json
+import time
+from threading import Lock
+from contextlib import contextmanager
+
+from lisc.io.db import check_directory
+from lisc.io.utils import check_ext
+
+###################################################################################################
+###################################################################################################
+
+# Upper bounds, in seconds, of the buckets of the request latency histogram
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1., 2.5, 5., 10.]
+
+class RequestMetrics():
+    """Object to record metrics about URL requests and the processing of their responses.
+
+    Attributes
+    ----------
+    n_requests : int
+        Number of requests that have been recorded.
+    n_bytes : int
+        Total number of bytes downloaded.
+    n_retries : int
+        Number of requests that were retried.
+    latency_time : float
+        Total time spent waiting for responses, in seconds.
+    latency_max : float
+        Longest time spent waiting for a response, in seconds.
+    latency_counts : list of int
+        Number of requests in each bucket of the latency histogram, with bucket
+        upper bounds given by `LATENCY_BUCKETS`, plus a final overflow bucket.
+    throttle_time : float
+        Total time spent waiting between requests due to throttling, in seconds.
+    parse_time : float
+        Total time spent parsing responses, in seconds.
+
+    Notes
+    -----
+    Metrics can be recorded from multiple threads.
+    """
+
+    def __init__(self):
+        """Initialize a RequestMetrics object.
+
+        Examples
+        --------
+        Initialize a ``RequestMetrics`` object:
+
+        >>> metrics = RequestMetrics()
+        """
+
+        self.n_requests = 0
+        self.n_bytes = 0
+        self.n_retries = 0
+
+        self.latency_time = 0.
+        self.latency_max = 0.
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+
+        self.throttle_time = 0.
+        self.parse_time = 0.
+
+        self._lock = Lock()
+
+
+    def add_request(self, latency, n_bytes=0):
+        """Record a completed request.
+
+        Parameters
+        ----------
+        latency : float
+            Time from launching the request to receiving the response, in seconds.
+        n_bytes : int, optional, default: 0
+            Number of bytes downloaded.
+        """
+
+        bucket = sum(latency > bound for bound in LATENCY_BUCKETS)
+
+        with self._lock:
+            self.n_requests += 1
+            self.n_bytes += n_bytes
+            self.latency_time += latency
+            self.latency_max = max(self.latency_max, latency)
+            self.latency_counts[bucket] += 1
+
+
+    def add_retry(self):
+        """Record that a request was retried."""
+
+        with self._lock:
+            self.n_retries += 1
+
+
+    def add_throttle(self, throttle_time):
+        """Record time spent waiting due to throttling.
+
+        Parameters
+        ----------
+        throttle_time : float
+            Time spent waiting, in seconds.
+        """
+
+        with self._lock:
+            self.throttle_time += throttle_time
+
+
+    def add_parse(self, parse_time):
+        """Record time spent parsing a response.
+
+        Parameters
+        ----------
+        parse_time : float
+            Time spent parsing, in seconds.
+        """
+
+        with self._lock:
+            self.parse_time += parse_time
+
+
+    @contextmanager
+    def time_parse(self):
+        """Context manager to record the time spent parsing a response.
+
+        Examples
+        --------
+        Record the time taken to parse a response:
+
+        >>> import json
+        >>> metrics = RequestMetrics()
+        >>> with metrics.time_parse():
+        ...     data = json.loads('{"count": 1}')
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_parse(time.perf_counter() - start)
+
+
+    def as_dict(self):
+        """Get the recorded metrics as a dictionary."""
+
+        with self._lock:
+            metrics = {key : val for key, val in self.__dict__.items() if not key.startswith('_')}
+            metrics['latency_counts'] = list(self.latency_counts)
+
+        metrics['latency_buckets'] = list(LATENCY_BUCKETS)
+        metrics['latency_mean'] = metrics['latency_time'] / metrics['n_requests'] \
+            if metrics['n_requests'] else 0.
+
+        return metrics
+
+
+    def save(self, file_name, directory=None, file_format='json'):
+        """Save out the recorded metrics, to a JSON or a Prometheus text file.
+
+        Parameters
+        ----------
+        file_name : str
+            File name to save out to.
+        directory : str or SCDB, optional
+            Folder or database object specifying the save location.
+        file_format : {'json', 'prometheus'}
+            The format to save out to. Prometheus text files, as read by the node exporter
+            textfile collector, are saved with the '.prom' extension.
+
+        Examples
+        --------
+        Save out metrics in the Prometheus text format, using a temporary directory:
+
+        >>> from tempfile import TemporaryDirectory
+        >>> metrics = RequestMetrics()
+        >>> with TemporaryDirectory() as dirpath:
+        ...     metrics.save('lisc_metrics', directory=dirpath, file_format='prometheus')
+        """
+
+        directory = check_directory(directory, 'logs')
+
+        if file_format == 'json':
+            with open(directory / check_ext(file_name, '.json'), 'w') as f_obj:
+                json.dump(self.as_dict(), f_obj)
+
+        elif file_format == 'prometheus':
+            with open(directory / check_ext(file_name, '.prom'), 'w') as f_obj:
+                f_obj.write(format_prometheus(self.as_dict()))
+
+        else:
+            raise ValueError('File format not understood.')
+
+
+def combine_metrics(all_metrics):
+    """Combine request metrics from multiple collections.
+
+    Parameters
+    ----------
+    all_metrics : list of dict
+        Request metrics, as returned by `RequestMetrics.as_dict`.
+
+    Returns
+    -------
+    metrics : dict
+        The combined request metrics.
+
+    Examples
+    --------
+    Combine the metrics from two requesters:
+
+    >>> metrics1, metrics2 = RequestMetrics(), RequestMetrics()
+    >>> metrics1.add_request(0.2, 1024)
+    >>> metrics2.add_request(0.4, 2048)
+    >>> combine_metrics([metrics1.as_dict(), metrics2.as_dict()])['n_bytes']
+    3072
+    """
+
+    metrics = RequestMetrics()
+    for cmetrics in all_metrics:
+        for key in ['n_requests', 'n_bytes', 'n_retries',
+                    'latency_time', 'throttle_time', 'parse_time']:
+            setattr(metrics, key, getattr(metrics, key) + cmetrics[key])
+        metrics.latency_max = max(metrics.latency_max, cmetrics['latency_max'])
+        metrics.latency_counts = [n1 + n2 for n1, n2 in \
+            zip(metrics.latency_counts, cmetrics['latency_counts'])]
+
+    return metrics.as_dict()
+
+
+def format_prometheus(metrics, prefix='lisc'):
+    """Format request metrics in the Prometheus text exposition format.
+
+    Parameters
+    ----------
+    metrics : dict
+        Request metrics, as returned by `RequestMetrics.as_dict`.
+    prefix : str, optional, default: 'lisc'
+        Prefix for the metric names.
+
+    Returns
+    -------
+    str
+        The formatted metrics.
+
+    Examples
+    --------
+    Format metrics for a single request:
+
+    >>> metrics = RequestMetrics()
+    >>> metrics.add_request(0.2, 1024)
+    >>> print(format_prometheus(metrics.as_dict()).splitlines()[-1])
+    lisc_request_retries_total 0
+    """
+
+    lines = []
+
+    name = prefix + '_request_latency_seconds'
+    lines.extend(['# HELP {} Time from launching requests to receiving responses.'.format(name),
+                  '# TYPE {} histogram'.format(name)])
+    count = 0
+    for bound, n_bucket in zip(metrics['latency_buckets'] + ['+Inf'], metrics['latency_counts']):
+        count += n_bucket
+        lines.append('{}_bucket{{le="{}"}} {}'.format(name, bound, count))
+    lines.append('{}_sum {}'.format(name, metrics['latency_time']))
+    lines.append('{}_count {}'.format(name, metrics['n_requests']))
+
+    counters = [('request_bytes_total', 'n_bytes', 'Number of bytes downloaded.'),
+                ('throttle_wait_seconds_total', 'throttle_time',
+                 'Time spent waiting between requests due to throttling.'),
+                ('parse_seconds_total', 'parse_time', 'Time spent parsing responses.'),
+                ('request_retries_total', 'n_retries', 'Number of retried requests.')]
+
+    for label, key, description in counters:
+        name = prefix + '_' + label
+        lines.extend(['# HELP {} {}'.format(name, description),
+                      '# TYPE {} counter'.format(name),
+                      '{} {}'.format(name, metrics[key])])
+
+    return '\n'.join(lines) + '\n'
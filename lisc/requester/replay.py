@@ -0,0 +1,333 @@
+"""Local server to record and replay URL requests, for offline testing and benchmarking."""
+
+import json
+import time
+import random
+import hashlib
+from pathlib import Path
+from threading import Thread, Lock
+from urllib.parse import urlsplit, parse_qs, quote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+from lisc.urls.utils import split_url, FORM_HEADERS
+from lisc.requester.keys import drop_api_key
+
+###################################################################################################
+###################################################################################################
+
+class ReplayServer():
+    """A local HTTP server that records responses to requested URLs, and replays them.
+
+    Attributes
+    ----------
+    directory : Path
+        Folder of fixture files, with one file per recorded URL.
+    mode : {'replay', 'record'}
+        Whether to only replay recorded responses, or to also record responses for new URLs.
+    latency : float
+        Time to wait before each response, in seconds.
+    jitter : float
+        Maximum random variation in the latency, in seconds.
+    error_rate : float
+        Proportion of requests that are responded to with a 429 (Too Many Requests) error.
+    n_requests : int
+        Number of requests that have been received by the server.
+    n_errors : int
+        Number of requests that have been responded to with an injected error.
+
+    Notes
+    -----
+    Requests to the server should be made to the server URL, with the original URL passed
+    as the 'url' query parameter, which is how a ``Requester`` with `redirect` set
+    makes requests. For POST requests, the settings sent as form data are added back to
+    the original URL, such that responses are recorded by the full URL. URLs that have
+    not been recorded are responded to with a 404 error, unless recording. Any injected
+    429 errors include a 'Retry-After' header.
+    """
+
+    def __init__(self, directory, mode='replay', latency=0., jitter=0., error_rate=0.,
+                 seed=None, port=0):
+        """Initialize a ReplayServer object.
+
+        Parameters
+        ----------
+        directory : str or Path
+            Folder of fixture files, to record to and replay from.
+        mode : {'replay', 'record'}, optional
+            Whether to only replay recorded responses, or to also record responses for new URLs.
+        latency : float, optional, default: 0.
+            Time to wait before each response, in seconds.
+        jitter : float, optional, default: 0.
+            Maximum random variation in the latency, in seconds.
+        error_rate : float, optional, default: 0.
+            Proportion of requests that are responded to with a 429 (Too Many Requests) error.
+        seed : int, optional
+            Seed for the random generator used for jitter and error injection.
+        port : int, optional, default: 0
+            Port to serve on. If 0, an available port is selected.
+
+        Examples
+        --------
+        Replay recorded responses, with a latency of 100 ms, from a requester:
+
+        >>> from lisc.requester import Requester
+        >>> with ReplayServer('fixtures', latency=0.1) as server: # doctest:+SKIP
+        ...     requester = Requester(redirect=server.url)
+        """
+
+        if mode not in ['replay', 'record']:
+            raise ValueError('Server mode not understood.')
+
+        self.directory = Path(directory)
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+        self.n_requests = 0
+        self.n_errors = 0
+
+        self._port = port
+        self._random = random.Random(seed)
+        self._lock = Lock()
+        self._server = None
+        self._thread = None
+
+
+    def __enter__(self):
+
+        self.start()
+        return self
+
+
+    def __exit__(self, *args):
+
+        self.stop()
+
+
+    @property
+    def url(self):
+        """The URL of the running server."""
+
+        if self._server is None:
+            raise ValueError('Server is not running.')
+
+        host, port = self._server.server_address[:2]
+
+        return 'http://{}:{}'.format(host, port)
+
+
+    def start(self):
+        """Start the server, in a background thread."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        handler = type('ReplayHandler', (_ReplayHandler,), {'replay' : self})
+        self._server = ThreadingHTTPServer(('127.0.0.1', self._port), handler)
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+
+    def stop(self):
+        """Stop the server."""
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server, self._thread = None, None
+
+
+    def respond(self, url, post=False):
+        """Get the response to a request for a URL.
+
+        Parameters
+        ----------
+        url : str
+            The original URL that was requested.
+        post : bool, optional, default: False
+            Whether the URL was requested with a POST request, which is used if recording.
+
+        Returns
+        -------
+        status : int
+            Status code of the response.
+        headers : dict
+            Headers of the response.
+        content : bytes
+            Content of the response.
+        """
+
+        with self._lock:
+            self.n_requests += 1
+            delay = max(self.latency + self._random.uniform(-self.jitter, self.jitter), 0)
+            inject_error = self._random.random() < self.error_rate
+            if inject_error:
+                self.n_errors += 1
+
+        time.sleep(delay)
+
+        if inject_error:
+            return 429, {'Retry-After' : '1'}, b''
+
+        fixture = load_fixture(url, self.directory)
+        if fixture is None and self.mode == 'record':
+            base, data = split_url(url)
+            response = requests.post(base, data=data, headers=FORM_HEADERS) if post else \
+                requests.get(url)
+            fixture = save_fixture(url, response.content, self.directory, response.status_code,
+                                   response.headers.get('Content-Type'))
+
+        if fixture is None:
+            return 404, {}, b''
+
+        return fixture['status'], {'Content-Type' : fixture['content_type']}, \
+            fixture['content'].encode('utf-8')
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """Request handler for the replay server."""
+
+    replay = None
+
+    def do_GET(self):
+
+        urls = parse_qs(urlsplit(self.path).query).get('url')
+        self._send(*(self.replay.respond(urls[0]) if urls else (400, {}, b'')))
+
+
+    def do_POST(self):
+
+        urls = parse_qs(urlsplit(self.path).query).get('url')
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+
+        # The form data is the encoded settings of the original URL, so rebuild it exactly
+        url = urls[0] + ('?' + body if body else '') if urls else None
+        self._send(*(self.replay.respond(url, post=True) if url else (400, {}, b'')))
+
+
+    def _send(self, status, headers, content):
+        """Send a response."""
+
+        self.send_response(status)
+        for key, value in headers.items():
+            if value:
+                self.send_header(key, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+    def log_message(self, *args):
+        """Silence the default logging of each request."""
+
+###################################################################################################
+###################################################################################################
+
+def make_replay_url(url, server_url):
+    """Make a URL to request an original URL from a replay server.
+
+    Parameters
+    ----------
+    url : str
+        The original URL.
+    server_url : str
+        The URL of the replay server.
+
+    Returns
+    -------
+    str
+        The URL to request from the replay server.
+
+    Examples
+    --------
+    Make the URL to request a search from a local replay server:
+
+    >>> make_replay_url('https://www.google.com/search?q=lisc', 'http://127.0.0.1:8000')
+    'http://127.0.0.1:8000/?url=https://www.google.com/search%3Fq%3Dlisc'
+    """
+
+    return server_url.rstrip('/') + '/?url=' + quote(url, safe='/:')
+
+
+def get_fixture_name(url):
+    """Get the name of the fixture file for a URL, as a hash of the URL.
+
+    Parameters
+    ----------
+    url : str
+        The original URL.
+
+    Returns
+    -------
+    str
+        The fixture file name.
+
+    Notes
+    -----
+    Any API key is dropped from the URL before hashing, so that fixtures do not depend on the key.
+    """
+
+    return hashlib.sha1(drop_api_key(url).encode('utf-8')).hexdigest() + '.json'
+
+
+def save_fixture(url, content, directory, status=200, content_type=None):
+    """Save the response to a URL as a fixture file.
+
+    Parameters
+    ----------
+    url : str
+        The original URL. Any API key is dropped from the saved URL.
+    content : bytes or str
+        The content of the response.
+    directory : str or Path
+        Folder of fixture files.
+    status : int, optional, default: 200
+        Status code of the response.
+    content_type : str, optional
+        Content type of the response.
+
+    Returns
+    -------
+    fixture : dict
+        The saved fixture.
+    """
+
+    if isinstance(content, bytes):
+        content = content.decode('utf-8')
+
+    fixture = {'url' : drop_api_key(url), 'status' : status, 'content_type' : content_type,
+               'content' : content}
+
+    with open(Path(directory) / get_fixture_name(url), 'w') as f_obj:
+        json.dump(fixture, f_obj)
+
+    return fixture
+
+
+def load_fixture(url, directory):
+    """Load the recorded response to a URL from a fixture file.
+
+    Parameters
+    ----------
+    url : str
+        The original URL.
+    directory : str or Path
+        Folder of fixture files.
+
+    Returns
+    -------
+    fixture : dict or None
+        The loaded fixture, or None if the URL has not been recorded.
+    """
+
+    file_path = Path(directory) / get_fixture_name(url)
+    if not file_path.exists():
+        return None
+
+    with open(file_path) as f_obj:
+        fixture = json.load(f_obj)
+
+    return fixture
@@ -3,17 +3,31 @@
 import os
 import time
 from copy import deepcopy
+from threading import Lock
+from collections import OrderedDict
+from contextlib import contextmanager
 
 import requests
 
 from lisc.io.db import check_directory
 from lisc.io.utils import check_ext
+from lisc.requester.replay import make_replay_url
+from lisc.requester.metrics import RequestMetrics
+from lisc.requester.keys import set_api_key, drop_api_key
+from lisc.requester.logs import RequestLog
+from lisc.urls.utils import split_url, FORM_HEADERS
 
 ###################################################################################################
 ###################################################################################################
 
-class Requester():
-    """Object to handle URL requests.
+# Status codes of responses for which the request is retried, if retries are enabled
+RETRY_CODES = [429, 500, 502, 503, 504]
+
+# Default maximum number of results to memoize, after which the least recently used are dropped
+MEMO_SIZE = 10000
+
+class BaseRequester():
+    """Base object for handling URL requests, shared by synchronous and asynchronous requesters.
 
     Attributes
     ----------
@@ -29,29 +43,78 @@ class Requester():
         Time when request session ended.
     time_last_req : float
         Time at which last request was sent.
-    logging : {None, 'print', 'store', 'file'}
+    logging : {None, 'print', 'store', 'file', 'jsonl'}
         What kind of logging, if any, to do for requested URLs.
-    log : None or list or FileObject
+    log : None or list or FileObject or RequestLog
         Log of requested URLs. Format depends on `logging`.
+    redirect : str or None
+        URL of a replay server that requests are redirected to, if any.
+    max_retries : int
+        Maximum number of times to retry a request that fails.
+    metrics : RequestMetrics
+        Timing and size metrics of the requests made from this object.
+    key_pool : KeyPool or None
+        Pool of API keys that requests are shared across, if any.
+    memoize : bool
+        Whether to memoize results that are parsed from requested URLs.
+    memo_size : int or None
+        Maximum number of results to memoize, or None for no limit.
+    n_memo_hits : int
+        Number of results that were retrieved from the memo, rather than requested.
+
+    Notes
+    -----
+    This object does not make requests, which are made by the `request_url` method
+    of the ``Requester`` and ``AsyncRequester`` objects.
     """
 
-    def __init__(self, wait_time=0., logging=None, directory=None):
+    def __init__(self, wait_time=0., logging=None, directory=None, redirect=None,
+                 max_retries=0, key_pool=None, memoize=False, memo_size=MEMO_SIZE):
         """Initialize a requester object.
 
         Parameters
         ----------
         wait_time : float, optional, default: 0.0
             Amount of time to wait between requests, in seconds.
-        logging : {None, 'print', 'store', 'file'}, optional
+        logging : {None, 'print', 'store', 'file', 'jsonl'} or RequestLog, optional
             What kind of logging, if any, to do for requested URLs.
+            If 'jsonl', or a ``RequestLog`` object, which can be used to set the buffering,
+            rotation and sampling, each request is logged as a structured record.
         directory : SCDB or str or None, optional
             A string or object containing a file path, used for logging.
+        redirect : str, optional
+            URL of a replay server to redirect requests to, such as a running ``ReplayServer``.
+            Logged URLs are the original URLs, before redirection.
+        max_retries : int, optional, default: 0
+            Maximum number of times to retry a request that fails, due to a connection error,
+            or a response with a status code in `RETRY_CODES`. Retries wait for any time given
+            by a 'Retry-After' header, or otherwise for an exponentially increasing time.
+        key_pool : KeyPool, optional
+            Pool of API keys to share requests across. If provided, each request is made with
+            the key with the most available capacity, set as the 'api_key' setting of the URL.
+            Each key is throttled by the pool, so `wait_time` can be set to 0.
+            Logged URLs do not include the pooled keys.
+        memoize : bool, optional, default: False
+            Whether to memoize results that are parsed from requested URLs, such as counts,
+            so that repeated requests for the same URL are not re-requested.
+        memo_size : int or None, optional, default: MEMO_SIZE
+            Maximum number of results to memoize. Once reached, the least recently used
+            results are dropped from the memo. If None, the memo is not limited.
 
         Examples
         --------
         Initialize a ``Requester`` object, specifying a wait time of 0.1 seconds between requests:
 
         >>> requester = Requester(wait_time=0.1)
+
+        Initialize a ``Requester`` object, sharing requests across two API keys:
+
+        >>> from lisc.requester.keys import KeyPool
+        >>> requester = Requester(key_pool=KeyPool(['key_project_a', 'key_project_b']))
+
+        Initialize a ``Requester`` object that memoizes results, to share across collections:
+
+        >>> requester = Requester(wait_time=0.1, memoize=True)
         """
 
         self.is_active = bool()
@@ -64,6 +127,20 @@ class Requester():
 
         self.time_last_req = float()
 
+        self.redirect = redirect
+        self.max_retries = max_retries
+
+        self.memoize = memoize
+        self.memo_size = memo_size
+        self.n_memo_hits = int()
+
+        self._lock = Lock()
+        self._metrics = RequestMetrics()
+        self._key_pool = key_pool
+        self._memo = OrderedDict()
+        self._memo_lock = Lock()
+        self._on_request = None
+
         # Set object as active
         self.set_wait_time(wait_time)
         self.open()
@@ -76,11 +153,26 @@ class Requester():
         return str(self.__dict__)
 
 
+    @property
+    def metrics(self):
+        """Timing and size metrics of the requests made from this object."""
+
+        return self._metrics
+
+
+    @property
+    def key_pool(self):
+        """Pool of API keys that requests are shared across, if any."""
+
+        return self._key_pool
+
+
     def as_dict(self):
         """Get the attributes of the Requester object as a dictionary."""
 
         # Copy is so that attributes aren't dropped from object itself
-        req_dict = deepcopy(self.__dict__)
+        req_dict = {key : deepcopy(val) if not isinstance(val, RequestLog) else str(val) \
+            for key, val in self.__dict__.items() if not key.startswith('_')}
         req_dict.pop('time_last_req')
 
         return req_dict
@@ -105,76 +197,127 @@ class Requester():
         self.wait_time = wait_time
 
 
-    def check(self):
-        """Print out basic check of requester object."""
-
-        print('Requester object is active: \t', str(self.is_active))
-        print('Number of requests sent: \t', str(self.n_requests))
-        print('Requester opened: \t\t', str(self.start_time))
-        print('Requester closed: \t\t', str(self.end_time))
+    def set_request_hook(self, hook):
+        """Set a function to be called after each request.
 
+        Parameters
+        ----------
+        hook : callable or None
+            Function to call after each request, as `hook(url, response)`.
+            If None, removes any previously set hook.
 
-    def throttle(self):
-        """Slow down rate of requests by waiting if a new request is initiated too soon."""
+        Examples
+        --------
+        Print the status code of each response:
 
-        # Check how long it has been since last request was sent
-        time_since_req = time.time() - self.time_last_req
+        >>> requester = Requester()
+        >>> requester.set_request_hook(lambda url, response: print(response.status_code))
+        """
 
-        # If last request was too recent, pause
-        if time_since_req < self.wait_time:
-            self.wait(self.wait_time - time_since_req)
+        self._on_request = hook
 
 
-    @staticmethod
-    def wait(wait_time):
-        """Pause for specified amount of time.
+    @contextmanager
+    def request_hook(self, hook):
+        """Context manager to set a function to be called after each request, within the context.
 
         Parameters
         ----------
-        wait_time : float
-            Time to wait between launching URL requests, in seconds.
+        hook : callable or None
+            Function to call after each request, as `hook(url, response)`.
+            If None, any previously set hook is kept.
+
+        Notes
+        -----
+        On exit, including if an error occurs, any previously set hook is restored.
+
+        Examples
+        --------
+        Print the status code of each response, for requests made within the context:
+
+        >>> requester = Requester()
+        >>> with requester.request_hook(lambda url, response: print(response.status_code)):
+        ...     pass
         """
 
-        time.sleep(wait_time)
+        previous = self._on_request
+        if hook:
+            self._on_request = hook
 
+        try:
+            yield self
+        finally:
+            self._on_request = previous
 
-    def request_url(self, url):
-        """Request a URL.
+
+    def get_memo(self, url):
+        """Get the memoized result for a URL.
 
         Parameters
         ----------
         url : str
-            Web address to request.
+            The URL that the result was parsed from.
 
         Returns
         -------
-        out : requests.models.Response
-            Object containing the requested web page.
+        result : object or None
+            The memoized result, or None if not memoizing, or if the URL has no result stored.
 
         Examples
         --------
-        Use a ``Requester`` object to request the LISC Github repository url:
+        Store and then retrieve a result:
 
-        >>> requester = Requester()
-        >>> response = requester.request_url('https://github.com/lisc-tools/lisc')
+        >>> requester = Requester(memoize=True)
+        >>> requester.add_memo('https://www.google.com/search?q=lisc', 12)
+        >>> requester.get_memo('https://www.google.com/search?q=lisc')
+        12
         """
 
-        # Check if current object is active
-        if not self.is_active:
-            raise ValueError('Requester object is not active.')
+        if not self.memoize:
+            return None
 
-        # Check and throttle, if required,
-        self.throttle()
+        with self._memo_lock:
+            result = self._memo.get(url)
+            if result is not None:
+                self._memo.move_to_end(url)
+                self.n_memo_hits += 1
 
-        # Log and request the URL
-        self._log_url(url)
-        out = requests.get(url)
+        return result
 
-        # Update data on requests
-        self.time_last_req = time.time()
-        self.n_requests += 1
 
-        return out
+    def add_memo(self, url, result):
+        """Store the result parsed from a URL, if memoizing.
+
+        Parameters
+        ----------
+        url : str
+            The URL that the result was parsed from.
+        result : object
+            The result to store.
+        """
+
+        if self.memoize:
+            with self._memo_lock:
+                self._memo[url] = result
+                self._memo.move_to_end(url)
+                if self.memo_size is not None and len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+
+
+    def clear_memo(self):
+        """Clear all memoized results."""
+
+        with self._memo_lock:
+            self._memo = OrderedDict()
+
+
+    def check(self):
+        """Print out basic check of requester object."""
+
+        print('Requester object is active: \t', str(self.is_active))
+        print('Number of requests sent: \t', str(self.n_requests))
+        print('Requester opened: \t\t', str(self.start_time))
+        print('Requester closed: \t\t', str(self.end_time))
 
 
     def open(self):
@@ -195,19 +338,31 @@ class Requester():
             self.log.close()
             self.log = 'Logging saved to file.'
 
+        if self.logging == 'jsonl':
+            self.log.close()
+
 
     def _set_up_logging(self, logging, directory):
         """Set up for URL logging.
 
         Parameters
         ----------
-        logging : {None, 'print', 'store', 'file'}
+        logging : {None, 'print', 'store', 'file', 'jsonl'} or RequestLog
             What kind of logging, if any, to do for requested URLs.
         directory : SCDB or str or None
             A string or object containing a file path.
         """
 
-        if logging in [None, 'print']:
+        # A requester passed in here is of the other kind, such as an asynchronous requester
+        #   passed to a synchronous collection function, which cannot make its requests
+        if isinstance(logging, BaseRequester):
+            raise ValueError('A {} object cannot be used here, use a {} object.'.format(
+                type(logging).__name__, type(self).__name__))
+
+        if isinstance(logging, RequestLog):
+            logging, log = 'jsonl', logging
+
+        elif logging in [None, 'print']:
             log = None
 
         elif logging == 'store':
@@ -218,6 +373,10 @@ class Requester():
                                     check_ext('requester_log', '.txt')), 'w')
             log.write('REQUESTER LOG - STARTED AT:  ' + self.start_time)
 
+        elif logging == 'jsonl':
+            log = RequestLog(os.path.join(check_directory(directory, 'logs'),
+                                          check_ext('requester_log', '.jsonl')))
+
         else:
             raise ValueError('Logging type not understood.')
 
@@ -243,6 +402,88 @@ class Requester():
             self.log.write('\n' + url)
 
 
+    def _record_request(self, url, response, latency, post=False, retry=0):
+        """Record the metrics of a completed request, and add it to any structured log.
+
+        Parameters
+        ----------
+        url : str
+            The original URL that was requested.
+        response : requests.models.Response or None
+            The response to the request, if any.
+        latency : float
+            Time from launching the request to receiving the response, in seconds.
+        post : bool, optional, default: False
+            Whether the request was a POST request.
+        retry : int, optional, default: 0
+            The index of the retry, with 0 being the first attempt.
+        """
+
+        n_bytes = len(response.content) if response is not None else 0
+        self._metrics.add_request(latency, n_bytes)
+
+        if self.logging == 'jsonl':
+            self.log.add_request(url, response.status_code if response is not None else None,
+                                 latency, n_bytes, 'POST' if post else 'GET', retry)
+
+
+    def _make_request(self, url, key=None, post=False):
+        """Make the URL and any form data to request, setting any API key, or redirecting to
+        any replay server, without the API key.
+
+        Parameters
+        ----------
+        url : str
+            The original URL.
+        key : str, optional
+            API key to set in the URL.
+        post : bool, optional, default: False
+            Whether the request is a POST request, in which case the settings are split out.
+
+        Returns
+        -------
+        url : str
+            The URL to request.
+        data : str or None
+            The settings to send as form data, if a POST request, encoded as in the URL.
+        """
+
+        # Drop any API key from URLs to a replay server, so that fixtures do not depend on,
+        #   or store, the key used
+        if self.redirect:
+            url = drop_api_key(url)
+        elif key:
+            url = set_api_key(url, key)
+
+        data = None
+        if post:
+            url, data = split_url(url)
+
+        return make_replay_url(url, self.redirect) if self.redirect else url, data
+
+
+    @staticmethod
+    def _get_retry_time(response, retry):
+        """Get the time to wait before retrying a request.
+
+        Parameters
+        ----------
+        response : requests.models.Response or None
+            The response to the failed request, if any.
+        retry : int
+            The index of the retry, starting at 0.
+
+        Returns
+        -------
+        float
+            Time to wait, in seconds.
+        """
+
+        retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+
+        return float(retry_after) if retry_after.isdigit() else 2 ** retry
+
+
     @staticmethod
     def _get_time():
         """Get the current time.
@@ -254,3 +495,153 @@ class Requester():
         """
 
         return time.strftime('%H:%M:%S %A %d %B %Y')
+
+
+class Requester(BaseRequester):
+    """Object to handle URL requests.
+
+    Attributes
+    ----------
+    is_active : bool
+        Status of the requester, reflecting whether it is currently being used to make requests.
+    n_requests : int
+        Number of requests that have been made from this object.
+    wait_time : float
+        Amount of time to wait between requests, in seconds.
+    start_time : str
+        Time when request session started.
+    end_time : str
+        Time when request session ended.
+    time_last_req : float
+        Time at which last request was sent.
+    logging : {None, 'print', 'store', 'file', 'jsonl'}
+        What kind of logging, if any, to do for requested URLs.
+    log : None or list or FileObject or RequestLog
+        Log of requested URLs. Format depends on `logging`.
+    redirect : str or None
+        URL of a replay server that requests are redirected to, if any.
+    max_retries : int
+        Maximum number of times to retry a request that fails.
+    metrics : RequestMetrics
+        Timing and size metrics of the requests made from this object.
+    key_pool : KeyPool or None
+        Pool of API keys that requests are shared across, if any.
+    memoize : bool
+        Whether to memoize results that are parsed from requested URLs.
+    memo_size : int or None
+        Maximum number of results to memoize, or None for no limit.
+    n_memo_hits : int
+        Number of results that were retrieved from the memo, rather than requested.
+
+    Notes
+    -----
+    Requests can be launched from multiple threads. Throttling is applied across all threads,
+    such that requests are launched at most once per `wait_time`.
+
+    If memoizing, results are stored by URL, such that any collection functions that are
+    passed the same requester share results. Up to `memo_size` results are stored, after
+    which the least recently used results are dropped.
+    """
+
+    def throttle(self):
+        """Slow down rate of requests by waiting if a new request is initiated too soon.
+
+        Returns
+        -------
+        throttle_time : float
+            Time spent waiting, in seconds.
+        """
+
+        # Check how long it has been since last request was sent
+        time_since_req = time.time() - self.time_last_req
+
+        # If last request was too recent, pause
+        throttle_time = 0.
+        if time_since_req < self.wait_time:
+            throttle_time = self.wait_time - time_since_req
+            self.wait(throttle_time)
+
+        return throttle_time
+
+
+    @staticmethod
+    def wait(wait_time):
+        """Pause for specified amount of time.
+
+        Parameters
+        ----------
+        wait_time : float
+            Time to wait between launching URL requests, in seconds.
+        """
+
+        time.sleep(wait_time)
+
+
+    def request_url(self, url, post=False):
+        """Request a URL.
+
+        Parameters
+        ----------
+        url : str
+            Web address to request.
+        post : bool, optional, default: False
+            Whether to make a POST request, sending the settings of the URL as form data,
+            rather than a GET request. This avoids limits on URL length for long URLs.
+
+        Returns
+        -------
+        out : requests.models.Response
+            Object containing the requested web page.
+
+        Examples
+        --------
+        Use a ``Requester`` object to request the LISC Github repository url:
+
+        >>> requester = Requester()
+        >>> response = requester.request_url('https://github.com/lisc-tools/lisc')
+        """
+
+        # Check if current object is active
+        if not self.is_active:
+            raise ValueError('Requester object is not active.')
+
+        request_url, data = self._make_request(url, post=post)
+
+        for retry in range(self.max_retries + 1):
+
+            # Take a key from the pool, if set, which is throttled separately for each key
+            if self._key_pool is not None:
+                key, throttle_time = self._key_pool.acquire()
+                self._metrics.add_throttle(throttle_time)
+                request_url, data = self._make_request(url, key, post)
+
+            # Check and throttle, if required, and log and update data on requests
+            #   This is locked, so that throttling is consistent across threads
+            with self._lock:
+                throttle_time = self.throttle()
+                self._log_url(url)
+                self.time_last_req = time.time()
+                self.n_requests += 1
+            self._metrics.add_throttle(throttle_time)
+
+            start, out = time.perf_counter(), None
+            try:
+                out = requests.post(request_url, data=data, headers=FORM_HEADERS) if post else \
+                    requests.get(request_url)
+            except requests.ConnectionError:
+                if retry == self.max_retries:
+                    raise
+            finally:
+                self._record_request(url, out, time.perf_counter() - start, post, retry)
+
+            if out is not None and out.status_code not in RETRY_CODES:
+                break
+
+            if retry < self.max_retries:
+                self._metrics.add_retry()
+                self.wait(self._get_retry_time(out, retry))
+
+        if self._on_request:
+            self._on_request(url, out)
+
+        return out
@@ -0,0 +1,62 @@
+"""Tests for lisc.analysis.matrix."""
+
+import numpy as np
+
+from lisc.tests.tutils import optional_test
+
+from lisc.analysis.matrix import *
+
+###################################################################################################
+###################################################################################################
+
+TOKENS = [['brain', 'memory', 'brain'], ['brain', 'cell'], ['protein', 'cell']]
+
+def test_get_tokens(tarts_data):
+
+    tokens, doc_terms = get_tokens([tarts_data, tarts_data])
+
+    assert len(tokens) == len(doc_terms) == 2 * tarts_data.n_articles
+    assert tokens[0] == ['lots', 'words', 'data', 'continuous', 'text']
+    assert list(doc_terms) == [0, 0, 1, 1]
+
+def test_build_vocabulary():
+
+    vocab = build_vocabulary(TOKENS)
+    assert list(vocab) == ['brain', 'cell', 'memory', 'protein']
+    assert list(vocab.values()) == [0, 1, 2, 3]
+
+    vocab = build_vocabulary(TOKENS, min_df=2)
+    assert list(vocab) == ['brain', 'cell']
+
+@optional_test('scipy')
+def test_make_document_term_matrix():
+
+    vocab = build_vocabulary(TOKENS)
+    dtm = make_document_term_matrix(TOKENS, vocab)
+
+    assert dtm.shape == (3, 4)
+    assert np.array_equal(dtm.toarray(), [[2, 0, 1, 0], [1, 1, 0, 0], [0, 1, 0, 1]])
+
+@optional_test('scipy')
+def test_compute_tfidf():
+
+    dtm = make_document_term_matrix(TOKENS, build_vocabulary(TOKENS))
+    tfidf = compute_tfidf(dtm)
+
+    assert tfidf.shape == dtm.shape
+    assert np.allclose(np.sqrt(tfidf.multiply(tfidf).sum(axis=1)), 1)
+
+    # Words in fewer documents should get higher weights, for equal counts
+    row = tfidf.toarray()[2]
+    assert row[3] > row[1]
+
+@optional_test('scipy')
+def test_compute_term_similarity():
+
+    dtm = make_document_term_matrix(TOKENS, build_vocabulary(TOKENS))
+    similarity = compute_term_similarity(dtm, np.array([0, 0, 1]))
+
+    assert similarity.shape == (2, 2)
+    assert np.allclose(np.diag(similarity), 1)
+    assert np.allclose(similarity, similarity.T)
+    assert 0 < similarity[0, 1] < 1
@@ -0,0 +1,71 @@
+"""Tests for lisc.collect.asynchronous."""
+
+import json
+import asyncio
+
+from lisc.requester import AsyncRequester, ReplayServer
+from lisc.requester.replay import save_fixture
+from lisc.urls.open_citations import OpenCitations
+from lisc.tests.tutils import optional_test
+
+from lisc.collect.asynchronous import *
+
+###################################################################################################
+###################################################################################################
+
+@optional_test('aiohttp')
+def test_collect_counts_async(tmp_path):
+
+    terms_a = [['language'], ['memory'], ['attention']]
+    terms_b = [['brain'], ['body']]
+
+    # Collect from an empty replay server, for which all counts are returned as 0
+    with ReplayServer(tmp_path) as server:
+
+        cooc, counts, meta_data = asyncio.run(collect_counts_async(\
+            terms_a, collect_info=False, n_jobs=2, logging=AsyncRequester(redirect=server.url)))
+        assert cooc.shape == (3, 3)
+        assert (cooc == 0).all()
+        assert (counts == 0).all()
+        assert server.n_requests == 3 + 3
+
+        cooc, counts, meta_data = asyncio.run(collect_counts_async(\
+            terms_a, terms_b=terms_b, collect_info=False,
+            logging=AsyncRequester(redirect=server.url)))
+        assert cooc.shape == (3, 2)
+        assert len(counts[1]) == 2
+        assert meta_data.requester['n_requests'] == 3 + 2 + 6
+
+@optional_test('aiohttp')
+def test_collect_citations_async(tmp_path):
+
+    dois = ['10.1/a', '10.1/b']
+
+    urls = OpenCitations()
+    urls.build_url('citations')
+    save_fixture(urls.get_url('citations', [dois[0]]),
+                 json.dumps([{'citing' : '10.1/c', 'cited' : dois[0]}]), tmp_path)
+    save_fixture(urls.get_url('citations', [dois[1]]), '[]', tmp_path)
+
+    with ReplayServer(tmp_path) as server:
+        n_citations, cite_dois, meta_data = asyncio.run(collect_citations_async(\
+            dois, collect_dois=True, logging=AsyncRequester(redirect=server.url)))
+
+    assert n_citations == {'10.1/a' : 1, '10.1/b' : None}
+    assert cite_dois['10.1/a'] == ['10.1/c']
+
+@optional_test('aiohttp')
+def test_collect_words_async(test_req):
+
+    terms = [['science'], ['engineering']]
+
+    res, meta_data = asyncio.run(collect_words_async(terms, retmax=2))
+    assert len(res) == len(terms)
+    assert res[0].n_articles == 2
+    assert meta_data['requester']['n_requests'] > 0
+
+@optional_test('aiohttp')
+def test_collect_info_async():
+
+    meta_data = asyncio.run(collect_info_async())
+    assert meta_data.db_info['dbname'] == 'pubmed'
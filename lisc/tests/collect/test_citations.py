@@ -1,5 +1,11 @@
 """Tests for lisc.collect.citations."""
 
+import json
+
+from lisc.requester import Requester, ReplayServer
+from lisc.requester.replay import save_fixture
+from lisc.urls.open_citations import OpenCitations
+
 from lisc.collect.citations import *
 
 ###################################################################################################
@@ -26,3 +32,32 @@ def test_collect_citations_refs(test_req):
     assert len(n_references) == len(ref_dois) == len(dois)
     assert isinstance(list(n_references.values())[0], int)
     assert isinstance(list(ref_dois.values())[0][0], str)
+
+def test_collect_citations_batch(test_req):
+
+    dois = ['10.1007/s00228-017-2226-2', '10.1186/1756-8722-6-59', '10.1038/nmeth.1635']
+
+    # Test batched & concurrent collection, which should match serial collection
+    n_citations, meta_data = collect_citations(\
+        dois, 'citations', batch_size=2, n_jobs=2, logging=test_req)
+    assert list(n_citations.keys()) == dois
+    assert meta_data.requester['n_requests'] == 2
+
+def test_collect_citations_hooks(tmp_path):
+
+    dois = ['10.1000/a', '10.1000/b']
+
+    urls = OpenCitations()
+    urls.build_url('citations')
+    for doi in dois:
+        save_fixture(urls.get_url('citations', [doi]),
+                     json.dumps([{'citing' : '10.1000/c', 'cited' : doi}]), tmp_path)
+
+    batches = []
+    with ReplayServer(tmp_path) as server:
+        n_citations, meta_data = collect_citations(\
+            dois, 'citations', False, Requester(redirect=server.url),
+            hooks={'on_batch' : lambda ind, outputs: batches.append((ind, outputs))})
+
+    assert n_citations == {'10.1000/a' : 1, '10.1000/b' : 1}
+    assert batches == [(0, {'10.1000/a' : 1}), (1, {'10.1000/b' : 1})]
@@ -1,5 +1,11 @@
 """Tests for lisc.collect.counts."""
 
+from pytest import raises
+
+from lisc.requester import Requester, AsyncRequester, ReplayServer
+from lisc.requester.replay import save_fixture
+from lisc.modutils.errors import CollectionStopped
+
 from lisc.collect.counts import *
 
 ###################################################################################################
@@ -41,3 +47,119 @@ def test_collect_counts_nocooc(test_req):
         terms_a, exclusions_a=excls_a, collect_coocs=False, logging=test_req)
     assert len(counts) == len(terms_a)
     assert meta_data.requester['n_requests'] > 0
+
+def test_collect_counts_hooks(tmp_path):
+
+    terms_a = [['language'], ['memory']]
+
+    calls = {'on_request' : [], 'on_term_start' : [], 'on_cell' : []}
+    hooks = {label : lambda *args, label=label: calls[label].append(args) for label in calls}
+
+    # Collect from an empty replay server, for which all counts are returned as 0
+    with ReplayServer(tmp_path) as server:
+        cooc, counts, meta_data = collect_counts(terms_a, collect_info=False, hooks=hooks,
+                                                 logging=Requester(redirect=server.url))
+
+    assert [args[1] for args in calls['on_term_start']] == ['language', 'memory']
+    assert len(calls['on_request']) == meta_data.requester['n_requests']
+    assert (0, None, 0) in calls['on_cell']
+    assert (0, 1, 0) in calls['on_cell']
+
+def test_collect_counts_hooks_stop(tmp_path):
+
+    terms_a = ['language', 'memory', 'attention']
+
+    def on_cell(a_ind, b_ind, count):
+        if b_ind is not None:
+            raise CollectionStopped
+
+    with ReplayServer(tmp_path) as server:
+        cooc, counts, meta_data = collect_counts(terms_a, collect_info=False,
+                                                 hooks={'on_cell' : on_cell},
+                                                 logging=Requester(redirect=server.url))
+
+    assert cooc[0, 1] == 0
+    assert cooc[0, 2] == -1
+    assert counts[1] == -1
+
+def test_collect_counts_hooks_error(tmp_path):
+
+    terms_a = ['language', 'memory']
+
+    def on_request(url, response):
+        raise ValueError('Request failed.')
+
+    errors = []
+    with ReplayServer(tmp_path) as server:
+        counts, meta_data = collect_counts(terms_a, collect_coocs=False, collect_info=False,
+                                           hooks={'on_request' : on_request,
+                                                  'on_error' : lambda *args: errors.append(args)},
+                                           logging=Requester(redirect=server.url))
+
+    assert len(errors) == len(terms_a)
+    assert list(counts) == [-1, -1]
+
+def test_collect_counts_hooks_reset(tmp_path):
+
+    terms_a = ['language', 'memory']
+
+    requests = []
+    with ReplayServer(tmp_path) as server:
+        req = Requester(redirect=server.url)
+        collect_counts(terms_a, collect_coocs=False, collect_info=False, logging=req,
+                       hooks={'on_request' : lambda *args: requests.append(args)})
+        collect_counts(terms_a, collect_coocs=False, collect_info=False, logging=req)
+
+    # The hook should be called for the first collection only
+    assert len(requests) == len(terms_a)
+    assert req.n_requests == 2 * len(terms_a)
+
+def test_collect_counts_requests(tmp_path):
+
+    terms_a = ['language', 'memory']
+    terms_b = ['brain', 'cortex']
+
+    # Each term count should be requested once, plus once per combination of terms
+    with ReplayServer(tmp_path) as server:
+        cooc, counts, meta_data = collect_counts(terms_a, terms_b=terms_b, collect_info=False,
+                                                 logging=Requester(redirect=server.url))
+
+    assert meta_data.requester['n_requests'] == 2 + 2 + 4
+
+def test_collect_counts_memoize(tmp_path):
+
+    terms_a = [['language'], ['memory']]
+
+    urls, _ = make_counts_urls()
+    for ind, term in enumerate(terms_a):
+        url = urls.get_url('search', settings={'term' : make_term(Term(term[0], term, [], []))})
+        save_fixture(url, '<Count>{}</Count>'.format(ind + 10), tmp_path)
+
+    with ReplayServer(tmp_path) as server:
+        req = Requester(redirect=server.url, memoize=True)
+        counts1, _ = collect_counts(terms_a, collect_coocs=False, collect_info=False, logging=req)
+        counts2, _ = collect_counts(terms_a, collect_coocs=False, collect_info=False, logging=req)
+
+    assert list(counts1) == list(counts2) == [10, 11]
+    assert req.n_requests == 2
+    assert req.n_memo_hits == 2
+
+def test_collect_counts_post(tmp_path):
+
+    terms_a = [['synonym{}'.format(ind) for ind in range(250)]]
+
+    urls, _ = make_counts_urls()
+    url = urls.get_url('search', settings={'term' : make_term(Term('s', terms_a[0], [], []))})
+    save_fixture(url, '<Count>12</Count>', tmp_path)
+
+    with ReplayServer(tmp_path) as server:
+        counts, _ = collect_counts(terms_a, collect_coocs=False, collect_info=False,
+                                   logging=Requester(redirect=server.url))
+
+    assert check_post(url)
+    assert list(counts) == [12]
+
+def test_collect_counts_async_requester():
+
+    with raises(ValueError):
+        collect_counts(['language'], logging=AsyncRequester())
@@ -0,0 +1,48 @@
+"""Tests for lisc.collect.hooks."""
+
+from pytest import raises
+
+from lisc.modutils.errors import CollectionStopped
+
+from lisc.collect.hooks import *
+
+###################################################################################################
+###################################################################################################
+
+def _request(req, url, fail=False):
+
+    if fail:
+        raise ValueError('Request failed.')
+
+    return url
+
+def _stop(req, url):
+
+    raise CollectionStopped
+
+def test_check_hooks():
+
+    hooks = check_hooks()
+    assert set(hooks.keys()) == set(HOOKS.keys())
+    assert all(hook is None for hook in hooks.values())
+
+    hooks = check_hooks({'on_cell' : print})
+    assert hooks['on_cell'] is print
+
+    with raises(ValueError):
+        check_hooks({'on_bad' : print})
+
+def test_run_request():
+
+    assert run_request(_request, None, 'url') == 'url'
+
+    with raises(ValueError):
+        run_request(_request, None, 'url', fail=True)
+
+    errors = []
+    out = run_request(_request, None, 'url', lambda url, error: errors.append(url), -1, fail=True)
+    assert out == -1
+    assert errors == ['url']
+
+    with raises(CollectionStopped):
+        run_request(_stop, None, 'url', lambda url, error: None)
@@ -0,0 +1,94 @@
+"""Tests for lisc.collect.local."""
+
+import numpy as np
+
+from lisc.data.term import Term
+from lisc.data.articles import Articles
+from lisc.tests.tutils import optional_test
+
+from lisc.collect.local import *
+
+###################################################################################################
+###################################################################################################
+
+def _make_arts():
+
+    arts = Articles(Term('label', ['search'], [], []))
+    texts = [('First title', 'The frontal lobe and the temporal lobe.'),
+             ('Second title', 'Memory in the Temporal-Lobe, and temporal lobe.'),
+             ('Third title', 'Frontal lobe function, in rats.'),
+             ('Fourth title', 'Nothing to see here.')]
+    for ind, (title, words) in enumerate(texts):
+        arts.add_data('ids', ind)
+        arts.add_data('titles', title)
+        arts.add_data('words', words)
+
+    return arts
+
+@optional_test('scipy')
+def test_collect_counts_local_one():
+
+    terms = [['frontal lobe'], ['temporal lobe']]
+    coocs, counts, meta_data = collect_counts_local([_make_arts()], terms)
+
+    assert np.array_equal(counts, [2, 2])
+    assert np.array_equal(coocs, [[0, 1], [1, 0]])
+    assert meta_data.settings['n_documents'] == 4
+
+@optional_test('scipy')
+def test_collect_counts_local_two():
+
+    terms_a = [['frontal lobe'], ['temporal lobe']]
+    terms_b = [['rats', 'memory'], ['title']]
+    coocs, counts, _ = collect_counts_local([_make_arts()], terms_a, terms_b=terms_b)
+
+    assert coocs.shape == (2, 2)
+    assert np.array_equal(counts[0], [2, 2])
+    assert np.array_equal(counts[1], [2, 4])
+    assert np.array_equal(coocs, [[1, 2], [1, 2]])
+
+    _, counts, _ = collect_counts_local([_make_arts()], terms_a, terms_b=terms_b,
+                                        joiners_b={'search' : 'AND', 'inclusions' : 'OR',
+                                                   'exclusions' : 'OR'})
+    assert np.array_equal(counts[0], [2, 2])
+    assert np.array_equal(counts[1], [0, 4])
+
+@optional_test('scipy')
+def test_collect_counts_local_clusions():
+
+    arts = _make_arts()
+
+    counts, _ = collect_counts_local([arts], [['frontal lobe']], exclusions_a=[['rats']],
+                                     collect_coocs=False)
+    assert np.array_equal(counts, [1])
+
+    counts, _ = collect_counts_local([arts], [['lobe']], inclusions_a=[['memory']],
+                                     collect_coocs=False)
+    assert np.array_equal(counts, [1])
+
+@optional_test('scipy')
+def test_collect_counts_local_duplicates():
+
+    arts = _make_arts()
+    counts, meta_data = collect_counts_local([arts, arts], [['frontal lobe']],
+                                             collect_coocs=False)
+
+    assert np.array_equal(counts, [2])
+    assert meta_data.settings['n_documents'] == 4
+
+def test_normalize_text():
+
+    assert normalize_text('The Temporal-Lobe, and (frontal) lobe.') == \
+        'the temporal-lobe and frontal lobe'
+    assert normalize_text(['Frontal', 'lobe']) == 'frontal lobe'
+    assert normalize_text(None) == ''
+
+def test_match_term():
+
+    docs = [' frontal lobe memory ', ' frontal lobe ', ' temporal lobe ']
+
+    match = match_term(docs, Term('frontal', ['frontal lobe'], [], ['memory']))
+    assert np.array_equal(match, [False, True, False])
+
+    match = match_term(docs, Term('lobe', ['frontal lobe', 'temporal lobe'], [], []))
+    assert np.array_equal(match, [True, True, True])
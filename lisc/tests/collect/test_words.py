@@ -3,6 +3,11 @@
 import requests
 from bs4 import BeautifulSoup
 
+from lisc.requester import Requester, ReplayServer
+from lisc.requester.replay import save_fixture
+from lisc.urls.eutils import EUtils
+from lisc.modutils.errors import CollectionStopped
+
 from lisc.collect.words import *
 
 ###################################################################################################
@@ -38,6 +43,78 @@ def test_collect_words_history(tdb, test_req):
     for field in ['titles', 'authors', 'ids', 'journals', 'keywords', 'words', 'years']:
         assert getattr(res[0], field) == []
 
+def test_collect_words_hooks(test_req):
+
+    terms = [['science'], ['engineering']]
+
+    batches = []
+    def on_batch_parsed(ind, arts):
+        batches.append(ind)
+        raise CollectionStopped
+
+    # Test stopping after the first batch, which drops the incomplete term
+    res, meta_data = collect_words(terms, retmax=2, hooks={'on_batch_parsed' : on_batch_parsed},
+                                   logging=test_req)
+    assert batches == [0]
+    assert len(res) == 0
+
+def test_collect_words_hooks_error(tmp_path):
+
+    terms = [['science']]
+
+    # Define an article page, with an article missing the publication date, which fails to parse
+    article = ('<PubmedArticle><ArticleId IdType="pubmed">{}</ArticleId>'
+               '<ArticleTitle>Title</ArticleTitle><PubDate>{}</PubDate></PubmedArticle>')
+    articles = article.format(1, '<Year>2000</Year>') + article.format(2, '<Month>Jan</Month>')
+
+    urls = EUtils(db='pubmed', retmax='100', field='TIAB', usehistory='n', retmode='xml')
+    urls.build_url('search', settings=['db', 'usehistory', 'retmax', 'retmode', 'field'])
+    urls.build_url('fetch', settings=['db', 'retmode'])
+    save_fixture(urls.get_url('search', settings={'term' : '("science")'}),
+                 '<Count>2</Count><IdList><Id>1</Id><Id>2</Id></IdList>', tmp_path)
+    save_fixture(urls.get_url('fetch', settings={'id' : '1,2'}),
+                 '<PubmedArticleSet>' + articles + '</PubmedArticleSet>', tmp_path)
+
+    # Test that a page that fails to parse is not partially added, and that the error is passed
+    errors = []
+    with ReplayServer(tmp_path) as server:
+        res, meta_data = collect_words(terms, collect_info=False,
+                                       hooks={'on_error' : lambda *args: errors.append(args)},
+                                       logging=Requester(redirect=server.url))
+
+    assert len(errors) == 1
+    assert isinstance(errors[0][1], TypeError)
+    assert len(res) == 1
+    assert res[0].n_articles == 0
+
+def test_collect_words_hooks_search_error(tmp_path):
+
+    terms = [['science'], ['engineering']]
+
+    # Collect from an empty replay server, for which each search fails to parse
+    errors = []
+    with ReplayServer(tmp_path) as server:
+        res, meta_data = collect_words(terms, collect_info=False,
+                                       hooks={'on_error' : lambda *args: errors.append(args)},
+                                       logging=Requester(redirect=server.url))
+
+    assert len(errors) == len(terms)
+    assert [arts.n_articles for arts in res] == [0, 0]
+
+def test_collect_words_hooks_reset(tmp_path):
+
+    calls = []
+    with ReplayServer(tmp_path) as server:
+        req = Requester(redirect=server.url)
+        req.set_request_hook(print)
+        collect_words([['science']], collect_info=False, logging=req,
+                      hooks={'on_request' : lambda *args: calls.append(args),
+                             'on_error' : lambda *args: None})
+
+    # The hook should be used for the collection, and then the previous hook restored
+    assert len(calls) == 1
+    assert req._on_request is print
+
 def test_get_article_info():
 
     arts = Articles('test')
@@ -92,3 +92,44 @@ def test_process(tarts_data):
     # Check error raised if trying to process twice
     with raises(ProcessingError):
         assert tarts_data.process()
+
+def test_compact(tarts_data):
+
+    items = list(tarts_data)
+
+    tarts_data.compact()
+    assert tarts_data.is_compact
+    assert len(tarts_data) == len(items)
+    for item, compact_item in zip(items, tarts_data):
+        assert compact_item['year'] == item['year']
+        assert list(compact_item['journal']) == item['journal']
+
+    tarts_data.process()
+    assert tarts_data.is_compact
+    assert tarts_data.journals == ['science'] * len(items)
+
+    arts = Articles('label', compact=True)
+    arts.add_data('years', 2000)
+    assert arts.years == [2000]
+
+def test_load_lazy(tdb, tarts_data):
+
+    tarts_data.save(tdb)
+
+    data = Articles(Term('label', ['search'], ['inclusion'], ['exclusion']))
+    data.load(tdb, lazy=True)
+    assert 'ids' not in data.__dict__
+
+    assert data.n_articles == tarts_data.n_articles
+    assert data.titles == tarts_data.titles
+
+    data.unload()
+    assert 'titles' not in data.__dict__
+    assert data[0]['title'] == tarts_data.titles[0]
+
+    data.process()
+    with raises(ProcessingError):
+        data.unload()
+
+    with raises(ValueError):
+        tarts_data.unload()
@@ -1,6 +1,10 @@
 """Tests for lisc.data.articles_all."""
 
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
 from lisc.data.articles_all import *
+from lisc.tests.tdata import load_arts
 
 ###################################################################################################
 ###################################################################################################
@@ -44,3 +48,106 @@ def test_articles_all_empty(tarts):
 
     data_all.create_summary()
     assert data_all.summary
+
+def test_add_articles(tarts_data):
+
+    data_all = ArticlesAll(load_arts(add_data=True, n_data=2))
+    data_all.add_articles(tarts_data)
+
+    expected = ArticlesAll(load_arts(add_data=True, n_data=4))
+    assert data_all.n_articles == expected.n_articles
+    for attr in COUNT_ATTRS:
+        assert getattr(data_all, attr) == getattr(expected, attr)
+
+def test_merge():
+
+    data_all = ArticlesAll(load_arts(add_data=True, n_data=2))
+    data_all.merge(ArticlesAll(load_arts(add_data=True, n_data=1)))
+
+    expected = ArticlesAll(load_arts(add_data=True, n_data=3))
+    assert data_all.ids == [0, 1, 0]
+    for attr in COUNT_ATTRS:
+        assert getattr(data_all, attr) == getattr(expected, attr)
+
+def test_merge_max_words():
+
+    data_all = ArticlesAll(load_arts(add_data=True, n_data=1))
+    data_all.merge(ArticlesAll(load_arts(add_data=True, n_data=2), max_words=100))
+
+    # With capacity for all words, the merged counts should be exact
+    expected = ArticlesAll(load_arts(add_data=True, n_data=3))
+    for attr in COUNT_ATTRS:
+        assert getattr(data_all, attr) == getattr(expected, attr)
+
+def test_articles_all_executor():
+
+    expected = ArticlesAll(load_arts(add_data=True, n_data=3, add_none=True))
+
+    with ThreadPoolExecutor(2) as executor:
+        data_all = ArticlesAll(load_arts(add_data=True, n_data=3, add_none=True),
+                               executor=executor, batch_size=1)
+
+    for attr in COUNT_ATTRS:
+        assert getattr(data_all, attr) == getattr(expected, attr)
+
+def test_articles_all_executor_processed():
+
+    arts = load_arts(add_data=True, n_data=3, add_none=True)
+    expected = ArticlesAll(load_arts(add_data=True, n_data=3, add_none=True))
+
+    # Check the input is processed once, in place, and is not processed again when re-added
+    with ThreadPoolExecutor(2) as executor:
+        data_all = ArticlesAll(arts, executor=executor, batch_size=1)
+        assert arts.processed
+        assert arts.words == process_articles(load_arts(add_data=True, n_data=3,
+                                                        add_none=True)).words
+        data_all.add_articles(arts, executor=executor, batch_size=2)
+
+    for attr in COUNT_ATTRS:
+        assert getattr(data_all, attr) == getattr(expected, attr) + getattr(expected, attr)
+
+def test_get_top(tarts_all):
+
+    top = tarts_all.get_top('words', 2)
+    assert top == tarts_all.words.most_common(2)
+    assert tarts_all.get_top('words', 1) == top[:1]
+    assert len(tarts_all.get_top('words', 100)) == len(tarts_all.words)
+
+    # Check the cache is cleared when adding data
+    tarts_all.add_articles(load_arts(add_data=True, n_data=2))
+    assert tarts_all.get_top('words', 2) == tarts_all.words.most_common(2)
+
+def test_articles_all_max_words():
+
+    data_all = ArticlesAll(load_arts(add_data=True, n_data=2), max_words=2)
+    data_all.add_articles(load_arts(add_data=True, n_data=2))
+
+    assert len(data_all.words) == 2
+    assert data_all.get_top('words', 2) == data_all.words.most_common(2)
+    data_all.check_frequencies()
+
+def test_count_articles(tarts_data):
+
+    counts = count_articles(process_articles(tarts_data))
+    assert set(counts.keys()) == set(COUNT_ATTRS)
+
+def test_articles_all_pickle():
+
+    # Check objects pickled before the cache of most common items was added can be used
+    data_all = ArticlesAll(load_arts(add_data=True, n_data=2))
+    del data_all._top
+    data_all = pickle.loads(pickle.dumps(data_all))
+
+    assert data_all.get_top('words', 2) == data_all.words.most_common(2)
+    data_all.create_summary()
+
+def test_articles_all_pickle_exclusions():
+
+    # Check objects pickled before exclusions were stored can have articles added
+    data_all = ArticlesAll(load_arts(add_data=True, n_data=1))
+    del data_all._exclusions
+    data_all = pickle.loads(pickle.dumps(data_all))
+
+    data_all.add_articles(load_arts(add_data=True, n_data=1))
+    assert data_all.n_articles == 2
+    assert data_all.label not in data_all.words
@@ -0,0 +1,60 @@
+"""Tests for lisc.data.cache."""
+
+from lisc.data.cache import *
+from lisc.data.articles import Articles
+
+from lisc.tests.tdata import load_arts
+
+###################################################################################################
+###################################################################################################
+
+def test_articles_cache(tdb):
+
+    labels = ['cache1', 'cache2', 'cache3']
+    for label in labels:
+        arts = load_arts(add_data=True, n_data=2)
+        arts.term = arts.term._replace(label=label)
+        arts.save(tdb)
+
+    cache = ArticlesCache(max_articles=4)
+    results = [Articles(label) for label in labels]
+    for arts in results:
+        arts.load(tdb, lazy=True, cache=cache)
+    assert cache.n_loaded == 0
+
+    # Access data for each object, which should unload the least recently used
+    assert results[0].n_articles == 2
+    assert results[1].n_articles == 2
+    cache.touch(results[0])
+    assert results[2].n_articles == 2
+
+    assert cache.n_loaded == 2
+    assert cache.n_articles == 4
+    assert 'ids' in results[0].__dict__
+    assert 'ids' not in results[1].__dict__
+
+    # Check unloaded data is reloaded when accessed again
+    assert results[1].n_articles == 2
+    assert cache.n_articles <= 4
+
+def test_results_list(tdb):
+
+    labels = ['cache1', 'cache2', 'cache3']
+    for label in labels:
+        arts = load_arts(add_data=True, n_data=2)
+        arts.term = arts.term._replace(label=label)
+        arts.save(tdb)
+
+    cache = ArticlesCache(max_articles=4)
+    results = ResultsList(Articles(label) for label in labels)
+    for arts in results:
+        arts.load(tdb, lazy=True, cache=cache)
+
+    # Accessing an object from the list should mark it as recently used
+    assert results[0].n_articles == 2
+    assert results[1].n_articles == 2
+    results[0]
+    assert results[2].n_articles == 2
+
+    assert 'ids' in results[0].__dict__
+    assert 'ids' not in results[1].__dict__
@@ -0,0 +1,64 @@
+"""Tests for lisc.data.compact."""
+
+import pickle
+
+from lisc.data.compact import *
+
+###################################################################################################
+###################################################################################################
+
+def test_categorical_list():
+
+    values = [('Journal A', 'J A'), ('Journal B', 'J B'), ['Journal A', 'J A'], None]
+    cats = CategoricalList(values)
+
+    assert len(cats) == len(values)
+    assert len(cats.categories) == 3
+    assert cats[0] == cats[2] == ('Journal A', 'J A')
+    assert cats[0] is cats[2]
+    assert cats[-1] is None
+    assert cats[0:2] == [('Journal A', 'J A'), ('Journal B', 'J B')]
+
+    cats[3] = 'Journal C'
+    assert cats[3] == 'Journal C'
+
+    cats.append('Journal C')
+    assert len(cats.categories) == 4
+
+    reloaded = pickle.loads(pickle.dumps(cats))
+    assert reloaded == cats
+    reloaded.append('Journal C')
+    assert len(reloaded.categories) == 4
+
+def test_ragged_categorical_list():
+
+    values = [[('Smith', 'J')], None, [('Smith', 'J'), ('Doe', 'A')], []]
+    ragged = RaggedCategoricalList(values)
+
+    assert len(ragged) == len(values)
+    assert len(ragged.items.categories) == 2
+    assert ragged == values
+    assert ragged[1] is None
+    assert ragged[-1] == []
+    assert ragged[2] == [('Smith', 'J'), ('Doe', 'A')]
+    assert ragged[1:3] == values[1:3]
+
+def test_integer_list():
+
+    values = [2000, None, 2010]
+    years = IntegerList(values)
+
+    assert len(years) == len(values)
+    assert years == values
+    assert years[1] is None
+    assert years[0:2] == [2000, None]
+
+    years[1] = 2005
+    assert years[1] == 2005
+
+def test_intern_value():
+
+    assert intern_value('word') == 'word'
+    assert intern_value(['a', ['b', 'c']]) == ('a', ('b', 'c'))
+    assert intern_value(None) is None
+    assert intern_value(12) == 12
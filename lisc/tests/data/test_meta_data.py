@@ -2,6 +2,8 @@
 
 from datetime import datetime
 
+from lisc.requester import Requester
+
 from lisc.data.meta_data import *
 
 ###################################################################################################
@@ -68,3 +70,36 @@ def test_meta_data_dict_managment(tmetadict):
     assert isinstance(unpacked_dict, dict)
 
     assert unpacked_dict == tmetadict
+
+def test_meta_data_add_metrics(tmetadata, treq):
+
+    tmetadata.add_metrics(treq.metrics)
+    assert tmetadata.metrics['n_requests'] == 0
+
+    tmetadata.add_requester(treq)
+    assert isinstance(tmetadata.metrics, dict)
+    assert 'metrics_n_bytes' in tmetadata.as_dict()
+
+def test_meta_data_add_api_keys(tmetadata):
+
+    pool = KeyPool(['key_project_a', 'key_project_b'])
+    pool.acquire()
+
+    tmetadata.add_requester(Requester(key_pool=pool))
+    assert tmetadata.api_keys['key_0']['n_requests'] == 1
+    assert tmetadata.api_keys['key_0']['key'] == '****ct_a'
+
+    meta_dict = tmetadata.as_dict()
+    assert 'api_keys_key_1' in meta_dict
+
+    meta_data = MetaData()
+    meta_data.from_dict(meta_dict)
+    assert meta_data.api_keys == tmetadata.api_keys
+
+def test_meta_data_from_dict_no_metrics(tmetadict):
+
+    tmetadict = {key : val for key, val in tmetadict.items() if 'metrics' not in key}
+
+    meta_data = MetaData()
+    meta_data.from_dict(tmetadict)
+    assert meta_data.metrics is None
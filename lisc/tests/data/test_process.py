@@ -1,5 +1,7 @@
 """Tests for lisc.data.process."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 from lisc.data.process import *
 from lisc.data.process import _process_authors, _fix_author_names
 
@@ -49,3 +51,21 @@ def test_fix_author_names():
     assert out[1] == ('Doe', 'JR')
     assert None not in out
     assert out[-1] == ('Last', 'FM')
+
+def test_process_in_batches(tarts_data):
+
+    arts_serial = process_articles(tarts_data, process_copy=True)
+
+    with ThreadPoolExecutor(2) as executor:
+        arts_batch = process_in_batches(tarts_data, process_articles, executor, batch_size=1)
+
+    for field in DATA_FIELDS:
+        assert getattr(arts_batch, field) == getattr(arts_serial, field)
+
+def test_split_articles(tarts_data):
+
+    batches = split_articles(tarts_data, 1)
+    assert len(batches) == tarts_data.n_articles
+    for ind, batch in enumerate(batches):
+        assert batch.n_articles == 1
+        assert batch.ids == [tarts_data.ids[ind]]
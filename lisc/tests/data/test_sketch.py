@@ -0,0 +1,52 @@
+"""Tests for lisc.data.sketch."""
+
+from collections import Counter
+
+from lisc.data.sketch import *
+
+###################################################################################################
+###################################################################################################
+
+def test_space_saving_counter():
+
+    counter = SpaceSavingCounter(3, ['a', 'b', 'a', 'c'])
+
+    assert len(counter) == 3
+    assert counter['a'] == 2
+    assert counter['d'] == 0
+    assert 'a' in counter
+    assert counter.floor == 0
+    assert counter.most_common(1) == [('a', 2)]
+
+def test_space_saving_counter_bounded():
+
+    items = ['a'] * 10 + ['b'] * 8 + ['c'] * 5 + list('defghij')
+    expected = Counter(items)
+
+    counter = SpaceSavingCounter(3)
+    for ind in range(0, len(items), 4):
+        counter.update(items[ind:ind + 4])
+
+    assert len(counter) == 3
+    assert [item for item, _ in counter.most_common(2)] == ['a', 'b']
+
+    # Counts should be overestimated by at most the floor
+    for item, count in counter.items():
+        assert expected[item] <= count <= expected[item] + counter.floor
+
+def test_space_saving_counter_merge():
+
+    counter1 = SpaceSavingCounter(2, ['a', 'a', 'b', 'c'])
+    counter2 = SpaceSavingCounter(2, ['a', 'd', 'd', 'e'])
+
+    counter1.update(counter2)
+    assert counter1.floor == 2
+    assert len(counter1) == 2
+    assert counter1['a'] >= 3
+
+def test_space_saving_counter_counter():
+
+    counter = Counter(['a', 'b'])
+    counter.update(SpaceSavingCounter(2, ['a', 'a', 'c']))
+
+    assert counter == Counter({'a' : 3, 'b' : 1, 'c' : 1})
@@ -49,6 +49,10 @@ def test_tokenize():
     assert tokens[-1] == 'things'
     assert len(tokens) == 13
 
+    # Check kept and custom punctuation
+    tokens = tokenize("A task-related, and/or 2.5 fold (change).")
+    assert tokens == ['A', 'task-related', 'and/or', '2.5', 'fold', 'change']
+
 def test_convert_string():
 
     string_words = 'The Last wOrd, in the bRain!'
@@ -58,6 +62,24 @@ def test_convert_string():
 
     assert words_out == expected
 
+def test_convert_strings():
+
+    texts = ['The Last wOrd, in the bRain!', 'Another sentence. With (more) words.']
+
+    words_out = convert_strings(texts)
+    assert words_out == [convert_string(text) for text in texts]
+
+    words_out = convert_strings(texts, stopwords=['last', 'another'])
+    assert words_out[0] == ['the', 'word', 'in', 'the', 'brain']
+
+def test_get_stopwords_set():
+
+    assert get_stopwords_set(STOPWORDS) is STOPWORDS_SET
+
+    stopwords = get_stopwords_set(['a', 'b'])
+    assert isinstance(stopwords, frozenset)
+    assert 'a' in stopwords
+
 def test_lower_list():
 
     words = ['The', 'Cool', 'Project']
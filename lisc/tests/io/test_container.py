@@ -0,0 +1,41 @@
+"""Tests for lisc.io.container."""
+
+import numpy as np
+from pytest import raises
+
+from lisc.io.container import *
+
+###################################################################################################
+###################################################################################################
+
+def test_write_read_container(tmp_path):
+
+    file_path = tmp_path / 'test.lisc'
+    arrays = {'ints' : np.arange(12).reshape(3, 4), 'floats' : np.ones(5) / 3,
+              'fortran' : np.asfortranarray(np.arange(6.).reshape(2, 3)), 'empty' : np.zeros(0)}
+
+    write_container(file_path, {'label' : 'test'}, arrays)
+    assert is_container(file_path)
+
+    header = read_container_header(file_path)
+    assert header['label'] == 'test'
+    assert header['format_version'] == FORMAT_VERSION
+    assert all(offset % ALIGNMENT == 0 for offset in header['arrays'].values())
+
+    for mmap_mode in ['r', None]:
+        header, loaded = read_container(file_path, mmap_mode=mmap_mode)
+        for label, array in arrays.items():
+            assert np.array_equal(loaded[label], array)
+            assert loaded[label].dtype == array.dtype
+
+    assert isinstance(read_container(file_path)[1]['ints'], np.memmap)
+
+def test_read_container_errors(tmp_path):
+
+    file_path = tmp_path / 'test.p'
+    with open(file_path, 'wb') as f_obj:
+        f_obj.write(b'\x80' * PREAMBLE_SIZE)
+
+    assert not is_container(file_path)
+    with raises(ValueError):
+        read_container_header(file_path)
@@ -2,11 +2,17 @@
 
 import os
 
-from pytest import raises
+import numpy as np
+from pytest import raises, warns
 
 from lisc.data import MetaData
+from lisc.data import Articles
 from lisc.objects import Counts1D, Counts, Words
+from lisc.tests.tdata import load_words, load_arts
 
+from lisc.io.db import create_file_structure
+from lisc.io.time import TimeResults
+from lisc.io.container import is_container
 from lisc.io.io import *
 
 ###################################################################################################
@@ -55,12 +61,17 @@ def test_save_object(tdb, tcounts1d, tcounts, twords):
     save_object(tcounts, 'test_counts', directory=tdb)
     save_object(twords, 'test_words', directory=tdb)
 
-    assert os.path.exists(tdb.get_folder_path('counts') / 'test_counts1d.p')
-    assert os.path.exists(tdb.get_folder_path('counts') / 'test_counts.p')
-    assert os.path.exists(tdb.get_folder_path('words') / 'test_words.p')
+    assert os.path.exists(tdb.get_folder_path('counts') / 'test_counts1d.lisc')
+    assert os.path.exists(tdb.get_folder_path('counts') / 'test_counts.lisc')
+    assert os.path.exists(tdb.get_folder_path('words') / 'test_words.lisc')
+
+    save_object(tcounts, 'test_counts_pickle', directory=tdb, file_format='pickle')
+    assert os.path.exists(tdb.get_folder_path('counts') / 'test_counts_pickle.p')
 
     with raises(ValueError):
         save_object(['bad data'], 'test_bad', directory=tdb)
+    with raises(ValueError):
+        save_object(tcounts, 'test_bad', directory=tdb, file_format='bad')
 
 def test_load_object(tdb):
 
@@ -70,6 +81,126 @@ def test_load_object(tdb):
     words = load_object('test_words', directory=tdb)
     assert isinstance(words, Words)
 
+    counts = load_object('test_counts_pickle', directory=tdb)
+    assert isinstance(counts, Counts)
+
+    with raises(ValueError):
+        load_object('test_bad', directory=tdb)
+
+def test_save_load_object_data(tmp_path, tcounts1d_data, tcounts_data, twords_data, tmetadict):
+
+    tcounts_data.compute_score('normalize')
+    tcounts_data.meta_data = MetaData()
+    tcounts_data.meta_data.from_dict(tmetadict)
+
+    for obj in [tcounts1d_data, twords_data]:
+        save_object(obj, 'test_data', directory=tmp_path)
+        loaded = load_object('test_data', directory=tmp_path)
+        assert type(loaded) == type(obj)
+        assert loaded.terms == obj.terms
+        assert loaded.labels == obj.labels
+
+    loaded = load_object('test_data', directory=tmp_path, mmap_mode=None)
+    for result, loaded_result in zip(twords_data.results, loaded.results):
+        assert loaded_result.label == result.label
+        assert loaded_result.n_articles == result.n_articles
+        assert loaded_result.ids == result.ids
+
+    save_object(tcounts_data, 'test_counts', directory=tmp_path)
+    counts = load_object('test_counts.lisc', directory=tmp_path, mmap_mode='r')
+    assert isinstance(counts.counts, np.memmap)
+    assert np.array_equal(counts.counts, tcounts_data.counts)
+    for dim in ['A', 'B']:
+        assert counts.terms[dim].terms == tcounts_data.terms[dim].terms
+        assert counts.terms[dim].labels == tcounts_data.terms[dim].labels
+    assert np.array_equal(counts.score, tcounts_data.score)
+    assert np.array_equal(counts.terms['A'].counts, tcounts_data.terms['A'].counts)
+    assert counts.score_info == tcounts_data.score_info
+    assert counts.meta_data.as_dict() == tcounts_data.meta_data.as_dict()
+
+    counts = load_object('test_counts', directory=tmp_path)
+    assert not isinstance(counts.counts, np.memmap)
+    counts.counts[0, 0] += 1
+
+    save_object(tcounts_data, 'test_counts_ext.p', directory=tmp_path)
+    assert os.path.exists(tmp_path / 'test_counts_ext.p')
+    assert not is_container(tmp_path / 'test_counts_ext.p')
+    counts = load_object('test_counts_ext.p', directory=tmp_path)
+    assert np.array_equal(counts.counts, tcounts_data.counts)
+
+def test_save_object_loaded(tmp_path, tcounts_data):
+
+    save_object(tcounts_data, 'test_counts', directory=tmp_path)
+
+    # Check re-saving a loaded object, with arrays memory mapped from the file being replaced
+    counts = load_object('test_counts', directory=tmp_path)
+    counts.compute_score('normalize')
+    save_object(counts, 'test_counts', directory=tmp_path)
+
+    loaded = load_object('test_counts', directory=tmp_path)
+    assert np.array_equal(loaded.counts, tcounts_data.counts)
+    assert np.allclose(loaded.score, counts.score)
+    assert loaded.score_info['type'] == 'normalize'
+
+def test_load_object_header(tmp_path, tcounts_data):
+
+    save_object(tcounts_data, 'test_counts', directory=tmp_path)
+
+    header = load_object_header('test_counts', directory=tmp_path)
+    assert header['object'] == 'Counts'
+    assert header['terms']['A']['terms'] == tcounts_data.terms['A'].terms
+    assert 'counts' in header['arrays']
+
+def test_save_object_words(tmp_path, twords_data):
+
+    save_object(twords_data, 'test_words', directory=tmp_path)
+
+    # Check that article data is stored in sections, not in the header
+    header = load_object_header('test_words', directory=tmp_path)
+    assert 'data' not in header['results'][0]
+    assert 'result_0' in header['arrays']
+
+    words = load_object('test_words', directory=tmp_path)
+    assert words.results[0].titles == twords_data.results[0].titles
+
+    twords_data.process_combined_results()
+    with warns(UserWarning):
+        save_object(twords_data, 'test_words', directory=tmp_path)
+
+def test_load_object_reload(tdb):
+
+    words = load_words(add_terms=True)
+    for ind in range(words.n_terms):
+        arts = load_arts(add_data=True, n_data=2)
+        arts.term = words.get_term(ind)
+        arts.save(tdb)
+        words.results.append(Articles(arts.term))
+    save_object(words, 'test_words_reload', directory=tdb)
+
+    words = load_object('test_words_reload', directory=tdb, reload_results=True, lazy=False)
+    assert len(words.results) == 2
+    for result in words.results:
+        assert result.n_articles == 2
+
+    words = load_object('test_words_reload', directory=tdb, reload_results=True, lazy=True,
+                        max_articles=2)
+    for result in words.results:
+        assert 'ids' not in result.__dict__
+    for result in words:
+        assert result.n_articles == 2
+    assert 'ids' not in words.results[0].__dict__
+    assert 'ids' in words.results[1].__dict__
+
+    # Check processed results are kept as loaded, rather than being unloaded
+    words = load_object('test_words_reload', directory=tdb)
+    words.results[0] = load_arts(add_data=True, n_data=2)
+    words.results[0].process()
+    save_object(words, 'test_words_reload_processed', directory=tdb)
+    words = load_object('test_words_reload_processed', directory=tdb,
+                        reload_results=True, lazy=True)
+    assert words.results[0].processed
+    assert words.results[0].n_articles == 2
+
 def test_save_time_results(tdb, tcounts1d):
 
     year_results = {1950 : tcounts1d, 2000 : tcounts1d}
@@ -85,6 +216,17 @@ def test_load_time_resuts(tdb):
     for key in expected_keys:
         assert isinstance(year_results[key], Counts1D)
 
+    year_results = load_time_results('test_time', 'time_counts1d', directory=tdb, lazy=True)
+    assert isinstance(year_results, TimeResults)
+    assert list(year_results.keys()) == expected_keys
+    assert year_results.n_loaded == 0
+    assert isinstance(year_results[2000], Counts1D)
+    assert year_results.n_loaded == 1
+
+    year_results = load_time_results('test_time', 'time_counts1d', directory=tdb, n_jobs=2)
+    assert isinstance(year_results, dict)
+    assert list(year_results.keys()) == expected_keys
+
 def test_save_meta_data(tdb, tmetadata):
 
     save_meta_data(tmetadata, 'test_meta_save', tdb)
@@ -94,3 +236,50 @@ def test_load_meta_data(tdb):
 
     meta_data = load_meta_data('test_meta_save', tdb)
     assert isinstance(meta_data, MetaData)
+
+def test_save_load_manifest(tmp_path, tcounts1d, tmetadata, tarts_data):
+
+    db = create_file_structure(tmp_path)
+
+    save_time_results({1990 : tcounts1d, 2000 : tcounts1d}, 'test_time', 'time', directory=db)
+    save_object(tcounts1d, 'test_counts1d', directory=db)
+    save_meta_data(tmetadata, 'test_meta', db)
+    tarts_data.save(db)
+
+    manifest = db.manifest
+    assert manifest.get('counts', 'test_counts1d')['object'] == 'Counts1D'
+    assert manifest.get_labels('counts', prefix='test_time/') == \
+        ['test_time/time_1990', 'test_time/time_2000']
+    assert manifest.get('logs', 'test_meta')['object'] == 'MetaData'
+    assert manifest.get('raw', tarts_data.label)['object'] == 'Articles'
+
+    assert isinstance(load_object('test_counts1d', directory=db), Counts1D)
+    year_results = load_time_results('test_time', directory=db)
+    assert list(year_results.keys()) == [1990, 2000]
+
+    # Check that files that are not in the manifest are still found
+    os.remove(db.paths['base'] / 'manifest.json')
+    assert db.manifest.entries == {}
+    assert isinstance(load_object('test_counts1d', directory=db), Counts1D)
+    assert list(load_time_results('test_time', directory=db).keys()) == [1990, 2000]
+
+def test_load_manifest_unlisted(tmp_path, tcounts1d, tcounts):
+
+    db = create_file_structure(tmp_path)
+
+    # Check that results saved without the database object are still loaded
+    folder_path = db.get_folder_path('counts') / 'test_time'
+    os.makedirs(folder_path)
+    for year in [1990, 2000]:
+        save_object(tcounts1d, 'time_' + str(year), folder_path)
+    assert list(load_time_results('test_time', 'time', db).keys()) == [1990, 2000]
+
+    # Check that, once results are in the manifest, files are found from the manifest
+    save_time_results({2010 : tcounts1d}, 'test_time', 'time', directory=db)
+    assert list(load_time_results('test_time', 'time', db).keys()) == [2010]
+    assert not load_time_results('test_time', 'other', db, lazy=True)
+
+    # Check that a newer container file is used over an older pickle file in the manifest
+    save_object(tcounts1d, 'test_object', directory=db, file_format='pickle')
+    save_object(tcounts, 'test_object', directory=db.get_folder_path('counts'))
+    assert isinstance(load_object('test_object', directory=db), Counts)
@@ -0,0 +1,77 @@
+"""Tests for lisc.io.manifest."""
+
+import os
+
+from lisc.io.manifest import *
+
+###################################################################################################
+###################################################################################################
+
+def test_manifest(tmp_path):
+
+    file_path = tmp_path / 'data' / 'test.txt'
+    os.makedirs(file_path.parent)
+    with open(file_path, 'w') as f_obj:
+        f_obj.write('lisc')
+
+    manifest = Manifest(tmp_path / MANIFEST_FILE)
+    assert manifest.entries == {}
+    assert manifest.get('data', 'test') is None
+    assert manifest.get_path('data', 'test') is None
+
+    manifest.add('data', 'test', file_path, 'Text')
+    entry = manifest.get('data', 'test')
+    assert entry['path'] == 'data/test.txt'
+    assert entry['size'] == 4
+    assert entry['object'] == 'Text'
+    assert entry['sha256'] == compute_file_hash(file_path)
+    assert manifest.get_path('data', 'test') == file_path
+    assert manifest.get_labels('data') == ['test']
+    assert manifest.get_labels('data', prefix='other') == []
+
+    # Check that the manifest is saved, and that other objects reload changes
+    manifest2 = Manifest(tmp_path / MANIFEST_FILE)
+    assert manifest2.entries == manifest.entries
+    manifest.add('data', 'test2', file_path, 'Text')
+    manifest2.reload()
+    assert manifest2.get_labels('data') == ['test', 'test2']
+
+    # Check that files that no longer exist are not returned
+    os.remove(file_path)
+    assert manifest.get_path('data', 'test') is None
+
+def test_manifest_batch(tmp_path):
+
+    with open(tmp_path / 'test.txt', 'w') as f_obj:
+        f_obj.write('lisc')
+
+    manifest = Manifest(tmp_path / MANIFEST_FILE)
+    with manifest.batch():
+        for ind in range(3):
+            manifest.add('data', 'test' + str(ind), tmp_path / 'test.txt', 'Text')
+        assert not (tmp_path / MANIFEST_FILE).exists()
+
+    assert Manifest(tmp_path / MANIFEST_FILE).get_labels('data') == ['test0', 'test1', 'test2']
+
+def test_manifest_writers(tmp_path):
+
+    with open(tmp_path / 'test.txt', 'w') as f_obj:
+        f_obj.write('lisc')
+
+    # Check that writers with separate manifest objects do not lose each other's entries
+    manifest1 = Manifest(tmp_path / MANIFEST_FILE)
+    manifest2 = Manifest(tmp_path / MANIFEST_FILE)
+    manifest1.add('data', 'test1', tmp_path / 'test.txt', 'Text')
+    manifest2.add('data', 'test2', tmp_path / 'test.txt', 'Text')
+    manifest1.add('data', 'test3', tmp_path / 'test.txt', 'Text')
+
+    assert Manifest(tmp_path / MANIFEST_FILE).get_labels('data') == ['test1', 'test2', 'test3']
+    assert not (tmp_path / (MANIFEST_FILE + '.lock')).exists()
+
+def test_compute_file_hash(tmp_path):
+
+    with open(tmp_path / 'test.txt', 'w') as f_obj:
+        f_obj.write('lisc')
+
+    assert compute_file_hash(tmp_path / 'test.txt', chunk_size=1) == \
+        compute_file_hash(tmp_path / 'test.txt')
@@ -0,0 +1,42 @@
+"""Tests for lisc.io.time."""
+
+from pytest import raises
+
+from lisc.objects import Counts1D
+from lisc.io.io import save_object
+
+from lisc.io.time import *
+
+###################################################################################################
+###################################################################################################
+
+def test_time_results(tmp_path, tcounts1d):
+
+    files = {}
+    for year in [2000, 1990, 2010]:
+        files[year] = 'counts_{}.lisc'.format(year)
+        save_object(tcounts1d, files[year], directory=tmp_path)
+
+    results = TimeResults(files, tmp_path)
+    assert list(results.keys()) == [1990, 2000, 2010]
+    assert len(results) == 3
+    assert 1990 in results
+    assert results.n_loaded == 0
+
+    assert isinstance(results[2000], Counts1D)
+    assert results[2000] is results[2000]
+    assert results.n_loaded == 1
+
+    with raises(KeyError):
+        results[1980]
+
+    results.load_all(n_jobs=2)
+    assert results.n_loaded == 3
+    assert all(isinstance(result, Counts1D) for result in results.values())
+
+    results = TimeResults(files, tmp_path)
+    results.load_all(n_jobs=2, pool='process')
+    assert results.n_loaded == 3
+
+    with raises(ValueError):
+        TimeResults(files, tmp_path).load_all(n_jobs=2, pool='bad')
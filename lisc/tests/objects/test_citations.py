@@ -0,0 +1,118 @@
+"""Tests for lisc.objects.citations."""
+
+import json
+
+import numpy as np
+
+from lisc.requester import Requester, ReplayServer
+from lisc.requester.replay import save_fixture
+from lisc.urls.open_citations import OpenCitations
+from lisc.data.meta_data import MetaData
+
+from lisc.objects.citations import CitationGraph
+
+###################################################################################################
+###################################################################################################
+
+def load_graph():
+
+    graph = CitationGraph('test_graph')
+    graph.add_citations({'doi_a' : ['doi_b', 'doi_c'], 'doi_b' : ['DOI_C'], 'doi_d' : None})
+
+    return graph
+
+def test_citation_graph():
+
+    graph = CitationGraph()
+    assert graph.n_nodes == graph.n_edges == 0
+
+def test_add_citations():
+
+    graph = load_graph()
+
+    assert graph.n_nodes == len(graph) == 4
+    assert graph.n_edges == 3
+    assert 'DOI_A' in graph
+    assert list(graph.expanded['citations']) == [True, True, True, False]
+    assert not graph.expanded['references'].any()
+
+    # Adding duplicate citations should not add edges
+    graph.add_citations({'doi_a' : ['doi_b']})
+    assert graph.n_edges == 3
+
+    # Check references, which have the opposite direction
+    graph.add_citations({'doi_a' : ['doi_e']}, util='references')
+    assert graph.n_edges == 4
+    assert graph.get_out_degree(['doi_a'])[0] == 1
+    assert graph.expanded['references'][graph.get_index('doi_a')]
+
+    # Check that DOIs for which requests failed are not marked as expanded
+    graph.add_citations({'doi_f' : None, 'doi_g' : None}, failed=['DOI_G'])
+    assert graph.expanded['citations'][graph.get_index('doi_f')]
+    assert not graph.expanded['citations'][graph.get_index('doi_g')]
+
+def test_get_index():
+
+    graph = load_graph()
+
+    assert graph.get_index('doi_a') == 0
+    assert list(graph.get_index(['doi_c', 'doi_x'])) == [3, -1]
+
+def test_degrees():
+
+    graph = load_graph()
+
+    assert list(graph.get_in_degree()) == [2, 1, 0, 0]
+    assert list(graph.get_out_degree()) == [0, 1, 0, 2]
+    assert list(graph.get_in_degree(['doi_b', 'doi_x'])) == [1, 0]
+
+def test_get_neighbours():
+
+    graph = load_graph()
+
+    assert list(graph.get_neighbours([0], 'in')) == [1, 3]
+    assert list(graph.get_neighbours([3], 'out')) == [0, 1]
+
+def test_run_collection_incremental(test_req):
+
+    graph = load_graph()
+    graph.expanded['citations'][:] = True
+
+    # All DOIs have been expanded, so no requests should be made
+    graph.run_collection(['doi_a'], depth=2, logging=test_req)
+    assert graph.meta_data[-1].requester['n_requests'] == 0
+
+def test_run_collection_failed(tmp_path):
+
+    urls = OpenCitations()
+    urls.build_url('citations')
+    save_fixture(urls.get_url('citations', ['doi_a']),
+                 json.dumps([{'citing' : 'doi_b', 'cited' : 'doi_a'}]), tmp_path)
+
+    # The request for 'doi_x' has no fixture, and so fails, and should be collected again
+    graph = CitationGraph()
+    with ReplayServer(tmp_path) as server:
+        graph.run_collection(['doi_a', 'doi_x'], logging=Requester(redirect=server.url))
+        assert list(graph.expanded['citations']) == [True, False, False]
+        graph.run_collection(['doi_a', 'doi_x'], logging=Requester(redirect=server.url))
+
+    assert graph.n_edges == 1
+    assert graph.meta_data[-1].requester['n_requests'] == 1
+
+def test_save_load(tdb):
+
+    graph = load_graph()
+    meta_data = MetaData()
+    meta_data.add_settings({'util' : 'citations'})
+    graph.meta_data.append(meta_data)
+    graph.save(tdb)
+
+    loaded = CitationGraph('test_graph')
+    loaded.load(tdb)
+
+    assert loaded.dois == graph.dois
+    assert np.array_equal(loaded.sources, graph.sources)
+    assert np.array_equal(loaded.targets, graph.targets)
+    assert np.array_equal(loaded.expanded['citations'], graph.expanded['citations'])
+    assert loaded.get_index('doi_c') == 3
+    assert loaded.meta_data[0].settings == {'util' : 'citations'}
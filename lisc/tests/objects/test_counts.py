@@ -1,5 +1,10 @@
 """Tests for lisc.objects.counts."""
 
+import numpy as np
+
+from lisc.tests.tdata import load_arts, load_counts
+from lisc.tests.tutils import optional_test
+
 from lisc.objects.counts import Counts1D, Counts
 
 ###################################################################################################
@@ -62,6 +67,17 @@ def test_collect(test_req):
 
     counts.drop_data(10)
 
+@optional_test('scipy')
+def test_collect_local():
+
+    counts = Counts1D()
+    counts.add_terms(['words data', 'title'])
+    counts.run_local_collection([load_arts(add_data=True, n_data=2)])
+
+    assert counts.has_data
+    assert list(counts.counts) == [2, 2]
+    assert counts.meta_data.settings['source'] == 'local'
+
 ## Counts Object
 
 def test_counts():
@@ -107,3 +123,67 @@ def test_collect_two(test_req):
     check_dunders(counts)
     check_funcs(counts)
     drop_data(counts)
+
+@optional_test('scipy')
+def test_collect_local_one():
+
+    counts = Counts()
+    counts.add_terms(['words data', 'title', 'memory'], dim='A')
+    counts.run_local_collection([load_arts(add_data=True, n_data=2)])
+
+    assert counts.has_data
+    assert counts.square
+    assert counts.counts.shape == (3, 3)
+    assert list(counts.terms['A'].counts) == [2, 2, 0]
+    assert counts.counts[0, 1] == 2
+
+@optional_test('scipy')
+def test_collect_local_two():
+
+    counts = Counts()
+    counts.add_terms(['words data', 'memory'], dim='A')
+    counts.add_terms(['title'], dim='B')
+    counts.run_local_collection([load_arts(add_data=True, n_data=2)])
+
+    assert not counts.square
+    assert counts.counts.shape == (2, 1)
+    assert list(counts.counts[:, 0]) == [2, 0]
+
+    # Check that each set of terms is matched with its own joiners
+    counts = Counts()
+    counts.add_terms([['words data', 'memory']], dim='A')
+    counts.add_terms([['words data', 'memory']], dim='B')
+    counts.set_joiners(search='AND', dim='B')
+    counts.run_local_collection([load_arts(add_data=True, n_data=2)])
+    assert counts.terms['A'].counts[0] > counts.terms['B'].counts[0] == 0
+
+def test_counts_memmap(tmp_path):
+
+    counts = load_counts(add_terms=True, add_data=True, n_terms=(3, 4))
+    counts.counts[0, :] = 50
+    counts.compute_score('association')
+    orig = counts.copy()
+
+    counts.to_memmap(tmp_path)
+    assert isinstance(counts.counts, np.memmap)
+    assert isinstance(counts.score, np.memmap)
+    assert (tmp_path / 'counts.npy').exists()
+    assert np.array_equal(counts.counts, orig.counts)
+    assert counts.has_data
+    assert counts[0, 1] == orig[0, 1]
+
+    for score_type, dim in [('association', 'A'), ('normalize', 'B'), ('similarity', 'B')]:
+        counts.compute_score(score_type, dim=dim)
+        orig.compute_score(score_type, dim=dim)
+        assert isinstance(counts.score, np.memmap)
+        assert np.allclose(counts.score, orig.score, equal_nan=True)
+        assert np.allclose(np.load(tmp_path / 'score.npy'), orig.score, equal_nan=True)
+
+    for value, dim in [('coocs', 'B'), ('count', 'A')]:
+        counts.drop_data(40, dim=dim, value=value)
+        orig.drop_data(40, dim=dim, value=value)
+        assert isinstance(counts.counts, np.memmap)
+        assert np.array_equal(counts.counts, orig.counts)
+        assert np.array_equal(np.load(tmp_path / 'counts.npy'), orig.counts)
+        assert counts.terms['A'].labels == orig.terms['A'].labels
+        assert counts.terms['B'].labels == orig.terms['B'].labels
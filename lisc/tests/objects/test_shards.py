@@ -0,0 +1,109 @@
+"""Tests for lisc.objects.shards."""
+
+import numpy as np
+from pytest import raises
+
+from lisc.objects import Counts
+from lisc.requester import Requester, ReplayServer
+from lisc.requester.replay import save_fixture
+from lisc.collect.terms import join
+from lisc.collect.counts import make_counts_urls
+
+from lisc.objects.shards import *
+
+###################################################################################################
+###################################################################################################
+
+TERMS_A = ['language', 'memory', 'attention', 'perception', 'cognition']
+TERMS_B = ['brain', 'body']
+
+def _collect_all(directory, label, server_url):
+
+    while collect_shard(directory=directory, label=label,
+                        logging=Requester(redirect=server_url)) is not None:
+        pass
+
+def test_get_shard_bounds():
+
+    bounds = get_shard_bounds(np.array([5, 4, 3, 2, 1]), 3)
+    assert bounds[0] == 0 and bounds[-1] == 5
+    assert np.all(np.diff(bounds) >= 0)
+
+    bounds = get_shard_bounds(np.ones(2, dtype=int), 4)
+    assert len(bounds) == 5
+    assert bounds[-1] == 2
+
+def test_make_shards(tmp_path):
+
+    counts = Counts()
+    counts.add_terms(TERMS_A)
+
+    manifest = make_shards(counts, 3, directory=tmp_path, label='test')
+    assert manifest['square']
+    assert len(manifest['shards']) == 3
+    assert manifest['n_requests'] == len(TERMS_A) * (len(TERMS_A) + 1) // 2
+    assert (get_shard_folder(tmp_path, 'test') / 'manifest.json').exists()
+    assert get_shard_status(tmp_path, 'test')['unclaimed'] == [0, 1, 2]
+
+def test_claim_shard(tmp_path):
+
+    counts = Counts()
+    counts.add_terms(TERMS_A)
+    make_shards(counts, 2, directory=tmp_path)
+
+    assert claim_shard(2, tmp_path) == 0
+    assert claim_shard(2, tmp_path) == 1
+    assert claim_shard(2, tmp_path) is None
+    assert get_shard_status(tmp_path)['claimed'] == [0, 1]
+
+def test_collect_merge_shards_square(tmp_path):
+
+    counts = Counts()
+    counts.add_terms(TERMS_A)
+    manifest = make_shards(counts, 3, directory=tmp_path)
+
+    # Record responses for the count of the first term, and one co-occurrence
+    urls, _ = make_counts_urls(**manifest['settings'])
+    args = manifest['terms']['A']['args']
+    save_fixture(urls.get_url('search', settings={'term' : args[0]}), '<Count>5</Count>', tmp_path)
+    save_fixture(urls.get_url('search', settings={'term' : join(args[1], args[3], 'AND')}),
+                 '<Count>3</Count>', tmp_path)
+
+    with ReplayServer(tmp_path) as server:
+
+        _collect_all(tmp_path, 'shards', server.url)
+        assert get_shard_status(tmp_path)['collected'] == [0, 1, 2]
+
+    merged = merge_shards(tmp_path)
+    assert merged.square
+    assert merged.counts.shape == (5, 5)
+    assert merged.terms['A'].labels == TERMS_A
+    assert merged.terms['A'].counts[0] == 5
+    assert merged.counts[1, 3] == merged.counts[3, 1] == 3
+    assert (merged.counts >= 0).all()
+    assert merged.meta_data.settings['n_shards'] == 3
+    assert merged.meta_data.requester['n_requests'] == manifest['n_requests'] + 1
+
+def test_collect_merge_shards_two(tmp_path):
+
+    counts = Counts()
+    counts.add_terms(TERMS_A)
+    counts.add_terms(TERMS_B, dim='B')
+    manifest = make_shards(counts, 2, directory=tmp_path)
+    assert not manifest['square']
+
+    with ReplayServer(tmp_path) as server:
+
+        with raises(ValueError):
+            merge_shards(tmp_path)
+
+        _collect_all(tmp_path, 'shards', server.url)
+
+    merged = merge_shards(tmp_path)
+    assert merged.counts.shape == (5, 2)
+    assert len(merged.terms['B'].counts) == 2
+    assert (merged.counts == 0).all()
+    assert manifest['n_requests'] == 5 + 2 + 10
+
+    # The first shard also requests database information
+    assert merged.meta_data.requester['n_requests'] == manifest['n_requests'] + 1
@@ -1,8 +1,12 @@
 """Tests for lisc.objects.words"""
 
+import pickle
+
+import numpy as np
 from pytest import raises
 
 from lisc.data import Term, Articles
+from lisc.tests.tutils import optional_test
 from lisc.objects.words import Words
 
 ###################################################################################################
@@ -78,9 +82,65 @@ def test_process_articles(twords_data):
     twords_data.process_articles()
     assert twords_data.results[0].processed
 
+def test_process_articles_parallel(twords_data):
+
+    serial = twords_data.copy()
+    serial.process_articles()
+
+    twords_data.process_articles(n_jobs=2, batch_size=1)
+    for res_serial, res_parallel in zip(serial.results, twords_data.results):
+        assert res_parallel.processed
+        assert res_parallel.words == res_serial.words
+        assert res_parallel.authors == res_serial.authors
+
+def test_process_combined_results_parallel(twords_data):
+
+    serial = twords_data.copy()
+    serial.process_combined_results()
+
+    twords_data.process_combined_results(n_jobs=2, batch_size=1)
+    for res_serial, res_parallel in zip(serial.combined_results, twords_data.combined_results):
+        assert res_parallel.words == res_serial.words
+        assert res_parallel.authors == res_serial.authors
+
 def test_process_combined_results(twords_data):
 
     twords_data.process_combined_results()
     assert len(twords_data.results) == len(twords_data.combined_results)
     assert twords_data.results[0].dois == twords_data.combined_results[0].dois
     assert twords_data.results[0].authors != twords_data.combined_results[0].authors
+
+@optional_test('scipy')
+def test_get_document_term_matrix(twords_data):
+
+    dtm, vocab, doc_terms = twords_data.get_document_term_matrix(weighting='counts')
+    assert dtm.shape == (4, len(vocab))
+    assert list(doc_terms) == [0, 0, 1, 1]
+
+    # Check results are cached, and that the cache is cleared on processing
+    assert twords_data.get_document_term_matrix(weighting='counts')[0] is dtm
+    twords_data.process_articles()
+    assert twords_data.get_document_term_matrix(weighting='counts')[0] is not dtm
+
+    with raises(ValueError):
+        twords_data.get_document_term_matrix(weighting='bad')
+
+@optional_test('scipy')
+def test_get_document_term_matrix_pickle(twords_data):
+
+    twords_data.get_document_term_matrix(weighting='counts')
+
+    # Check the cache is not pickled, and that objects pickled without a cache can be used
+    words = pickle.loads(pickle.dumps(twords_data))
+    assert words._matrices == {}
+    del twords_data.__dict__['_matrices']
+    words = pickle.loads(pickle.dumps(twords_data))
+    dtm, vocab, doc_terms = words.get_document_term_matrix(weighting='counts')
+    assert dtm.shape == (4, len(vocab))
+
+@optional_test('scipy')
+def test_compute_similarity(twords_data):
+
+    similarity = twords_data.compute_similarity()
+    assert similarity.shape == (2, 2)
+    assert np.allclose(similarity, 1)
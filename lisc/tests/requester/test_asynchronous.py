@@ -0,0 +1,109 @@
+"""Tests for lisc.requester.asynchronous."""
+
+import asyncio
+
+from lisc.requester.replay import ReplayServer, save_fixture
+from lisc.requester.keys import KeyPool
+from lisc.tests.tutils import optional_test
+
+from lisc.requester.asynchronous import *
+
+###################################################################################################
+###################################################################################################
+
+TEST_URL = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?db=pubmed&term=brain'
+
+def test_async_requester():
+
+    assert AsyncRequester()
+
+def test_async_requester_as_dict():
+
+    req_dict = AsyncRequester().as_dict()
+    assert '_session' not in req_dict
+    assert '_async_lock' not in req_dict
+
+@optional_test('aiohttp')
+def test_async_request_url(tmp_path):
+
+    save_fixture(TEST_URL, '<Count>12</Count>', tmp_path)
+
+    async def request(req, n_requests):
+        async with req:
+            return await asyncio.gather(*[req.request_url(TEST_URL) for ind in range(n_requests)])
+
+    with ReplayServer(tmp_path) as server:
+        req = AsyncRequester(wait_time=0.01, logging='store', redirect=server.url)
+        pages = asyncio.run(request(req, 3))
+
+    assert [page.status_code for page in pages] == [200] * 3
+    assert pages[0].content == b'<Count>12</Count>'
+    assert req.n_requests == 3
+    assert req.log == [TEST_URL] * 3
+    assert req.metrics.n_requests == 3
+    assert req._session is None
+
+@optional_test('aiohttp')
+def test_async_requester_close(tmp_path):
+
+    save_fixture(TEST_URL, '<Count>12</Count>', tmp_path)
+
+    with ReplayServer(tmp_path) as server:
+        req = AsyncRequester(redirect=server.url)
+        asyncio.run(req.request_url(TEST_URL))
+        session = req._session
+        req.close()
+
+    assert session.closed
+    assert req._session is None
+    assert not req.is_active
+
+@optional_test('aiohttp')
+def test_async_requester_close_loop(tmp_path):
+
+    save_fixture(TEST_URL, '<Count>12</Count>', tmp_path)
+
+    async def request(req):
+        await req.request_url(TEST_URL)
+        session = req._session
+        req.close()
+        await req._close_task
+        return session
+
+    with ReplayServer(tmp_path) as server:
+        req = AsyncRequester(redirect=server.url)
+        session = asyncio.run(request(req))
+
+    assert session.closed
+    assert req._session is None
+
+@optional_test('aiohttp')
+def test_async_request_url_key_pool(tmp_path):
+
+    async def request(req, n_requests):
+        async with req:
+            return await asyncio.gather(*[req.request_url(TEST_URL) for ind in range(n_requests)])
+
+    with ReplayServer(tmp_path) as server:
+        req = AsyncRequester(redirect=server.url, key_pool=KeyPool(['key_a', 'key_b'], rate=20))
+        asyncio.run(request(req, 6))
+
+    usage = req.key_pool.as_dict()
+    assert [val['n_requests'] for val in usage.values()] == [3, 3]
+    assert req.metrics.throttle_time > 0
+
+@optional_test('aiohttp')
+def test_async_request_url_post(tmp_path):
+
+    url = TEST_URL + '&id=' + ','.join(['12345678'] * 500)
+    save_fixture(url, '<Count>12</Count>', tmp_path)
+
+    async def request(req):
+        async with req:
+            return await req.request_url(url, post=True)
+
+    with ReplayServer(tmp_path) as server:
+        page = asyncio.run(request(AsyncRequester(redirect=server.url)))
+
+    assert page.status_code == 200
+    assert page.content == b'<Count>12</Count>'
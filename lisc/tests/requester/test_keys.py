@@ -0,0 +1,81 @@
+"""Tests for lisc.requester.keys."""
+
+import time
+
+from pytest import raises
+
+from lisc.requester.keys import *
+
+###################################################################################################
+###################################################################################################
+
+def test_key_pool():
+
+    assert KeyPool(['key_a', 'key_b'])
+
+    for keys in [[], ['key_a', 'key_a']]:
+        with raises(ValueError):
+            KeyPool(keys)
+
+def test_key_pool_try_acquire():
+
+    pool = KeyPool(['key_a', 'key_b'], rate=1)
+
+    keys = [pool.try_acquire()[0] for ind in range(2)]
+    assert sorted(keys) == ['key_a', 'key_b']
+
+    key, wait_time = pool.try_acquire()
+    assert key is None
+    assert 0 < wait_time <= 1
+
+def test_key_pool_acquire():
+
+    pool = KeyPool(['key_a', 'key_b'], rate=20)
+
+    start = time.time()
+    keys = [pool.acquire()[0] for ind in range(6)]
+    elapsed = time.time() - start
+
+    # Six requests across two keys at 20/s each needs two refills, of 50 ms each
+    assert keys.count('key_a') == keys.count('key_b') == 3
+    assert 0.09 < elapsed < 0.5
+
+    usage = pool.as_dict()
+    assert set(usage.keys()) == {'key_0', 'key_1'}
+    assert [val['key'] for val in usage.values()] == ['****ey_a', '****ey_b']
+    assert sum(val['n_requests'] for val in usage.values()) == 6
+    assert sum(val['throttle_time'] for val in usage.values()) > 0
+
+def test_key_pool_usage():
+
+    # Keys with the same ending, which are the same once masked, should be tracked separately
+    pool = KeyPool(['a_1234', 'b_1234'])
+    keys = [pool.acquire()[0] for ind in range(2)]
+    assert sorted(keys) == ['a_1234', 'b_1234']
+    assert [val['n_requests'] for val in pool.usage] == [1, 1]
+    assert [val['key'] for val in pool.usage] == ['****1234', '****1234']
+
+def test_mask_key():
+
+    assert mask_key('1234567890abcdef') == '****cdef'
+    assert mask_key('abc') == '****'
+
+def test_set_api_key():
+
+    base = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi'
+
+    assert set_api_key(base, 'abc') == base + '?api_key=abc'
+    assert set_api_key(base + '?db=pubmed', 'abc') == base + '?db=pubmed&api_key=abc'
+    assert set_api_key(base + '?db=pubmed&api_key=old&term=brain', 'abc') == \
+        base + '?db=pubmed&term=brain&api_key=abc'
+    assert set_api_key(base + '?api_key=old&db=pubmed', 'abc') == base + '?db=pubmed&api_key=abc'
+
+def test_drop_api_key():
+
+    base = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi'
+
+    assert drop_api_key(base + '?db=pubmed') == base + '?db=pubmed'
+    assert drop_api_key(base + '?api_key=abc') == base
+    assert drop_api_key(base + '?api_key=abc&db=pubmed') == base + '?db=pubmed'
+    assert drop_api_key(base + '?db=pubmed&api_key=abc&term=brain') == \
+        base + '?db=pubmed&term=brain'
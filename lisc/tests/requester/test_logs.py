@@ -0,0 +1,58 @@
+"""Tests for lisc.requester.logs."""
+
+from pytest import raises
+
+from lisc.requester.logs import *
+
+###################################################################################################
+###################################################################################################
+
+TEST_URL = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?db=pubmed&term=brain'
+
+def test_request_log(tmp_path):
+
+    assert RequestLog(tmp_path / 'requester_log.jsonl')
+
+    with raises(ValueError):
+        RequestLog(tmp_path / 'requester_log.jsonl', sample_rate=2)
+
+def test_request_log_buffer(tmp_path):
+
+    log = RequestLog(tmp_path / 'requester_log.jsonl', buffer_size=3)
+
+    for ind in range(2):
+        log.add_request(TEST_URL, 200, 0.1, 100)
+    assert not log.file_path.exists()
+
+    log.add_request(TEST_URL, 429, 0.1, 0, retry=1)
+    records = load_request_log(log.file_path)
+    assert len(records) == 3
+    assert records[-1]['status'] == 429
+    assert records[-1]['retry'] == 1
+    assert set(records[0].keys()) == \
+        {'time', 'url', 'method', 'status', 'latency', 'n_bytes', 'retry'}
+
+def test_request_log_rotate(tmp_path):
+
+    log = RequestLog(tmp_path / 'requester_log.jsonl', buffer_size=1, max_bytes=1000,
+                     n_backups=2)
+    for ind in range(50):
+        log.add_request(TEST_URL, 200, 0.1, 100)
+    log.close()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == \
+        ['requester_log.jsonl', 'requester_log.jsonl.1', 'requester_log.jsonl.2']
+    assert all(path.stat().st_size <= 1000 for path in tmp_path.iterdir())
+
+def test_request_log_sample(tmp_path):
+
+    log = RequestLog(tmp_path / 'requester_log.jsonl', sample_rate=0.1, seed=0)
+    for ind in range(100):
+        log.add_request(TEST_URL, 200, 0.1, 100)
+    log.add_request(TEST_URL, 500, 0.1, 0)
+    log.close()
+
+    records = load_request_log(log.file_path)
+    assert len(records) == log.n_records < 50
+    assert log.n_records + log.n_skipped == 101
+    assert records[-1]['status'] == 500
@@ -0,0 +1,72 @@
+"""Tests for lisc.requester.metrics."""
+
+import os
+import json
+
+from pytest import raises
+
+from lisc.requester.metrics import *
+
+###################################################################################################
+###################################################################################################
+
+def test_request_metrics():
+
+    assert RequestMetrics()
+
+def test_request_metrics_add():
+
+    metrics = RequestMetrics()
+
+    metrics.add_request(0.2, 100)
+    metrics.add_request(20., 50)
+    metrics.add_retry()
+    metrics.add_throttle(0.5)
+    with metrics.time_parse():
+        pass
+
+    assert metrics.n_requests == 2
+    assert metrics.n_bytes == 150
+    assert metrics.n_retries == 1
+    assert metrics.latency_max == 20.
+    assert metrics.latency_counts[LATENCY_BUCKETS.index(0.25)] == 1
+    assert metrics.latency_counts[-1] == 1
+    assert metrics.throttle_time == 0.5
+    assert metrics.parse_time > 0
+
+def test_request_metrics_as_dict():
+
+    metrics = RequestMetrics()
+    metrics.add_request(0.5, 10)
+
+    metrics_dict = metrics.as_dict()
+    assert '_lock' not in metrics_dict
+    assert metrics_dict['latency_mean'] == 0.5
+    assert len(metrics_dict['latency_counts']) == len(metrics_dict['latency_buckets']) + 1
+
+def test_request_metrics_save(tdb):
+
+    metrics = RequestMetrics()
+    metrics.add_request(0.5, 10)
+
+    metrics.save('test_metrics', tdb)
+    with open(os.path.join(tdb.get_folder_path('logs'), 'test_metrics.json')) as f_obj:
+        assert json.load(f_obj)['n_bytes'] == 10
+
+    metrics.save('test_metrics', tdb, file_format='prometheus')
+    assert os.path.exists(os.path.join(tdb.get_folder_path('logs'), 'test_metrics.prom'))
+
+    with raises(ValueError):
+        metrics.save('test_metrics', tdb, file_format='bad')
+
+def test_format_prometheus():
+
+    metrics = RequestMetrics()
+    metrics.add_request(0.2, 1024)
+    metrics.add_request(0.7, 1024)
+
+    lines = format_prometheus(metrics.as_dict()).splitlines()
+    assert 'lisc_request_latency_seconds_bucket{le="0.25"} 1' in lines
+    assert 'lisc_request_latency_seconds_bucket{le="+Inf"} 2' in lines
+    assert 'lisc_request_latency_seconds_count 2' in lines
+    assert 'lisc_request_bytes_total 2048' in lines
@@ -0,0 +1,70 @@
+"""Tests for lisc.requester.replay."""
+
+from pytest import raises
+
+from lisc.requester import Requester
+
+from lisc.requester.replay import *
+
+###################################################################################################
+###################################################################################################
+
+TEST_URL = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?db=pubmed&term=brain'
+
+def test_fixtures(tmp_path):
+
+    assert load_fixture(TEST_URL, tmp_path) is None
+
+    save_fixture(TEST_URL, b'<Count>12</Count>', tmp_path, content_type='text/xml')
+    fixture = load_fixture(TEST_URL, tmp_path)
+    assert fixture['url'] == TEST_URL
+    assert fixture['content'] == '<Count>12</Count>'
+
+    # Check that fixtures do not depend on, or store, any API key
+    save_fixture(TEST_URL + '&api_key=abc', b'<Count>13</Count>', tmp_path)
+    fixture = load_fixture(TEST_URL, tmp_path)
+    assert fixture['url'] == TEST_URL
+    assert fixture['content'] == '<Count>13</Count>'
+
+def test_make_replay_url():
+
+    url = make_replay_url(TEST_URL, 'http://127.0.0.1:8000/')
+    assert url.startswith('http://127.0.0.1:8000/?url=https')
+    assert '&' not in url
+
+def test_replay_server(tmp_path):
+
+    save_fixture(TEST_URL, '<Count>12</Count>', tmp_path, content_type='text/xml')
+
+    with ReplayServer(tmp_path, latency=0.01, jitter=0.005, seed=0) as server:
+
+        req = Requester(redirect=server.url, logging='store')
+
+        page = req.request_url(TEST_URL)
+        assert page.status_code == 200
+        assert page.content == b'<Count>12</Count>'
+        assert req.log == [TEST_URL]
+
+        page = req.request_url(TEST_URL + 'missing')
+        assert page.status_code == 404
+
+        assert server.n_requests == 2
+
+    with raises(ValueError):
+        server.url
+
+def test_replay_server_errors(tmp_path):
+
+    save_fixture(TEST_URL, '<Count>12</Count>', tmp_path)
+
+    with ReplayServer(tmp_path, error_rate=1.) as server:
+        page = Requester(redirect=server.url).request_url(TEST_URL)
+
+    assert page.status_code == 429
+    assert page.headers['Retry-After'] == '1'
+    assert server.n_errors == 1
+
+def test_replay_server_mode():
+
+    with raises(ValueError):
+        ReplayServer('fixtures', mode='bad')
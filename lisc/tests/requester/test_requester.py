@@ -3,11 +3,16 @@
 import os
 import time
 
-from lisc.requester import Requester
+from lisc.requester import Requester, ReplayServer
+from lisc.requester.replay import save_fixture
+from lisc.requester.keys import KeyPool
+from lisc.requester.logs import load_request_log
 
 ###################################################################################################
 ###################################################################################################
 
+TEST_URL = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?db=pubmed&term=brain'
+
 def test_requester():
 
     assert Requester()
@@ -16,6 +21,7 @@ def test_as_dict(treq):
 
     req_dict = treq.as_dict()
     assert isinstance(req_dict, dict)
+    assert '_lock' not in req_dict
 
 def test_set_wait_time(treq):
 
@@ -74,3 +80,120 @@ def test_close(treq):
     treq.close()
 
     assert not treq.is_active
+
+def test_requester_metrics(tmp_path):
+
+    save_fixture(TEST_URL, '<Count>12</Count>', tmp_path)
+
+    with ReplayServer(tmp_path) as server:
+        req = Requester(wait_time=0.05, redirect=server.url)
+        for ind in range(2):
+            req.request_url(TEST_URL)
+
+    assert req.metrics.n_requests == 2
+    assert req.metrics.n_bytes == 2 * len(b'<Count>12</Count>')
+    assert req.metrics.throttle_time > 0
+    assert '_metrics' not in req.as_dict()
+
+def test_requester_retries(tmp_path):
+
+    save_fixture(TEST_URL, '<Count>12</Count>', tmp_path)
+
+    with ReplayServer(tmp_path, error_rate=1.) as server:
+        req = Requester(redirect=server.url, max_retries=1)
+        page = req.request_url(TEST_URL)
+
+    assert page.status_code == 429
+    assert server.n_requests == 2
+    assert req.n_requests == 2
+    assert req.metrics.n_retries == 1
+
+def test_requester_key_pool(tmp_path):
+
+    save_fixture(TEST_URL, '<Count>12</Count>', tmp_path)
+
+    with ReplayServer(tmp_path) as server:
+        req = Requester(redirect=server.url, logging='store',
+                        key_pool=KeyPool(['key_project_a', 'key_project_b']))
+        for ind in range(4):
+            assert req.request_url(TEST_URL).content == b'<Count>12</Count>'
+
+    assert req.log == [TEST_URL] * 4
+    assert [val['n_requests'] for val in req.key_pool.as_dict().values()] == [2, 2]
+    assert '_key_pool' not in req.as_dict()
+
+def test_requester_memo():
+
+    req = Requester(memoize=True)
+    assert req.get_memo(TEST_URL) is None
+
+    req.add_memo(TEST_URL, 12)
+    assert req.get_memo(TEST_URL) == 12
+    assert req.n_memo_hits == 1
+
+    req.clear_memo()
+    assert req.get_memo(TEST_URL) is None
+
+    req = Requester()
+    req.add_memo(TEST_URL, 12)
+    assert req.get_memo(TEST_URL) is None
+
+def test_requester_memo_size():
+
+    urls = [TEST_URL + str(ind) for ind in range(3)]
+
+    req = Requester(memoize=True, memo_size=2)
+    req.add_memo(urls[0], 0)
+    req.add_memo(urls[1], 1)
+
+    # Using the first result should make the second the least recently used, to be dropped
+    assert req.get_memo(urls[0]) == 0
+    req.add_memo(urls[2], 2)
+    assert req.get_memo(urls[1]) is None
+    assert req.get_memo(urls[0]) == 0
+    assert req.get_memo(urls[2]) == 2
+
+def test_requester_post(tmp_path):
+
+    url = TEST_URL + '&id=' + ','.join(['12345678'] * 500)
+    save_fixture(url, '<Count>12</Count>', tmp_path)
+
+    with ReplayServer(tmp_path) as server:
+        req = Requester(redirect=server.url, logging='store')
+        page = req.request_url(url, post=True)
+
+    assert page.status_code == 200
+    assert page.content == b'<Count>12</Count>'
+    assert req.log == [url]
+
+def test_requester_post_terms(tmp_path):
+
+    # Check that a multi-word term replays the same fixture over GET and POST
+    url = TEST_URL.split('?')[0] + '?db=pubmed&term=("frontal+lobe")AND("working+memory")'
+    save_fixture(url, '<Count>12</Count>', tmp_path)
+
+    with ReplayServer(tmp_path) as server:
+        req = Requester(redirect=server.url)
+        for post in [False, True]:
+            page = req.request_url(url, post=post)
+            assert page.status_code == 200
+            assert page.content == b'<Count>12</Count>'
+
+def test_requester_logging_jsonl(tmp_path):
+
+    save_fixture(TEST_URL, '<Count>12</Count>', tmp_path)
+    (tmp_path / 'logs').mkdir()
+
+    with ReplayServer(tmp_path, error_rate=0.3, seed=1) as server:
+        req = Requester(redirect=server.url, max_retries=3, logging='jsonl',
+                        directory=tmp_path / 'logs')
+        for ind in range(3):
+            req.request_url(TEST_URL)
+        assert isinstance(req.as_dict()['log'], str)
+        req.close()
+
+    records = load_request_log(tmp_path / 'logs' / 'requester_log.jsonl')
+    assert len(records) == req.n_requests == server.n_requests
+    assert [record['status'] for record in records].count(429) == server.n_errors > 0
+    assert records[-1]['url'] == TEST_URL
+    assert records[-1]['n_bytes'] == len(b'<Count>12</Count>')
@@ -67,6 +67,11 @@ def load_meta_dict():
         'db_info_lastupdate': '1999/12/31 00:00',
         'settings_setting1' : True,
         'settings_setting2' : 42,
+        'metrics_n_requests': 1,
+        'metrics_n_bytes': 1024,
+        'metrics_latency_time': 0.5,
+        'metrics_parse_time': 0.1,
+        'api_keys_key_0': {'key': '****ey_a', 'n_requests': 1, 'throttle_time': 0.},
     }
 
 def load_base(add_terms=False, add_clusions=False, add_labels=False, n_terms=2):
@@ -105,8 +110,8 @@ def load_counts(add_terms=False, add_data=False, n_terms=(2, 2)):
     counts = Counts()
 
     if add_terms:
-        counts1d.add_terms(repeat_data(['test', 'synonym'], n_terms[0]), dim='A')
-        counts1d.add_terms(repeat_data(['test', 'synonym'], n_terms[1]), dim='B')
+        counts.add_terms(repeat_data(['test', 'synonym'], n_terms[0]), dim='A')
+        counts.add_terms(repeat_data(['test', 'synonym'], n_terms[1]), dim='B')
 
     if add_data:
         counts.terms['A'].counts = np.random.randint(0, 100, (n_terms[0]))
@@ -11,6 +11,12 @@ def test_get_wait_time():
 
     assert get_wait_time(True)
 
+def test_check_post():
+
+    assert not check_post('https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?term=brain')
+    assert check_post('https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi?id=' + \
+        ','.join(['12345678'] * 500))
+
 def test_eutils():
 
     assert EUtils()
@@ -48,3 +48,18 @@ def test_get_url():
     urls.build_url('dostuff')
     url = urls.get_url('dostuff', ['segment'], {'setting' : 'value'})
     url = 'www.api.com/action/segment?setting=value'
+
+def test_get_template():
+
+    urls = URLs('www.api.com', {'dostuff' : 'action', 'other' : 'act{ion}'})
+
+    urls.fill_settings(setting='value')
+    urls.build_url('dostuff', settings=['setting'])
+    template = urls.get_template('dostuff', 'term')
+    assert template.format('abc') == urls.get_url('dostuff', settings={'term' : 'abc'})
+
+    template = urls.get_template('dostuff', 'term', '{}AND{}')
+    assert template.format('a', 'b') == 'www.api.com/action?setting=value&term=aANDb'
+
+    urls.build_url('other')
+    assert urls.get_template('other', 'term').format('abc') == 'www.api.com/act{ion}?term=abc'
@@ -37,3 +37,13 @@ def test_make_settings():
     assert 'setting=val1' in settings
     assert 'other=val2' in settings
     assert make_settings({}) == ''
+
+def test_split_url():
+
+    url = 'https://www.google.com/search?q=frontal+lobe&hl='
+    base, settings = split_url(url)
+    assert base == 'https://www.google.com/search'
+    assert settings == 'q=frontal+lobe&hl='
+    assert base + '?' + settings == url
+
+    assert split_url('https://www.google.com') == ('https://www.google.com', '')
@@ -19,3 +19,8 @@ def test_flatten():
 
     assert flatten([[1, 2], [3, 4]]) == [1, 2, 3, 4]
     assert flatten([[], []]) == []
+
+def test_get_chunks():
+
+    assert get_chunks(5, 2) == [slice(0, 2), slice(2, 4), slice(4, 6)]
+    assert get_chunks(0, 2) == []
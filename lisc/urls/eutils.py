@@ -52,6 +52,9 @@ from lisc.urls.urls import URLs
 ###################################################################################################
 ###################################################################################################
 
+# Maximum length of a URL to request with a GET request, above which a POST request is used
+MAX_URL_LENGTH = 2000
+
 def get_wait_time(authenticated):
     """Get the wait time based on whether EUtils API use is authenticated or not.
 
@@ -76,6 +79,38 @@ def get_wait_time(authenticated):
     return 1/10 if authenticated else 1/3
 
 
+def check_post(url, max_length=MAX_URL_LENGTH):
+    """Check whether a URL should be requested with a POST request, based on its length.
+
+    Parameters
+    ----------
+    url : str
+        URL to be requested.
+    max_length : int, optional, default: MAX_URL_LENGTH
+        Maximum length of a URL to request with a GET request.
+
+    Returns
+    -------
+    bool
+        Whether to request the URL with a POST request.
+
+    Notes
+    -----
+    The ESearch and EFetch utilities accept settings sent as form data, with a POST request,
+    which avoids limits on URL length, for long search terms or lists of IDs.
+    More information is available here: https://www.ncbi.nlm.nih.gov/books/NBK25499/
+
+    Examples
+    --------
+    Check whether to use a POST request for a short search URL:
+
+    >>> check_post('https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?term=brain')
+    False
+    """
+
+    return len(url) > max_length
+
+
 class EUtils(URLs):
     """URLs for the NCBI EUtils API.
 
@@ -3,6 +3,9 @@
 ###################################################################################################
 ###################################################################################################
 
+# Headers for sending URL settings as form data, such as split out by `split_url`
+FORM_HEADERS = {'Content-Type' : 'application/x-www-form-urlencoded'}
+
 def check_none(val, default):
     """Check an input for if it is None, and if so return a default object.
 
@@ -101,3 +104,36 @@ def make_settings(settings, prefix='?'):
     """
 
     return prepend('&'.join([ke + '=' + va for ke, va in settings.items()]), prefix)
+
+
+def split_url(url):
+    """Split a URL into its base and its settings, such as to send the settings as form data.
+
+    Parameters
+    ----------
+    url : str
+        URL to split.
+
+    Returns
+    -------
+    base : str
+        The URL, without any settings.
+    settings : str
+        The settings of the URL, as the encoded query string, exactly as in the URL.
+
+    Notes
+    -----
+    The settings are not decoded, such that the URL can be rebuilt exactly, as
+    `base + '?' + settings`, and are sent as form data with the same encoding as in the URL.
+
+    Examples
+    --------
+    Split a search URL:
+
+    >>> split_url('https://www.google.com/search?q=frontal+lobe&hl=en')
+    ('https://www.google.com/search', 'q=frontal+lobe&hl=en')
+    """
+
+    base, _, settings = url.partition('?')
+
+    return base, settings
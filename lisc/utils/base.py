@@ -68,3 +68,22 @@ def flatten(lst):
     """
 
     return list(chain.from_iterable(lst))
+
+
+def get_chunks(n_items, chunk_size):
+    """Get slices to iterate across a number of items in chunks.
+
+    Parameters
+    ----------
+    n_items : int
+        The number of items.
+    chunk_size : int
+        The number of items in each chunk.
+
+    Returns
+    -------
+    list of slice
+        Slices for each chunk, with the last chunk containing any remaining items.
+    """
+
+    return [slice(start, start + chunk_size) for start in range(0, n_items, chunk_size)]
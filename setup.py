@@ -57,7 +57,8 @@ setup(
     extras_require = {
         'plot'     : ['matplotlib', 'seaborn', 'wordcloud'],
         'analysis' : ['scipy'],
-        'all'      : ['matplotlib', 'seaborn', 'wordcloud', 'scipy'],
+        'async'    : ['aiohttp'],
+        'all'      : ['matplotlib', 'seaborn', 'wordcloud', 'scipy', 'aiohttp'],
     },
     project_urls = {
         'Documentation' : 'https://lisc-tools.github.io/',